@@ -0,0 +1,80 @@
+"""
+Throughput of reading + validating a generated CSV in-process versus in
+byte-range shards across worker processes (ingestion/csv_source/shards.py).
+
+    python benchmarks/bench_csv_shards.py [--rows 1m] [--kind vendors] [--workers 1 2 4 8]
+
+Covers parsing, validation and raw payload encoding, not the database
+writes. Every run's output is compared with the in-process read.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+# core.db needs a URL at import time; nothing connects to it here.
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://bench@localhost/bench")
+
+from benchmarks.generate_data import cached_csv, parse_rows
+from ingestion.csv_source.chunks import CSV_CHUNK_SIZE
+from ingestion.csv_source.columnar import ValidatedChunk, validate_columns
+from ingestion.csv_source.shards import CSV_SHARD_BYTES, read_chunks
+from schemas.csv_schema import CSVProduct
+from schemas.vendor_schema import VendorProduct
+from services.raw_store import encode_payloads
+
+MODELS = {"products": CSVProduct, "vendors": VendorProduct}
+
+
+async def read(model, path: Path, workers: int, chunk_size: int, shard_bytes: int) -> tuple[float, list]:
+    started = time.perf_counter()
+    digest = []
+    async for chunk in read_chunks(
+        model, path, chunk_size, workers=workers, shard_bytes=shard_bytes
+    ):
+        # In-process reads validate and encode payloads in later pipeline
+        # stages, so include that here.
+        if isinstance(chunk, ValidatedChunk):
+            validated = chunk
+        else:
+            validated = validate_columns(model, chunk)
+        payload = validated.payload
+        if payload is None:
+            payload = encode_payloads(validated.rows)
+        digest.append((validated.chunk.end_row, payload.row_count))
+    return time.perf_counter() - started, digest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default="1m", help="10k, 1m, 10m or a row count")
+    parser.add_argument("--kind", choices=MODELS, default="vendors")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1])
+    parser.add_argument("--chunk-size", type=int, default=CSV_CHUNK_SIZE)
+    parser.add_argument("--shard-bytes", type=int, default=CSV_SHARD_BYTES)
+    args = parser.parse_args()
+
+    model = MODELS[args.kind]
+    path = cached_csv(args.kind, parse_rows(args.rows), 0.01, 0.05)
+
+    baseline, expected = asyncio.run(read(model, path, 0, args.chunk_size, args.shard_bytes))
+    rows = expected[-1][0] if expected else 0
+    valid = sum(count for _, count in expected)
+    print(f"{args.kind}: {rows} rows, {path.stat().st_size / 2**20:.0f} MiB, {os.cpu_count()} CPUs")
+    print(f"in-process : {rows / baseline:12.0f} rows/s")
+
+    for workers in sorted(set(args.workers)):
+        if workers < 2:
+            continue
+        elapsed, digest = asyncio.run(read(model, path, workers, args.chunk_size, args.shard_bytes))
+        # Shards chunk differently, so compare valid row counts, not blob hashes.
+        assert sum(count for _, count in digest) == valid
+        assert digest[-1][0] == rows
+        print(f"{workers:2d} workers : {rows / elapsed:12.0f} rows/s ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
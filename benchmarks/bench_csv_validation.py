@@ -0,0 +1,72 @@
+"""
+Per-row cost of validating CSV chunks: pydantic models versus the columnar
+engine (ingestion/csv_source/columnar.py), on a generated file.
+
+    python benchmarks/bench_csv_validation.py [--rows 1m] [--kind vendors]
+
+Both engines see the same chunks and their outputs are compared, so this
+doubles as an equivalence check. Building the raw row dicts (needed by the
+raw payload store either way) is excluded from both timings.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+# core.db needs a URL at import time; nothing connects to it here.
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://bench@localhost/bench")
+
+from benchmarks.generate_data import cached_csv, parse_rows
+from ingestion.csv_source.chunks import CSV_CHUNK_SIZE, iter_csv_chunks
+from ingestion.csv_source.columnar import validate_columns
+from schemas.csv_schema import CSVProduct
+from schemas.vendor_schema import VendorProduct
+
+MODELS = {"products": CSVProduct, "vendors": VendorProduct}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default="1m", help="10k, 1m, 10m or a row count")
+    parser.add_argument("--kind", choices=MODELS, default="vendors")
+    parser.add_argument("--chunk-size", type=int, default=CSV_CHUNK_SIZE)
+    parser.add_argument("--invalid-ratio", type=float, default=0.01)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    model = MODELS[args.kind]
+    path = cached_csv(args.kind, parse_rows(args.rows), args.invalid_ratio, args.duplicate_ratio)
+
+    rows = fallback = 0
+    timings = {"pydantic": 0.0, "columnar": 0.0}
+
+    for chunk in iter_csv_chunks(path, args.chunk_size):
+        rows += len(chunk.records)
+
+        started = time.perf_counter()
+        columnar = validate_columns(model, chunk, "columnar")
+        timings["columnar"] += time.perf_counter() - started
+
+        _ = chunk.rows  # built outside the timed section
+        started = time.perf_counter()
+        reference = validate_columns(model, chunk, "pydantic")
+        timings["pydantic"] += time.perf_counter() - started
+
+        assert columnar.positions == reference.positions
+        assert columnar.columns == reference.columns
+        assert columnar.rejected == reference.rejected
+        fallback += columnar.fallback_rows
+
+    before = timings["pydantic"] / rows * 1e9
+    after = timings["columnar"] / rows * 1e9
+
+    print(f"{args.kind}: {rows} rows, chunk size {args.chunk_size}, outputs identical")
+    print(f"pydantic  : {before:8.0f} ns/row")
+    print(f"columnar  : {after:8.0f} ns/row ({fallback} rows fell back to pydantic)")
+    print(f"speedup   : {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
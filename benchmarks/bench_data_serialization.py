@@ -0,0 +1,112 @@
+"""
+Per-row cost of building a /data page of `limit` rows: the old ORM +
+jsonable_encoder path versus Core column rows + services.serialization.
+
+    python benchmarks/bench_data_serialization.py [--limit 1000] [--repeat 50]
+
+Runs against an in-memory SQLite copy of unified_records, so it measures
+hydration and serialization only, not Postgres round trips.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+# core.db needs a URL at import time; nothing connects to it here.
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://bench@localhost/bench")
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from schemas.models import UnifiedRecord
+from services.data_service import DATA_COLUMNS, serialize_page
+from services.serialization import orjson
+
+
+def _setup(rows: int):
+    engine = create_engine("sqlite://")
+    UnifiedRecord.__table__.create(engine)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(UnifiedRecord),
+            [
+                {
+                    "source": "coingecko_api",
+                    "external_id": f"coin-{i}",
+                    "name": f"Coin {i}",
+                    "category": "coin",
+                    "value": i * 1.5,
+                    "event_timestamp": now,
+                }
+                for i in range(rows)
+            ],
+        )
+    return engine
+
+
+def orm_page(engine, limit: int) -> bytes:
+    with Session(engine) as session:
+        records = session.execute(select(UnifiedRecord).limit(limit)).scalars().all()
+        body = {
+            "count": len(records),
+            "data": [
+                {
+                    "id": r.id,
+                    "source": r.source,
+                    "external_id": r.external_id,
+                    "name": r.name,
+                    "category": r.category,
+                    "value": r.value,
+                    "event_timestamp": r.event_timestamp.isoformat(),
+                }
+                for r in records
+            ],
+        }
+        # What FastAPI's default JSONResponse does with a returned dict
+        return json.dumps(
+            jsonable_encoder(body),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode()
+
+
+def core_page(engine, limit: int) -> bytes:
+    with engine.connect() as conn:
+        rows = conn.execute(select(*DATA_COLUMNS).limit(limit)).all()
+        return serialize_page(rows, limit)
+
+
+def _per_row_us(fn, engine, limit: int, repeat: int) -> float:
+    fn(engine, limit)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(engine, limit)
+    return (time.perf_counter() - start) / repeat / limit * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = _setup(args.limit)
+
+    before = _per_row_us(orm_page, engine, args.limit, args.repeat)
+    after = _per_row_us(core_page, engine, args.limit, args.repeat)
+
+    print(f"limit={args.limit} repeat={args.repeat} orjson={'yes' if orjson else 'no'}")
+    print(f"ORM + jsonable_encoder : {before:8.2f} us/row")
+    print(f"Core rows + dumps      : {after:8.2f} us/row")
+    print(f"speedup                : {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Synthetic inputs for the ETL benchmarks: products / vendors CSVs in the
+same shape as data/*.csv, and a CoinGecko /coins/list body.
+
+    python benchmarks/generate_data.py --rows 1m --invalid-ratio 0.01 --duplicate-ratio 0.05
+
+Rows are streamed to disk, so 10M-row files need no more memory than 10k.
+Generation is seeded; the same arguments always produce the same file.
+"""
+import argparse
+import csv
+import random
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent / ".data"
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+CATEGORIES = ("Electronics", "ELECTRONICS", "Furniture", "Garden", "Toys", "Books")
+
+
+def parse_rows(value: str) -> int:
+    return SIZES.get(value.lower()) or int(value.replace("_", ""))
+
+
+def _invalid_product(rng: random.Random, i: int) -> list:
+    return rng.choice(
+        (
+            [i, f"Product {i}", "Furniture", "not_a_number", "bad"],
+            ["", f"Product {i}", "Furniture", "199", "missing_id"],
+            [i, f"Product {i}", "Toys", "-5", "negative"],
+        )
+    )
+
+
+def _invalid_vendor(rng: random.Random, i: int) -> list:
+    return rng.choice(
+        (
+            [f"V{i}", f"Item {i}", "Furniture", "invalid_price"],
+            [f"V{i}", "", "Electronics", "19.99"],
+            [f"V{i}", f"Item {i}", "Garden", "0"],
+        )
+    )
+
+
+def _rows(rows: int, invalid_ratio: float, duplicate_ratio: float, seed: int, make, make_invalid):
+    rng = random.Random(seed)
+    for i in range(1, rows + 1):
+        roll = rng.random()
+        if roll < invalid_ratio:
+            yield make_invalid(rng, i)
+        elif roll < invalid_ratio + duplicate_ratio and i > 1:
+            # Re-deliver an earlier key, sometimes with changed content
+            yield make(rng, rng.randint(1, i - 1))
+        else:
+            yield make(rng, i)
+
+
+def write_products_csv(
+    path: Path,
+    rows: int,
+    invalid_ratio: float = 0.01,
+    duplicate_ratio: float = 0.05,
+    seed: int = 42,
+) -> Path:
+    def make(rng, i):
+        return [i, f"Product {i}", rng.choice(CATEGORIES), f"{rng.uniform(1, 2000):.2f}", "x"]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["product_id", "name", "category", "price", "extra_col"])
+        writer.writerows(_rows(rows, invalid_ratio, duplicate_ratio, seed, make, _invalid_product))
+    return path
+
+
+def write_vendors_csv(
+    path: Path,
+    rows: int,
+    invalid_ratio: float = 0.01,
+    duplicate_ratio: float = 0.05,
+    seed: int = 43,
+) -> Path:
+    def make(rng, i):
+        return [f"V{i}", f"Item {i}", rng.choice(CATEGORIES), f"{rng.uniform(1, 500):.2f}"]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["vendor_id", "product_name", "group", "amount"])
+        writer.writerows(_rows(rows, invalid_ratio, duplicate_ratio, seed, make, _invalid_vendor))
+    return path
+
+
+def coins_list(count: int) -> list[dict]:
+    """Body of a stubbed CoinGecko /coins/list."""
+    return [{"id": f"coin-{i}", "symbol": f"c{i}", "name": f"Coin {i}"} for i in range(count)]
+
+
+def cached_csv(kind: str, rows: int, invalid_ratio: float, duplicate_ratio: float) -> Path:
+    """
+    Path to a generated CSV under benchmarks/.data, generating it only if
+    it does not exist yet (10M-row files take a while to write).
+    """
+    writer = {"products": write_products_csv, "vendors": write_vendors_csv}[kind]
+    path = DATA_DIR / f"{kind}_{rows}_{invalid_ratio}_{duplicate_ratio}.csv"
+    if not path.exists():
+        tmp = path.with_suffix(".tmp")
+        writer(tmp, rows, invalid_ratio, duplicate_ratio)
+        tmp.rename(path)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", default="10k", help="10k, 1m, 10m or a row count")
+    parser.add_argument("--invalid-ratio", type=float, default=0.01)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+
+    rows = parse_rows(args.rows)
+    for kind in ("products", "vendors"):
+        print(cached_csv(kind, rows, args.invalid_ratio, args.duplicate_ratio))
+
+
+if __name__ == "__main__":
+    main()
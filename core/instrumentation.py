@@ -0,0 +1,217 @@
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from functools import wraps
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from services.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+DB_INSTRUMENTATION = os.getenv("DB_INSTRUMENTATION", "false").lower() == "true"
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+SLOW_QUERY_HISTORY = 50
+MAX_LOGGED_SQL = 1000
+
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY", "CREATE", "ALTER", "TRUNCATE"}
+
+DB_STATEMENT_SECONDS = registry.histogram(
+    "db_statement_seconds",
+    "Time spent executing SQL statements.",
+    ("operation",),
+)
+DB_SLOW_STATEMENTS = registry.counter(
+    "db_slow_statements_total",
+    "Statements slower than DB_SLOW_QUERY_MS.",
+    ("operation",),
+)
+DB_POOL_CHECKOUT_SECONDS = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a pooled connection (includes connect and pre-ping).",
+)
+DB_POOL_SIZE = registry.gauge("db_pool_size", "Configured pool size.")
+DB_POOL_CHECKED_OUT = registry.gauge("db_pool_checked_out", "Connections in use.")
+DB_POOL_OVERFLOW = registry.gauge("db_pool_overflow", "Connections open beyond pool size.")
+DB_POOL_CHECKED_IN = registry.gauge("db_pool_checked_in", "Idle connections in the pool.")
+
+
+def statement_operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in _OPERATIONS else "OTHER"
+
+
+def redact_parameters(parameters) -> str:
+    """
+    Describe bound parameters without their values: key names for a
+    mapping, a count for positional or executemany parameters.
+    """
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}=?" for k in parameters) + "}"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} parameter sets>"
+        return f"<{len(parameters)} parameters>"
+    return "<none>" if parameters is None else "<redacted>"
+
+
+class EngineInstrumentation:
+    """
+    Statement timings, slow-statement log and pool usage for one engine.
+    """
+
+    def __init__(self, engine: Engine, slow_query_ms: float):
+        self.engine = engine
+        self.slow_query_ms = slow_query_ms
+        self.statements: dict[str, dict] = {}
+        self.slow_statements: deque[dict] = deque(maxlen=SLOW_QUERY_HISTORY)
+        self.checkouts = 0
+        self.checkout_wait_total_ms = 0.0
+        self.checkout_wait_max_ms = 0.0
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_query_started", []).append(time.perf_counter())
+
+    def handle_error(self, context):
+        # after_cursor_execute does not run for a failed statement; drop its
+        # start time so the stack does not grow on a pooled connection.
+        conn = context.connection
+        if conn is not None and conn.info.get("_query_started"):
+            conn.info["_query_started"].pop()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["_query_started"].pop()
+        elapsed = time.perf_counter() - started
+        elapsed_ms = elapsed * 1000
+        operation = statement_operation(statement)
+
+        DB_STATEMENT_SECONDS.observe(elapsed, operation=operation)
+
+        stats = self.statements.setdefault(
+            operation, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+        if elapsed_ms < self.slow_query_ms:
+            return
+
+        sql = " ".join(statement.split())[:MAX_LOGGED_SQL]
+        params = redact_parameters(parameters)
+
+        DB_SLOW_STATEMENTS.inc(operation=operation)
+        self.slow_statements.append(
+            {
+                "at": datetime.now(timezone.utc).isoformat(),
+                "duration_ms": round(elapsed_ms, 3),
+                "statement": sql,
+                "parameters": params,
+            }
+        )
+        logger.warning(f"Slow query ({elapsed_ms:.1f} ms): {sql} | params: {params}")
+
+    def record_checkout(self, seconds: float) -> None:
+        wait_ms = seconds * 1000
+        self.checkouts += 1
+        self.checkout_wait_total_ms += wait_ms
+        self.checkout_wait_max_ms = max(self.checkout_wait_max_ms, wait_ms)
+        DB_POOL_CHECKOUT_SECONDS.observe(seconds)
+
+    def pool_status(self) -> dict:
+        pool = self.engine.pool
+        # NullPool / StaticPool have no size accounting.
+        if not hasattr(pool, "checkedout"):
+            return {"class": type(pool).__name__}
+
+        return {
+            "class": type(pool).__name__,
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        }
+
+    def collect(self) -> None:
+        status = self.pool_status()
+        if "size" in status:
+            DB_POOL_SIZE.set(status["size"])
+            DB_POOL_CHECKED_OUT.set(status["checked_out"])
+            DB_POOL_CHECKED_IN.set(status["checked_in"])
+            DB_POOL_OVERFLOW.set(status["overflow"])
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": True,
+            "slow_query_ms": self.slow_query_ms,
+            "pool": self.pool_status(),
+            "checkout": {
+                "count": self.checkouts,
+                "avg_wait_ms": round(self.checkout_wait_total_ms / self.checkouts, 3)
+                if self.checkouts
+                else None,
+                "max_wait_ms": round(self.checkout_wait_max_ms, 3),
+            },
+            "statements": {
+                op: {
+                    "count": s["count"],
+                    "avg_ms": round(s["total_ms"] / s["count"], 3),
+                    "max_ms": round(s["max_ms"], 3),
+                }
+                for op, s in sorted(self.statements.items())
+            },
+            "slow_statements": list(self.slow_statements),
+        }
+
+
+_instrumentation: EngineInstrumentation | None = None
+
+
+def instrument_engine(
+    engine: AsyncEngine | Engine,
+    slow_query_ms: float = DB_SLOW_QUERY_MS,
+) -> EngineInstrumentation:
+    """
+    Attach timing hooks to `engine` (idempotent per process).
+    """
+    global _instrumentation
+    if _instrumentation is not None:
+        return _instrumentation
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    inst = EngineInstrumentation(sync_engine, slow_query_ms)
+
+    event.listen(sync_engine, "before_cursor_execute", inst.before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", inst.after_cursor_execute)
+    event.listen(sync_engine, "handle_error", inst.handle_error)
+
+    # The pool has no "before checkout" event, so time the checkout itself.
+    # The async engine runs this inside its greenlet, so it measures the
+    # real wait for a free connection.
+    raw_connection = sync_engine.raw_connection
+
+    @wraps(raw_connection)
+    def timed_raw_connection(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return raw_connection(*args, **kwargs)
+        finally:
+            inst.record_checkout(time.perf_counter() - started)
+
+    sync_engine.raw_connection = timed_raw_connection
+
+    registry.add_collector(inst.collect)
+    _instrumentation = inst
+    logger.warning(f"DB instrumentation enabled (slow query threshold {slow_query_ms} ms)")
+    return inst
+
+
+def db_debug_snapshot() -> dict:
+    if _instrumentation is None:
+        return {"enabled": False}
+    return _instrumentation.snapshot()
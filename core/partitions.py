@@ -0,0 +1,272 @@
+"""
+Optional declarative partitioning, chosen with DB_PARTITIONING (comma
+separated) and applied only when a table is first created:
+
+- "source": unified_records is LIST-partitioned by source, with one
+  partition per PARTITION_SOURCES entry plus a default. Reads filtered by
+  source touch one partition, and a whole source can be removed by
+  detaching its partition.
+- "ingested_at": raw_payload_refs is RANGE-partitioned by month of
+  ingested_at. The current and next PARTITION_MONTHS_AHEAD months are
+  created at startup and again before every ETL run (maintain_partitions),
+  and old months are detached instead of DELETEd.
+
+unified_records is not range-partitioned by time: Postgres needs the
+partition key in every unique constraint, and (source, external_id) must
+stay unique across all months for upserts. Existing tables are never
+converted; rows outside the created partitions land in the default one.
+"""
+import logging
+import os
+import re
+from datetime import date
+
+from sqlalchemy import MetaData, PrimaryKeyConstraint, Table, delete, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
+
+from schemas.models import RawPayloadRef, UnifiedRecord
+from schemas.stats_models import SourceRecordCount
+from services.cache import mark_data_changed
+
+logger = logging.getLogger(__name__)
+
+DB_PARTITIONING = {
+    p.strip() for p in os.getenv("DB_PARTITIONING", "").split(",") if p.strip()
+}
+PARTITION_SOURCES = [
+    s.strip()
+    for s in os.getenv(
+        "PARTITION_SOURCES", "coingecko_api,products_csv,vendors_csv"
+    ).split(",")
+    if s.strip()
+]
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+
+# partitioning option -> (table, PARTITION BY clause, key column)
+PARTITION_SCHEMES = {
+    "source": (UnifiedRecord.__table__, "LIST (source)", "source"),
+    "ingested_at": (RawPayloadRef.__table__, "RANGE (ingested_at)", "ingested_at"),
+}
+
+
+def partitioned_table_ddl(table: Table, partition_by: str, key: str, dialect) -> str:
+    """
+    CREATE TABLE for a partitioned copy of `table`. The partition key joins
+    the primary key, which Postgres requires of every unique constraint.
+    """
+    copy = table.to_metadata(MetaData())
+    copy.dialect_options["postgresql"]["partition_by"] = partition_by
+
+    primary_key = list(copy.primary_key.columns)
+    copy.c[key].primary_key = True
+    copy.append_constraint(PrimaryKeyConstraint(*primary_key, copy.c[key]))
+    for column in primary_key:
+        column.autoincrement = True  # keep SERIAL ids in the composite key
+
+    return str(CreateTable(copy).compile(dialect=dialect))
+
+
+def partition_name(parent: str, suffix: str) -> str:
+    return f"{parent}_{re.sub(r'[^a-z0-9]+', '_', suffix.lower()).strip('_')}"
+
+
+def month_partition(parent: str, month: date) -> tuple[str, str, str]:
+    """(name, lower bound, upper bound) of the partition holding `month`."""
+    start = month.replace(day=1)
+    end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return f"{parent}_y{start:%Y}m{start:%m}", f"{start} 00:00:00+00", f"{end} 00:00:00+00"
+
+
+def add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    return bool(
+        conn.scalar(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :name)"
+            ),
+            {"name": table},
+        )
+    )
+
+
+def create_partitioned_tables(conn: Connection, options: set[str] = DB_PARTITIONING) -> None:
+    """
+    Create the parents of the enabled schemes before create_all(), which
+    then skips them. Indexes follow via ensure_schema like on any table.
+    """
+    inspector = inspect(conn)
+
+    for option in sorted(options):
+        if option not in PARTITION_SCHEMES:
+            logger.warning(f"Unknown DB_PARTITIONING option {option!r}; ignored")
+            continue
+
+        table, partition_by, key = PARTITION_SCHEMES[option]
+        if inspector.has_table(table.name):
+            if not is_partitioned(conn, table.name):
+                logger.warning(
+                    f"{table.name} already exists unpartitioned; "
+                    f"partitioning by {key} applies only to a new table"
+                )
+            continue
+
+        logger.warning(f"Creating {table.name} partitioned by {partition_by}")
+        conn.execute(text(partitioned_table_ddl(table, partition_by, key, conn.dialect)))
+
+
+def _has_rows(conn: Connection, table: str, where: str, params: dict) -> bool:
+    if not inspect(conn).has_table(table):
+        return False
+    return conn.scalar(text(f'SELECT 1 FROM "{table}" WHERE {where} LIMIT 1'), params) is not None
+
+
+def _ensure_default(conn: Connection, parent: str) -> str:
+    default = partition_name(parent, "default")
+    conn.execute(text(f'CREATE TABLE IF NOT EXISTS "{default}" PARTITION OF {parent} DEFAULT'))
+    return default
+
+
+def ensure_source_partitions(conn: Connection, sources: list[str] = PARTITION_SOURCES) -> None:
+    parent = UnifiedRecord.__tablename__
+    default = partition_name(parent, "default")
+
+    for source in sources:
+        name = partition_name(parent, source)
+        if inspect(conn).has_table(name):
+            continue
+        # Postgres refuses a new partition while the default holds its rows.
+        if _has_rows(conn, default, "source = :source", {"source": source}):
+            logger.warning(f"{source} rows are in {default}; not creating {name}")
+            continue
+        conn.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {parent} '
+                f"FOR VALUES IN ({_literal(source)})"
+            )
+        )
+
+    _ensure_default(conn, parent)
+
+
+def ensure_month_partitions(
+    conn: Connection,
+    today: date | None = None,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+) -> None:
+    parent = RawPayloadRef.__tablename__
+    default = partition_name(parent, "default")
+    today = today or date.today()
+
+    for offset in range(months_ahead + 1):
+        name, lower, upper = month_partition(parent, add_months(today, offset))
+        if inspect(conn).has_table(name):
+            continue
+        # Literals rather than binds: asyncpg will not coerce str to timestamptz.
+        bounds = f"ingested_at >= {_literal(lower)} AND ingested_at < {_literal(upper)}"
+        if _has_rows(conn, default, bounds, {}):
+            logger.warning(f"{parent} rows for {name} are in {default}; not creating it")
+            continue
+        conn.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {parent} '
+                f"FOR VALUES FROM ({_literal(lower)}) TO ({_literal(upper)})"
+            )
+        )
+
+    _ensure_default(conn, parent)
+
+
+def ensure_partitions(conn: Connection) -> None:
+    """Create missing partitions for every partitioned parent."""
+    if is_partitioned(conn, UnifiedRecord.__tablename__):
+        ensure_source_partitions(conn)
+    if is_partitioned(conn, RawPayloadRef.__tablename__):
+        ensure_month_partitions(conn)
+
+
+async def maintain_partitions(session: AsyncSession) -> None:
+    """
+    ensure_partitions for a long-running process, committed at once. Rows
+    for a month without its partition would land in the default one, which
+    then blocks creating that partition.
+    """
+    conn = await session.connection()
+    await conn.run_sync(ensure_partitions)
+    await session.commit()
+
+
+async def list_partitions(session: AsyncSession, parent: str) -> list[tuple[str, str]]:
+    """(partition, bound expression) pairs attached to `parent`."""
+    result = await session.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent ORDER BY c.relname"
+        ),
+        {"parent": parent},
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def detach_partition(
+    session: AsyncSession,
+    parent: str,
+    partition: str,
+    drop: bool = False,
+) -> None:
+    """
+    Detach (and optionally drop) one partition: a catalog change instead of
+    a DELETE over its rows.
+    """
+    await session.execute(text(f'ALTER TABLE {parent} DETACH PARTITION "{partition}"'))
+    if drop:
+        await session.execute(text(f'DROP TABLE "{partition}"'))
+    logger.warning(f"{'Dropped' if drop else 'Detached'} partition {partition} of {parent}")
+
+
+async def detach_source(session: AsyncSession, source: str, drop: bool = False) -> None:
+    """Remove every unified record of `source` by detaching its partition."""
+    parent = UnifiedRecord.__tablename__
+    await detach_partition(session, parent, partition_name(parent, source), drop)
+
+    # Keep the /stats rollup and the response cache in step.
+    await session.execute(delete(SourceRecordCount).where(SourceRecordCount.source == source))
+    mark_data_changed(session)
+
+
+async def detach_months_before(
+    session: AsyncSession,
+    before: date,
+    drop: bool = False,
+) -> list[str]:
+    """
+    Detach the raw_payload_refs month partitions that end on or before
+    `before`. Returns their names.
+    """
+    parent = RawPayloadRef.__tablename__
+    pattern = re.compile(rf"^{parent}_y(\d{{4}})m(\d{{2}})$")
+    detached = []
+
+    for name, _ in await list_partitions(session, parent):
+        match = pattern.match(name)
+        if not match:
+            continue
+        month = date(int(match[1]), int(match[2]), 1)
+        if add_months(month, 1) <= before:
+            await detach_partition(session, parent, name, drop)
+            detached.append(name)
+
+    return detached
@@ -0,0 +1,98 @@
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.db import Base
+from core.partitions import create_partitioned_tables, ensure_partitions
+
+logger = logging.getLogger(__name__)
+
+
+def _add_missing_columns(conn: Connection) -> None:
+    """
+    create_all() never alters existing tables, so columns added to a model
+    after its table was created are added here (always as nullable).
+    """
+    inspector = inspect(conn)
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            col_type = column.type.compile(dialect=conn.dialect)
+            logger.warning(f"Adding column {table.name}.{column.name} ({col_type})")
+            conn.execute(
+                text(
+                    f'ALTER TABLE {table.name} '
+                    f'ADD COLUMN IF NOT EXISTS "{column.name}" {col_type}'
+                )
+            )
+
+
+def _create_missing_indexes(conn: Connection) -> None:
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+# Exact and prefix lookups of GET /data/search; the C collation lets
+# LIKE 'abc%' use the index and returns matches in index order.
+SEARCH_INDEXES = {
+    "ix_unified_name_lower": 'unified_records (lower(name) COLLATE "C")',
+    "ix_unified_external_id_lower": 'unified_records (lower(external_id) COLLATE "C")',
+}
+
+# Fuzzy matching for GET /data/search; only created when pg_trgm is available.
+TRIGRAM_INDEXES = {
+    "ix_unified_name_trgm": "unified_records USING gin (name gin_trgm_ops)",
+    "ix_unified_external_id_trgm": "unified_records USING gin (external_id gin_trgm_ops)",
+}
+
+
+def _create_search_indexes(conn: Connection) -> None:
+    for name, definition in SEARCH_INDEXES.items():
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"))
+
+
+def _create_trigram_indexes(conn: Connection) -> None:
+    """
+    Install pg_trgm and its GIN indexes. Without the extension (e.g. no
+    privilege to create it) search falls back to ILIKE substring matching.
+    """
+    try:
+        with conn.begin_nested():
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except DBAPIError as e:
+        logger.warning(f"pg_trgm unavailable, /data/search will not use trigram indexes: {e}")
+        return
+
+    for name, definition in TRIGRAM_INDEXES.items():
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"))
+
+
+def _sync_schema(conn: Connection) -> None:
+    create_partitioned_tables(conn)
+    Base.metadata.create_all(conn)
+    _add_missing_columns(conn)
+    _create_missing_indexes(conn)
+    _create_search_indexes(conn)
+    _create_trigram_indexes(conn)
+    ensure_partitions(conn)
+
+
+async def ensure_schema(engine: AsyncEngine) -> None:
+    """
+    Create all tables and bring existing ones up to date with the models.
+    ORM models must be imported before calling this.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(_sync_schema)
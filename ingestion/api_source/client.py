@@ -1,9 +1,12 @@
+import asyncio
 import os
+import time
 import httpx
 import logging
 
+from services.circuit_breaker import RetryBudget, get_breaker
 from services.retry import retry_with_backoff
-from services.rate_limit import RateLimiter
+from services.rate_limit import RateLimiter, limiters, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -12,15 +15,99 @@ API_BASE_URL = os.getenv("API_BASE_URL")
 if not API_BASE_URL:
     raise RuntimeError("API_BASE_URL not set")
 
-# CoinGecko public limit ≈ 10–30 req/min → be conservative
-rate_limiter = RateLimiter(rate_per_sec=0.5)
+# HTTP/2 needs the optional `h2` package (httpx[http2]).
+API_HTTP2 = os.getenv("API_HTTP2", "false").lower() == "true"
+# Reuse the downloaded /coins/list for this long without revalidating, so all
+# page slices within one run share a single download.
+COINS_LIST_MAX_AGE = float(os.getenv("COINS_LIST_MAX_AGE", "300"))
 
+# CoinGecko public limit ≈ 10–30 req/min → be conservative on the steady
+# rate but allow a small burst.
+COINGECKO_RATE_PER_SEC = float(os.getenv("COINGECKO_RATE_PER_SEC", "0.5"))
+COINGECKO_BURST = float(os.getenv("COINGECKO_BURST", "3"))
 
-async def _fetch_coins() -> list[dict]:
-    await rate_limiter.wait()
+rate_limiter = limiters.get(
+    "coingecko:/coins/list",
+    rate_per_sec=COINGECKO_RATE_PER_SEC,
+    capacity=COINGECKO_BURST,
+)
 
-    async with httpx.AsyncClient(timeout=15) as client:
-        resp = await client.get(f"{API_BASE_URL}/coins/list")
+# Fail fast during CoinGecko outages instead of sleeping through retries.
+breaker = get_breaker(
+    "coingecko",
+    failure_threshold=int(os.getenv("COINGECKO_BREAKER_THRESHOLD", "5")),
+    recovery_timeout=float(os.getenv("COINGECKO_BREAKER_RECOVERY", "60")),
+)
+retry_budget = RetryBudget(ratio=0.2, min_retries=4, window=600)
+
+
+class CoinGeckoClient:
+    """
+    Long-lived, pooled client for CoinGecko.
+
+    The full /coins/list is cached locally and revalidated with
+    ETag / Last-Modified, so an unchanged list costs a 304 with no body.
+    Pass `transport` (e.g. httpx.MockTransport) to run it without the network.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        transport: httpx.AsyncBaseTransport | None = None,
+        http2: bool = API_HTTP2,
+        list_max_age: float = COINS_LIST_MAX_AGE,
+        limiter: RateLimiter = rate_limiter,
+    ):
+        self.base_url = base_url
+        self.transport = transport
+        self.http2 = http2
+        self.list_max_age = list_max_age
+        self.limiter = limiter
+
+        self._client: httpx.AsyncClient | None = None
+        self._lock = asyncio.Lock()
+        self._coins: list[dict] | None = None
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._fetched_at = 0.0
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=15,
+                http2=self.http2,
+                transport=self.transport,
+                limits=httpx.Limits(max_connections=10, keepalive_expiry=60),
+            )
+        return self._client
+
+    async def _fetch_coins(self) -> list[dict]:
+        await self.limiter.wait()
+
+        headers = {}
+        if self._coins is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+
+        resp = await self._http().get("/coins/list", headers=headers)
+
+        if resp.status_code == 304 and self._coins is not None:
+            await self.limiter.reward()
+            logger.info("CoinGecko /coins/list not modified, reusing cached list")
+            return self._coins
+
+        if resp.status_code == 429:
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            await self.limiter.penalize(retry_after)
+            logger.warning(
+                f"CoinGecko rate limited (Retry-After={retry_after}); "
+                f"slowing to {self.limiter.rate:.3f} req/s"
+            )
+            resp.raise_for_status()
 
         if resp.status_code >= 500:
             raise RuntimeError(f"CoinGecko server error {resp.status_code}")
@@ -29,26 +116,51 @@ async def _fetch_coins() -> list[dict]:
             logger.error(f"CoinGecko client error {resp.status_code}: {resp.text}")
             resp.raise_for_status()
 
+        await self.limiter.reward()
+        self._etag = resp.headers.get("ETag")
+        self._last_modified = resp.headers.get("Last-Modified")
         return resp.json()
 
+    async def coins(self) -> list[dict]:
+        async with self._lock:
+            age = time.monotonic() - self._fetched_at
+            if self._coins is not None and age < self.list_max_age:
+                return self._coins
+
+            self._coins = await retry_with_backoff(
+                self._fetch_coins,
+                retries=4,
+                base_delay=1.0,
+                max_delay=10.0,
+                breaker=breaker,
+                budget=retry_budget,
+            )
+            self._fetched_at = time.monotonic()
+            return self._coins
+
+    async def fetch_products(self, skip: int = 0, limit: int = 200) -> dict:
+        """
+        CoinGecko /coins/list is not paginated, so slice the cached list locally.
+        """
+        coins = await self.coins()
+
+        return {
+            "coins": coins[skip : skip + limit],
+            "total": len(coins),
+            "skip": skip,
+            "limit": limit,
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+
+
+client = CoinGeckoClient(API_BASE_URL)
+
 
 async def fetch_products(skip: int = 0, limit: int = 200) -> dict:
     """
     Adapter to keep existing ingestion contract.
-    CoinGecko /coins/list is not paginated, so slice locally.
     """
-    coins = await retry_with_backoff(
-        _fetch_coins,
-        retries=4,
-        base_delay=1.0,
-        max_delay=10.0,
-    )
-
-    sliced = coins[skip : skip + limit]
-
-    return {
-        "coins": sliced,
-        "total": len(coins),
-        "skip": skip,
-        "limit": limit,
-    }
+    return await client.fetch_products(skip=skip, limit=limit)
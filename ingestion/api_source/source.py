@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+from typing import AsyncIterator
+
+from ingestion.api_source.client import fetch_products
+from ingestion.pipeline import RecordBatch, SourceBatch, Stage
+from services.schema_drift import extract_schema_signature
+
+
+async def coin_pages(skip: int, limit: int, drain: bool) -> AsyncIterator[SourceBatch]:
+    """
+    Pages of the coin listing from `skip`; only the first one unless
+    `drain`. The position of each page is the cursor after it, or 0 after
+    a short (last) page so the next run sweeps the listing again.
+    """
+    while True:
+        data = await fetch_products(skip=skip, limit=limit)
+        coins = data.get("coins", [])
+        if not coins:
+            return
+
+        skip += len(coins)
+        last = len(coins) < limit
+        yield SourceBatch(data, 0 if last else skip)
+
+        if last or not drain:
+            return
+
+
+def transform_stage(source: str) -> Stage:
+    def transform(data: dict) -> RecordBatch:
+        now = datetime.now(timezone.utc)
+        coins = data["coins"]
+
+        return RecordBatch(
+            unified=[
+                {
+                    "source": source,
+                    "external_id": coin["id"],
+                    "name": coin.get("name"),
+                    "category": coin.get("symbol"),
+                    "value": 0.0,
+                    "event_timestamp": now,
+                }
+                for coin in coins
+            ],
+            # The page is stored whole, as one payload.
+            payloads=[data],
+            # Coins are not validated individually; every one read is written.
+            read=len(coins),
+            schema=lambda: extract_schema_signature(data),
+        )
+
+    return Stage("transform", transform)
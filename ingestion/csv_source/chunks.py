@@ -0,0 +1,179 @@
+import csv
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import chain
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+CSV_CHUNK_SIZE = int(os.getenv("CSV_CHUNK_SIZE", "5000"))
+# Commit after this many chunks so long files don't hold one huge transaction.
+CSV_COMMIT_EVERY_CHUNKS = int(os.getenv("CSV_COMMIT_EVERY_CHUNKS", "10"))
+# Bytes from the start of the file that identify it across appends.
+FINGERPRINT_BYTES = 64 * 1024
+
+
+# Fed to csv.reader after a bounded range. It comes back as a record of
+# its own only if the range ended on a record boundary; otherwise it is
+# swallowed by a quoted field still open at the end of the range.
+BOUNDARY_SENTINEL = "\uffff"
+
+
+class ShardBoundaryError(ValueError):
+    """A byte range ended inside a quoted field."""
+
+
+# Surplus values go under "_extra" rather than a None key, so rows stay
+# JSON-serializable with sorted keys.
+EXTRA_KEY = "_extra"
+
+
+def row_to_dict(header: list[str], record: list[str]) -> dict:
+    """Same mapping csv.DictReader(restkey=EXTRA_KEY) produces."""
+    row = dict(zip(header, record))
+    if len(record) > len(header):
+        row[EXTRA_KEY] = record[len(header):]
+    elif len(record) < len(header):
+        for key in header[len(record):]:
+            row[key] = None
+    return row
+
+
+@dataclass
+class CSVChunk:
+    header: list[str]
+    records: list[list[str]]  # raw csv.reader rows
+    end_offset: int  # byte offset just past the last row in the chunk
+    end_row: int  # data rows consumed from the start of the file
+
+    @cached_property
+    def rows(self) -> list[dict]:
+        """The records as DictReader-style dicts, built on first use."""
+        return [row_to_dict(self.header, record) for record in self.records]
+
+
+class _LineTracker:
+    """
+    Feeds decoded lines to csv.reader while tracking the byte offset
+    of everything consumed so far. csv.reader only pulls lines until a
+    record is complete, so after each row `offset` is that row's end.
+    """
+
+    def __init__(self, f: BinaryIO, offset: int, end: int | None = None):
+        self._f = f
+        self.offset = offset
+        self.end = end
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if self.end is not None and self.offset >= self.end:
+            raise StopIteration
+        line = self._f.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode("utf-8")
+
+
+def file_fingerprint(path: Path, length: int | None = None) -> str:
+    """
+    Hash of the first `length` bytes (default: up to FINGERPRINT_BYTES).
+    Appending to the file leaves the fingerprint unchanged; rewriting it does not.
+    """
+    if length is None:
+        length = min(path.stat().st_size, FINGERPRINT_BYTES)
+
+    with path.open("rb") as f:
+        digest = hashlib.sha256(f.read(length)).hexdigest()
+
+    return f"{length}:{digest}"
+
+
+def fingerprint_matches(path: Path, fingerprint: str, offset: int) -> bool:
+    try:
+        length = int(fingerprint.split(":", 1)[0])
+    except ValueError:
+        return False
+
+    size = path.stat().st_size
+    if size < offset or size < length:
+        return False
+
+    return file_fingerprint(path, length) == fingerprint
+
+
+def iter_csv_chunks(
+    path: Path,
+    chunk_size: int = CSV_CHUNK_SIZE,
+    start_offset: int = 0,
+    start_row: int = 0,
+    end_offset: int | None = None,
+) -> Iterator[CSVChunk]:
+    """
+    Stream a CSV file as chunks of at most `chunk_size` rows, starting at
+    `start_offset` (a row boundary from a previous chunk). Only one chunk
+    is held in memory at a time.
+
+    With `end_offset`, stop at that byte offset, which must be the start of
+    a line; ShardBoundaryError is raised if it falls inside a quoted field.
+    """
+    with path.open("rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]), [])
+
+        offset = max(start_offset, f.tell())
+        f.seek(offset)
+
+        lines = _LineTracker(f, offset, end_offset)
+        source = lines if end_offset is None else chain(lines, [BOUNDARY_SENTINEL + "\n"])
+        row_number = start_row
+        chunk: list[list[str]] = []
+        aligned = end_offset is None
+
+        for record in csv.reader(source):
+            if not record:
+                continue  # blank line, skipped like DictReader does
+            if not aligned and record == [BOUNDARY_SENTINEL]:
+                aligned = True
+                break
+            chunk.append(record)
+            row_number += 1
+            if len(chunk) >= chunk_size:
+                yield CSVChunk(header, chunk, lines.offset, row_number)
+                chunk = []
+
+        if not aligned:
+            raise ShardBoundaryError(f"{path}: byte {end_offset} is inside a quoted field")
+
+        if chunk:
+            yield CSVChunk(header, chunk, lines.offset, row_number)
+
+
+def validate_chunk(
+    model: type[BaseModel],
+    rows: list[dict],
+) -> tuple[list[tuple[dict, BaseModel]], list[tuple[dict, str]]]:
+    """
+    Validate a chunk of raw rows against `model`.
+    Returns (valid (row, model) pairs, rejected (row, error) pairs).
+    """
+    valid = []
+    rejected = []
+
+    for row in rows:
+        try:
+            valid.append((row, model(**row)))
+        except ValidationError as e:
+            rejected.append((row, str(e)))
+        except Exception as e:
+            logger.error(f"Unexpected CSV error: {row} | error: {e}")
+            rejected.append((row, str(e)))
+
+    return valid, rejected
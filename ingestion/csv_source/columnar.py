@@ -0,0 +1,262 @@
+"""
+Chunk validation engines.
+
+"pydantic" builds one model per row. "columnar" (opt-in, needs numpy)
+transposes the chunk into columns and applies the models' rules as array
+masks. Any row the masks cannot decide exactly (non-canonical numbers,
+ragged rows, failures) is re-validated through the model, so both engines
+produce the same rows, values and error messages.
+"""
+import logging
+import os
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import chain, compress
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from ingestion.csv_source.chunks import CSVChunk, row_to_dict
+from schemas.csv_schema import CSVProduct
+from schemas.vendor_schema import VendorProduct
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install .[columnar]
+    np = None
+
+logger = logging.getLogger(__name__)
+
+CSV_VALIDATION_ENGINE = os.getenv("CSV_VALIDATION_ENGINE", "pydantic")
+# Numbers with more digits go through pydantic; up to 15 digits an
+# integer round-trips through a float64 column unchanged.
+MAX_FAST_DIGITS = 15
+
+_numpy_warned = False
+
+
+@dataclass(frozen=True)
+class ColumnRule:
+    name: str
+    kind: str = "str"  # str | int | float
+    lower: bool = False
+    positive: bool = False
+    non_blank: bool = False
+
+
+# Field types and validators of each model, as column rules.
+COLUMN_RULES: dict[type[BaseModel], tuple[ColumnRule, ...]] = {
+    CSVProduct: (
+        ColumnRule("product_id", "int"),
+        ColumnRule("name"),
+        ColumnRule("category", lower=True),
+        ColumnRule("price", "float", positive=True),
+    ),
+    VendorProduct: (
+        ColumnRule("vendor_id"),
+        ColumnRule("product_name", non_blank=True),
+        ColumnRule("group", lower=True),
+        ColumnRule("amount", "float", positive=True),
+    ),
+}
+
+
+@dataclass
+class ValidatedChunk:
+    chunk: CSVChunk
+    positions: list[int]  # indexes of the valid records, in file order
+    columns: dict[str, list]  # model field -> validated values, aligned with positions
+    rejected: list[tuple[dict, str]]  # (raw row, validation error)
+    fallback_rows: int = 0  # rows the columnar engine handed to pydantic
+    payload: Any = None  # raw_store.EncodedPayload of `rows`, if encoded by a worker
+
+    @cached_property
+    def rows(self) -> list[dict]:
+        """Raw rows of the valid records."""
+        rows = self.chunk.rows
+        return [rows[i] for i in self.positions]
+
+
+def _validate_rows(
+    model: type[BaseModel],
+    rows: list[tuple[int, dict]],
+) -> tuple[list[tuple[int, BaseModel]], list[tuple[dict, str]]]:
+    """Per-row model validation, same handling as chunks.validate_chunk."""
+    valid = []
+    rejected = []
+
+    for position, row in rows:
+        try:
+            valid.append((position, model(**row)))
+        except ValidationError as e:
+            rejected.append((row, str(e)))
+        except Exception as e:
+            logger.error(f"Unexpected CSV error: {row} | error: {e}")
+            rejected.append((row, str(e)))
+
+    return valid, rejected
+
+
+def _validate_models(model: type[BaseModel], chunk: CSVChunk) -> ValidatedChunk:
+    valid, rejected = _validate_rows(model, list(enumerate(chunk.rows)))
+    positions = [p for p, _ in valid]
+    models = [m for _, m in valid]
+
+    return ValidatedChunk(
+        chunk,
+        positions,
+        {name: [getattr(m, name) for m in models] for name in model.model_fields},
+        rejected,
+    )
+
+
+def _parse_numbers(values: list[str], integer: bool):
+    """
+    Parse unsigned decimal strings ("12", "1.5", ".5", "3.") as float64.
+    Returns (values, ok); ok is False wherever the string is anything else.
+
+    The shape is checked with byte masks; only accepted strings reach
+    float() / int(), which round exactly like pydantic does.
+    """
+    n = len(values)
+    parsed = np.zeros(n)
+
+    # One byte per character (anything non-ASCII becomes "?" and fails);
+    # the trailing newline terminates the last value too.
+    blob = "\n".join(values) + "\n"
+    data = np.frombuffer(blob.encode("ascii", "replace"), dtype=np.uint8)
+    stops = np.flatnonzero(data == 10)
+    if len(stops) != n:
+        # A value contains a newline; leave the whole column to pydantic.
+        return parsed, np.zeros(n, dtype=bool)
+
+    starts = np.empty(n, dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = stops[:-1] + 1
+
+    digit = ((data >= 48) & (data <= 57)).view(np.uint8)
+    dot = (data == 46).view(np.uint8)
+    n_digits = np.add.reduceat(digit, starts, dtype=np.int64)
+    n_dots = np.add.reduceat(dot, starts, dtype=np.int64)
+
+    ok = (
+        (n_digits >= 1)
+        & (n_digits <= MAX_FAST_DIGITS)
+        & (n_digits + n_dots == stops - starts)
+        & (n_dots <= (0 if integer else 1))
+    )
+    if ok.any():
+        parse = int if integer else float
+        parsed[ok] = list(map(parse, compress(values, ok.tolist())))
+
+    return parsed, ok
+
+
+def _lower(values: list[str]) -> list[str]:
+    blob = "\n".join(values)
+    if blob.count("\n") != len(values) - 1:
+        return list(map(str.lower, values))
+    return blob.lower().split("\n")
+
+
+def _validate_columnar(model: type[BaseModel], chunk: CSVChunk) -> ValidatedChunk:
+    rules = COLUMN_RULES[model]
+    records = chunk.records
+    width = len(chunk.header)
+    # Last occurrence wins for duplicate header names, as in DictReader.
+    index = {name: i for i, name in enumerate(chunk.header)}
+
+    if not records or any(rule.name not in index for rule in rules):
+        return _validate_models(model, chunk)
+
+    if min(map(len, records)) == width == max(map(len, records)):
+        regular = np.arange(len(records))
+        regular_records = records
+    else:
+        # Short or long rows map to None / "_extra"; pydantic decides those.
+        regular = [i for i, r in enumerate(records) if len(r) == width]
+        regular_records = [records[i] for i in regular]
+
+    # Transpose by striding over the flattened fields: zip(*records) with
+    # thousands of arguments costs several times more than the parsing.
+    fields = list(chain.from_iterable(regular_records))
+    columns = [fields[i::width] for i in range(width)]
+
+    ok = np.ones(len(regular), dtype=bool)
+    parsed = {}
+
+    for rule in rules:
+        column = columns[index[rule.name]]
+        if rule.kind == "str":
+            if rule.non_blank:
+                ok &= np.fromiter(map(bool, map(str.strip, column)), bool, len(column))
+            parsed[rule.name] = column
+        else:
+            values, valid = _parse_numbers(column, rule.kind == "int")
+            ok &= valid
+            if rule.positive:
+                ok &= values > 0
+            parsed[rule.name] = values
+
+    all_ok = bool(ok.all())
+    keep = ok.tolist()
+    values = {}
+
+    for rule in rules:
+        column = parsed[rule.name]
+        if rule.kind == "str":
+            selected = column if all_ok else list(compress(column, keep))
+            values[rule.name] = _lower(selected) if rule.lower else selected
+        elif rule.kind == "int":
+            values[rule.name] = (column if all_ok else column[ok]).astype(np.int64).tolist()
+        else:
+            values[rule.name] = (column if all_ok else column[ok]).tolist()
+
+    fast = np.asarray(regular, dtype=np.int64)[ok]
+    positions = fast.tolist()
+
+    # Everything else goes through the model for the exact result / error.
+    undecided = np.ones(len(records), dtype=bool)
+    undecided[fast] = False
+    slow = np.flatnonzero(undecided).tolist()
+    recovered, rejected = _validate_rows(
+        model, [(i, row_to_dict(chunk.header, records[i])) for i in slow]
+    )
+
+    if recovered:
+        merged = sorted(
+            [(p, None, k) for k, p in enumerate(positions)]
+            + [(p, instance, None) for p, instance in recovered],
+            key=lambda item: item[0],
+        )
+        positions = [p for p, _, _ in merged]
+        values = {
+            name: [
+                getattr(instance, name) if instance is not None else column[k]
+                for _, instance, k in merged
+            ]
+            for name, column in values.items()
+        }
+
+    return ValidatedChunk(chunk, positions, values, rejected, fallback_rows=len(slow))
+
+
+def validate_columns(
+    model: type[BaseModel],
+    chunk: CSVChunk,
+    engine: str | None = None,
+) -> ValidatedChunk:
+    """
+    Validate a chunk with the configured engine (CSV_VALIDATION_ENGINE).
+    """
+    global _numpy_warned
+    engine = engine or CSV_VALIDATION_ENGINE
+
+    if engine == "columnar" and model in COLUMN_RULES:
+        if np is not None:
+            return _validate_columnar(model, chunk)
+        if not _numpy_warned:
+            logger.warning("Columnar CSV validation needs numpy; using pydantic")
+            _numpy_warned = True
+
+    return _validate_models(model, chunk)
@@ -0,0 +1,198 @@
+"""
+Parallel CSV reading. The file is split into byte ranges that start on a
+record boundary, and each range is parsed, validated and has its raw
+payloads encoded in a worker process. Results come back in file order, so
+the single writer and the checkpoint advance exactly as in a serial read.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+from pydantic import BaseModel
+
+from ingestion.csv_source.chunks import (
+    CSV_CHUNK_SIZE,
+    CSVChunk,
+    ShardBoundaryError,
+    iter_csv_chunks,
+)
+from ingestion.csv_source.columnar import CSV_VALIDATION_ENGINE, ValidatedChunk, validate_columns
+from services.raw_store import encode_payloads
+
+logger = logging.getLogger(__name__)
+
+# 0 or 1 reads in-process; N > 1 parses shards in N worker processes.
+CSV_PARALLEL_WORKERS = int(os.getenv("CSV_PARALLEL_WORKERS", "0"))
+CSV_SHARD_BYTES = int(os.getenv("CSV_SHARD_BYTES", str(16 * 2**20)))
+# Parsed shards held for the writer at once (default: 2 per worker).
+CSV_SHARDS_IN_FLIGHT = int(os.getenv("CSV_SHARDS_IN_FLIGHT", "0"))
+SCAN_BLOCK = 2**20
+
+
+def iter_byte_ranges(
+    path: Path,
+    start_offset: int = 0,
+    shard_bytes: int = CSV_SHARD_BYTES,
+) -> Iterator[tuple[int, int | None]]:
+    """
+    Split the data rows of `path` from `start_offset` (a record boundary)
+    into consecutive (start, end) byte ranges of about `shard_bytes`, each
+    ending just after a newline. The last range has end None: read to EOF.
+
+    A newline counts as a record boundary when an even number of quote
+    characters precede it, which holds for RFC 4180 quoting. A stray quote
+    inside an unquoted field can fool this; iter_csv_chunks then raises
+    ShardBoundaryError for that range instead of mis-parsing it.
+    """
+    with path.open("rb") as f:
+        f.readline()
+        start = max(start_offset, f.tell())
+        f.seek(start)
+
+        pos = start  # file offset of block[0]
+        target = start + shard_bytes
+        quoted = 0
+
+        while block := f.read(SCAN_BLOCK):
+            i = 0
+            while (j := max(i, target - pos)) < len(block):
+                quoted ^= block.count(b'"', i, j) & 1
+                i = j
+
+                # First newline at or after the target that is outside quotes
+                while (newline := block.find(b"\n", i)) != -1:
+                    quoted ^= block.count(b'"', i, newline) & 1
+                    i = newline + 1
+                    if not quoted:
+                        break
+                if newline == -1:
+                    break
+
+                yield start, pos + i
+                start = pos + i
+                target = start + shard_bytes
+
+            quoted ^= block.count(b'"', i) & 1
+            pos += len(block)
+
+    yield start, None
+
+
+def parse_shard(
+    model: type[BaseModel],
+    path: Path,
+    start: int,
+    end: int | None,
+    chunk_size: int,
+    engine: str,
+) -> list[ValidatedChunk]:
+    """
+    Worker side: validated chunks of one byte range, with the raw payloads
+    already encoded. Row numbers are relative to the start of the range.
+    """
+    validated_chunks = []
+
+    for chunk in iter_csv_chunks(path, chunk_size, start, 0, end):
+        validated = validate_columns(model, chunk, engine)
+        validated.payload = encode_payloads(validated.rows)
+
+        # The row dicts are cheap to rebuild; don't pickle them with the records.
+        validated.__dict__.pop("rows", None)
+        chunk.__dict__.pop("rows", None)
+        validated_chunks.append(validated)
+
+    return validated_chunks
+
+
+async def _read_serial(
+    path: Path,
+    chunk_size: int,
+    start_offset: int,
+    start_row: int,
+) -> AsyncIterator[CSVChunk]:
+    chunks = iter_csv_chunks(path, chunk_size, start_offset, start_row)
+    try:
+        # Parse in a thread so the event loop keeps serving the writer.
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            yield chunk
+    finally:
+        chunks.close()
+
+
+async def read_chunks(
+    model: type[BaseModel],
+    path: Path,
+    chunk_size: int = CSV_CHUNK_SIZE,
+    start_offset: int = 0,
+    start_row: int = 0,
+    workers: int = CSV_PARALLEL_WORKERS,
+    shard_bytes: int = CSV_SHARD_BYTES,
+    in_flight: int = CSV_SHARDS_IN_FLIGHT,
+) -> AsyncIterator[CSVChunk | ValidatedChunk]:
+    """
+    Chunks of `path` from `start_offset`, in file order: CSVChunks read
+    in-process, or ValidatedChunks (against `model`) parsed by a worker.
+
+    With `workers` > 1 and more than one shard left to read, shards are
+    parsed in a process pool, at most `in_flight` of them ahead of the
+    consumer. Use with contextlib.aclosing, or from a pipeline source, so
+    the pool is shut down if the consumer fails.
+    """
+    ranges = iter_byte_ranges(path, start_offset, shard_bytes) if workers > 1 else None
+    first = await asyncio.to_thread(next, ranges) if ranges is not None else (start_offset, None)
+
+    if first[1] is None:
+        async for chunk in _read_serial(path, chunk_size, start_offset, start_row):
+            yield chunk
+        return
+
+    loop = asyncio.get_running_loop()
+    # spawn: forking a process that runs an event loop and DB driver is unsafe
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    pending: deque[tuple[int, asyncio.Future]] = deque()
+    next_range = first
+    row = start_row
+    resume_at = None
+
+    try:
+        while True:
+            while next_range is not None and len(pending) < (in_flight or 2 * workers):
+                start, end = next_range
+                future = loop.run_in_executor(
+                    pool, parse_shard, model, path, start, end, chunk_size, CSV_VALIDATION_ENGINE
+                )
+                pending.append((start, future))
+                next_range = await asyncio.to_thread(next, ranges, None)
+
+            if not pending:
+                break
+
+            start, future = pending.popleft()
+            try:
+                validated_chunks = await future
+            except ShardBoundaryError as e:
+                # Everything before `start` was read correctly.
+                logger.warning(f"{e}; reading the rest of the file serially")
+                resume_at = start
+                break
+
+            for validated in validated_chunks:
+                validated.chunk.end_row += row
+                yield validated
+
+            if validated_chunks:
+                row = validated_chunks[-1].chunk.end_row
+    finally:
+        for _, future in pending:
+            future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+        ranges.close()
+
+    if resume_at is not None:
+        async for chunk in _read_serial(path, chunk_size, resume_at, row):
+            yield chunk
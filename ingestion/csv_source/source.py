@@ -0,0 +1,110 @@
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable
+
+from pydantic import BaseModel
+
+from ingestion.csv_source.chunks import CSV_CHUNK_SIZE, CSVChunk, row_to_dict
+from ingestion.csv_source.columnar import ValidatedChunk, validate_columns
+from ingestion.csv_source.shards import read_chunks
+from ingestion.pipeline import (
+    PIPELINE_TRANSFORM_WORKERS,
+    PIPELINE_VALIDATE_WORKERS,
+    RecordBatch,
+    SourceBatch,
+    Stage,
+)
+from services.schema_drift import SCHEMA_SAMPLE_SIZE, extract_schema_signature
+
+logger = logging.getLogger(__name__)
+
+
+async def csv_file_source(
+    model: type[BaseModel],
+    path: Path,
+    chunk_size: int = CSV_CHUNK_SIZE,
+    start_offset: int = 0,
+    start_row: int = 0,
+) -> AsyncIterator[SourceBatch]:
+    """
+    Chunks of a CSV file from a checkpoint. The position of each batch is
+    (end_offset, end_row) for advance_file_checkpoint.
+    """
+    chunks = read_chunks(model, path, chunk_size, start_offset, start_row)
+    try:
+        async for chunk in chunks:
+            end = chunk.chunk if isinstance(chunk, ValidatedChunk) else chunk
+            yield SourceBatch(chunk, (end.end_offset, end.end_row))
+    finally:
+        await chunks.aclose()
+
+
+def _sample_rows(chunk: CSVChunk) -> list[dict]:
+    # The same rows extract_schema_signature would sample from chunk.rows
+    records = chunk.records
+    step = max(len(records) / SCHEMA_SAMPLE_SIZE, 1)
+    picks = range(min(len(records), SCHEMA_SAMPLE_SIZE))
+    return [row_to_dict(chunk.header, records[int(i * step)]) for i in picks]
+
+
+def validate_stage(
+    model: type[BaseModel],
+    concurrency: int = PIPELINE_VALIDATE_WORKERS,
+) -> Stage:
+    """Validates CSVChunks; chunks a shard worker already validated pass through."""
+
+    def validate(chunk: CSVChunk | ValidatedChunk) -> ValidatedChunk:
+        if isinstance(chunk, ValidatedChunk):
+            return chunk
+        return validate_columns(model, chunk)
+
+    return Stage("validate", validate, concurrency, thread=True)
+
+
+def transform_stage(
+    to_unified: Callable[[dict[str, list], datetime], list[dict]],
+    label: str,
+    concurrency: int = PIPELINE_TRANSFORM_WORKERS,
+) -> Stage:
+    """
+    Maps a ValidatedChunk to a RecordBatch; `to_unified` turns the
+    validated columns into UnifiedRecord rows.
+    """
+
+    def transform(validated: ValidatedChunk) -> RecordBatch:
+        for row, error in validated.rejected:
+            logger.warning(f"Skipping invalid {label} row: {row} | validation error: {error}")
+
+        chunk = validated.chunk
+        return RecordBatch(
+            unified=to_unified(validated.columns, datetime.now(timezone.utc)),
+            payloads=validated.payload if validated.payload is not None else validated.rows,
+            read=len(chunk.records),
+            rejected=len(validated.rejected),
+            schema=lambda: extract_schema_signature(_sample_rows(chunk)),
+        )
+
+    return Stage("transform", transform, concurrency, thread=True)
+
+
+def product_records(source: str) -> Callable[[dict[str, list], datetime], list[dict]]:
+    def to_unified(columns: dict[str, list], now: datetime) -> list[dict]:
+        return [
+            {
+                "source": source,
+                "external_id": str(product_id),
+                "name": name,
+                "category": category,
+                "value": price,
+                "event_timestamp": now,
+            }
+            for product_id, name, category, price in zip(
+                columns["product_id"],
+                columns["name"],
+                columns["category"],
+                columns["price"],
+            )
+        ]
+
+    return to_unified
@@ -0,0 +1,243 @@
+"""
+Staged ingestion pipeline.
+
+A source is an async generator of SourceBatch: raw records plus the
+position to checkpoint once they are written. Each Stage maps a batch to
+a new one with `concurrency` workers, and stages are linked by bounded
+queues, so a slow stage holds back the ones before it instead of letting
+batches pile up. The sink (the DB writer) runs alone and gets batches in
+source order, even when a stage finishes them out of order.
+
+    source -> queue -> stage (N workers) -> queue -> ... -> sink
+
+Fetching, CPU work and writes for different batches therefore overlap.
+"""
+import asyncio
+import logging
+import os
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from services.bulk_loader import BatchResult, unified_record_loader
+from services.raw_store import EncodedPayload, RawPayloadStore
+from services.run_tracking import RunMetrics
+from services.schema_drift import check_schema_drift
+
+logger = logging.getLogger(__name__)
+
+# Batches each queue holds before the stage feeding it has to wait.
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+PIPELINE_VALIDATE_WORKERS = int(os.getenv("PIPELINE_VALIDATE_WORKERS", "2"))
+PIPELINE_TRANSFORM_WORKERS = int(os.getenv("PIPELINE_TRANSFORM_WORKERS", "1"))
+
+_DONE = object()
+
+
+@dataclass
+class SourceBatch:
+    records: Any
+    position: Any = None  # where to resume once these records are written
+
+
+@dataclass
+class Batch:
+    seq: int  # order the source produced it in
+    data: Any
+    position: Any = None
+
+
+@dataclass
+class Stage:
+    name: str  # also the RunMetrics stage its time is charged to
+    func: Callable[[Any], Any]  # batch data -> new batch data, sync or async
+    concurrency: int = 1
+    # Run a sync `func` in a worker thread, keeping the event loop free
+    # for fetches and writes.
+    thread: bool = False
+
+    async def apply(self, data: Any) -> Any:
+        if asyncio.iscoroutinefunction(self.func):
+            return await self.func(data)
+        if self.thread:
+            return await asyncio.to_thread(self.func, data)
+        return self.func(data)
+
+
+class Pipeline:
+    """
+    Runs `source` through `stages` into `sink`. At most `max_in_flight`
+    batches (default: one per queue slot) are between the source and the
+    sink at once, which bounds memory and the sink's reorder buffer.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterable[SourceBatch],
+        stages: list[Stage],
+        sink: Callable[[Batch], Awaitable[None]],
+        metrics: RunMetrics | None = None,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        max_in_flight: int | None = None,
+    ):
+        self.source = source
+        self.stages = stages
+        self.sink = sink
+        self.metrics = metrics
+        self.queue_size = queue_size
+        self.max_in_flight = max_in_flight or queue_size * (len(stages) + 1)
+        self.batches = 0
+
+    def _timed(self, stage: str):
+        return self.metrics.stage(stage) if self.metrics is not None else nullcontext()
+
+    def _consumers(self, index: int) -> int:
+        """Workers reading the queue after stage `index` (-1: the source)."""
+        return self.stages[index + 1].concurrency if index + 1 < len(self.stages) else 1
+
+    async def _feed(self, outbox: asyncio.Queue, slots: asyncio.Semaphore) -> None:
+        iterator = aiter(self.source)
+        seq = 0
+        try:
+            while True:
+                await slots.acquire()
+                with self._timed("fetch"):
+                    item = await anext(iterator, _DONE)
+                if item is _DONE:
+                    break
+                await outbox.put(Batch(seq, item.records, item.position))
+                seq += 1
+        finally:
+            if hasattr(iterator, "aclose"):
+                await iterator.aclose()
+
+        for _ in range(self._consumers(-1)):
+            await outbox.put(_DONE)
+
+    async def _work(
+        self,
+        index: int,
+        inbox: asyncio.Queue,
+        outbox: asyncio.Queue,
+        running: list[int],
+    ) -> None:
+        stage = self.stages[index]
+
+        while (batch := await inbox.get()) is not _DONE:
+            with self._timed(stage.name):
+                batch.data = await stage.apply(batch.data)
+            await outbox.put(batch)
+
+        # The last worker of the stage to finish closes the next queue.
+        running[index] -= 1
+        if running[index] == 0:
+            for _ in range(self._consumers(index)):
+                await outbox.put(_DONE)
+
+    async def _drain(self, inbox: asyncio.Queue, slots: asyncio.Semaphore) -> None:
+        waiting: dict[int, Batch] = {}
+
+        while (batch := await inbox.get()) is not _DONE:
+            waiting[batch.seq] = batch
+            while self.batches in waiting:
+                await self.sink(waiting.pop(self.batches))
+                self.batches += 1
+                slots.release()
+
+    async def run(self) -> int:
+        """Run to completion; returns the number of batches written."""
+        queues = [asyncio.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        slots = asyncio.Semaphore(self.max_in_flight)
+        running = [stage.concurrency for stage in self.stages]
+
+        coros = [self._feed(queues[0], slots)]
+        for index, stage in enumerate(self.stages):
+            coros += [
+                self._work(index, queues[index], queues[index + 1], running)
+                for _ in range(stage.concurrency)
+            ]
+        coros.append(self._drain(queues[-1], slots))
+
+        tasks = [asyncio.create_task(coro) for coro in coros]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        return self.batches
+
+
+@dataclass
+class RecordBatch:
+    """What UnifiedWriter stores for one batch."""
+
+    unified: list[dict]  # UnifiedRecord rows
+    # Raw payloads, or an EncodedPayload of them; stored as one batch.
+    payloads: list | EncodedPayload = field(default_factory=list)
+    read: int = 0  # source records the batch was built from
+    rejected: int = 0
+    # Builds the signature for the schema drift check; used for the first batch.
+    schema: Callable[[], dict] | None = None
+
+
+class UnifiedWriter:
+    """
+    Pipeline sink: stores each RecordBatch's raw payloads and unified
+    records, then advances the checkpoint (`advance(position)`) and commits
+    every `commit_every` batches.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        source: str,
+        run_id: int | None,
+        metrics: RunMetrics,
+        advance: Callable[[Any], None],
+        commit_every: int = 1,
+    ):
+        self.session = session
+        self.source = source
+        self.metrics = metrics
+        self.advance = advance
+        self.commit_every = commit_every
+        self.raw_store = RawPayloadStore(session, source, run_id)
+        self.loader = unified_record_loader(session, source)
+        self.batches = 0
+
+    async def __call__(self, batch: Batch) -> None:
+        records: RecordBatch = batch.data
+
+        if self.batches == 0 and records.schema is not None:
+            with self.metrics.stage("validate"):
+                await check_schema_drift(self.session, self.source, records.schema())
+
+        self.metrics.count(records.read, len(records.unified), records.rejected)
+
+        with self.metrics.stage("write"):
+            if isinstance(records.payloads, EncodedPayload):
+                await self.raw_store.add_encoded(records.payloads)
+            else:
+                await self.raw_store.add_batch(records.payloads)
+            written = await self.loader.add_many(records.unified)
+            await self.raw_store.flush()
+            written += await self.loader.flush()
+        self.metrics.count_written(written)
+
+        self.advance(batch.position)
+        self.batches += 1
+
+        if self.batches % self.commit_every == 0:
+            with self.metrics.stage("commit"):
+                await self.session.commit()
+
+    @property
+    def totals(self) -> BatchResult:
+        return self.loader.totals
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Callable
+
+
+def vendor_records(source: str) -> Callable[[dict[str, list], datetime], list[dict]]:
+    """UnifiedRecord rows from validated vendor feed columns (VendorProduct)."""
+
+    def to_unified(columns: dict[str, list], now: datetime) -> list[dict]:
+        return [
+            {
+                "source": source,
+                "external_id": vendor_id,
+                "name": product_name,
+                "category": group,
+                "value": amount,
+                "event_timestamp": now,
+            }
+            for vendor_id, product_name, group, amount in zip(
+                columns["vendor_id"],
+                columns["product_name"],
+                columns["group"],
+                columns["amount"],
+            )
+        ]
+
+    return to_unified
@@ -1,46 +1,129 @@
+import asyncio
 import logging
-from fastapi import FastAPI
+import os
+import time
+from datetime import datetime
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import text
 
-from core.db import engine, Base, AsyncSessionLocal
+from core.db import engine, AsyncSessionLocal
+from core.instrumentation import DB_INSTRUMENTATION, db_debug_snapshot, instrument_engine
+from core.schema import ensure_schema
 
 # FORCE MODEL REGISTRATION (MANDATORY)
 from schemas.run_models import ETLRun
 from schemas.schema_models import SchemaSnapshot
+from schemas.stats_models import RunStatusCount, SourceRecordCount
 from schemas.models import (
     RawAPIData,
     RawCSVData,
+    RawPayload,
+    RawPayloadRef,
     UnifiedRecord,
     IngestionCheckpoint,
 )
 
-from services.api_ingestion import ingest_api_data
-from services.csv_ingestion import ingest_csv_data
-from services.vendor_ingestion import ingest_vendor_data
+from ingestion.api_source.client import client as coingecko_client
+from services.circuit_breaker import breaker_states
+from services.orchestrator import ETLOrchestrator, default_jobs
+from services.stats_rollup import ensure_rollup
 from services.stats_service import get_stats
 from services.data_service import fetch_data
+from services.search_service import search_cache, search_data
+from services.cache import data_cache
+from services.export_service import EXPORT_FORMATS, stream_export
+from services.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, HTTP_REQUEST_SECONDS, registry
 
 
 logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Set to "false" on extra replicas (or when scripts/run_etl_loop.py runs as a
+# separate worker) so scaling out the API never re-runs ETL.
+ETL_ON_STARTUP = os.getenv("ETL_ON_STARTUP", "true").lower() == "true"
+DB_RETRY_SECONDS = 5
+# Request latency is recorded for these paths only, to keep label cardinality bounded.
+TIMED_PATHS = {"/data", "/data/search", "/stats", "/health"}
 
 app = FastAPI(
     title="Kasparro Backend & ETL",
     version="0.1.0",
 )
 
+if DB_INSTRUMENTATION:
+    instrument_engine(engine)
+
+orchestrator = ETLOrchestrator(default_jobs())
+app_state = {"ready": False}
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def _bootstrap() -> None:
+    # 1. Create/upgrade ALL tables (ORM models must be imported above),
+    #    retrying until the database is reachable.
+    while True:
+        try:
+            await ensure_schema(engine)
+            async with AsyncSessionLocal() as session:
+                await ensure_rollup(session)
+                await session.commit()
+            break
+        except Exception as e:
+            logger.warning(f"Database not ready ({e}); retrying in {DB_RETRY_SECONDS}s")
+            await asyncio.sleep(DB_RETRY_SECONDS)
+
+    app_state["ready"] = True
+
+    # 2. One ETL cycle in the background; the API is already serving.
+    if ETL_ON_STARTUP:
+        await orchestrator.run_once()
+
 
 @app.on_event("startup")
 async def startup() -> None:
-    # 1. Create ALL tables (ORM models must be imported above)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    task = asyncio.create_task(_bootstrap())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
-    # 2. Run ALL ingestions in a single transactional session
-    async with AsyncSessionLocal() as session:
-        await ingest_api_data(session)
-        await ingest_csv_data(session)
-        await ingest_vendor_data(session)
-        await session.commit()
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    for task in _background_tasks:
+        task.cancel()
+    await coingecko_client.aclose()
+
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    if request.url.path not in TIMED_PATHS:
+        return await call_next(request)
+
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            path=request.url.path,
+            status=str(status),
+        )
+
+
+@app.get("/metrics")
+async def metrics() -> Response:
+    return Response(content=registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/debug/db")
+async def debug_db() -> dict:
+    """Pool usage and statement timings; enable with DB_INSTRUMENTATION=true."""
+    return db_debug_snapshot()
 
 
 @app.get("/health")
@@ -55,18 +138,71 @@ async def health() -> dict:
     return {
         "status": "ok",
         "database": db_status,
+        "ready": app_state["ready"] and db_status == "ok",
+        "etl": orchestrator.snapshot(),
+        "circuit_breakers": breaker_states(),
     }
 
 
 @app.get("/stats")
 async def stats() -> dict:
     async with AsyncSessionLocal() as session:
-        return await get_stats(session)
+        return {
+            **await get_stats(session),
+            "cache": data_cache.stats(),
+            "search_cache": search_cache.stats(),
+        }
+
+
 @app.get("/data")
 async def get_data(
     source: str | None = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
+):
+    async with AsyncSessionLocal() as session:
+        try:
+            body = await fetch_data(session, source, limit, offset, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/data/search")
+async def search(
+    q: str | None = None,
+    source: str | None = None,
+    category: str | None = None,
+    limit: int = 10,
 ):
     async with AsyncSessionLocal() as session:
-        return await fetch_data(session, source, limit, offset)
+        try:
+            body = await search_data(session, q, source, category, limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return Response(content=body, media_type="application/json")
+
+
+@app.get("/data/export")
+async def export_data(
+    format: str = "ndjson",
+    source: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}",
+        )
+
+    return StreamingResponse(
+        stream_export(engine, format, source, since, until),
+        media_type=EXPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="unified_records.{format}"'
+        },
+    )
@@ -1,10 +1,13 @@
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     String,
     DateTime,
     JSON,
     Float,
+    Index,
+    LargeBinary,
     UniqueConstraint,
 )
 from sqlalchemy.sql import func
@@ -29,6 +32,38 @@ class RawCSVData(Base):
     ingested_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class RawPayload(Base):
+    """
+    Raw source payloads stored once per distinct content, compressed.
+    """
+
+    __tablename__ = "raw_payloads"
+
+    content_hash = Column(String(64), primary_key=True)  # sha256 of canonical JSON
+    codec = Column(String, nullable=False)  # zstd | gzip | identity
+    body = Column(LargeBinary, nullable=False)
+    raw_size = Column(Integer, nullable=False)
+    # Payloads in the body, one canonical JSON line each; NULL for the
+    # older one-payload-per-row bodies.
+    row_count = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class RawPayloadRef(Base):
+    """
+    One row per payload batch seen by a run; replaces copying bodies into
+    raw_api_data / raw_csv_data, which now only hold older history.
+    """
+
+    __tablename__ = "raw_payload_refs"
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, nullable=True)
+    source = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=False, index=True)
+    ingested_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class UnifiedRecord(Base):
     __tablename__ = "unified_records"
 
@@ -40,9 +75,16 @@ class UnifiedRecord(Base):
     value = Column(Float, nullable=False)
     event_timestamp = Column(DateTime(timezone=True), nullable=False)
     ingested_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Hash of name/category/value; upserts only rewrite the row when it changes
+    content_hash = Column(String(32), nullable=True)
 
     __table_args__ = (
         UniqueConstraint("source", "external_id", name="uq_source_external"),
+        # Keyset pagination order for GET /data
+        Index("ix_unified_source_id", "source", "id"),
+        # since / until window of GET /data/export
+        Index("ix_unified_ingested_at", "ingested_at"),
+        # Search indexes are Postgres-only; see core/schema.py.
     )
 
 
@@ -52,4 +94,10 @@ class IngestionCheckpoint(Base):
     id = Column(Integer, primary_key=True)
     source = Column(String, nullable=False, unique=True)
     last_processed_marker = Column(String, nullable=True)
+    # CSV sources: fingerprint of the file plus the position of the last committed row
+    file_fingerprint = Column(String, nullable=True)
+    byte_offset = Column(BigInteger, nullable=True)
+    row_number = Column(BigInteger, nullable=True)
+    # API source: numeric position in the remote listing
+    cursor = Column(BigInteger, nullable=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
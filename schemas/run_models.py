@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Float, Integer, String, DateTime
 from sqlalchemy.sql import func
 
 from core.db import Base
@@ -13,3 +13,19 @@ class ETLRun(Base):
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     finished_at = Column(DateTime(timezone=True), nullable=True)
     error_message = Column(String, nullable=True)
+
+    # Row counts for the run
+    rows_read = Column(Integer, nullable=True)
+    rows_valid = Column(Integer, nullable=True)
+    rows_invalid = Column(Integer, nullable=True)
+    rows_inserted = Column(Integer, nullable=True)
+    rows_updated = Column(Integer, nullable=True)
+    rows_skipped = Column(Integer, nullable=True)  # valid but unchanged
+
+    # Time per stage, summed over the run. Pipeline stages overlap, so
+    # together they can exceed the run's wall time.
+    fetch_ms = Column(Float, nullable=True)
+    validate_ms = Column(Float, nullable=True)
+    transform_ms = Column(Float, nullable=True)
+    write_ms = Column(Float, nullable=True)
+    commit_ms = Column(Float, nullable=True)
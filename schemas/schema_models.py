@@ -10,4 +10,5 @@ class SchemaSnapshot(Base):
     id = Column(Integer, primary_key=True)
     source = Column(String, nullable=False, unique=True)
     schema_signature = Column(JSON, nullable=False)
+    signature_hash = Column(String(64), nullable=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,30 @@
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+
+from core.db import Base
+
+
+class RunStatusCount(Base):
+    __tablename__ = "run_status_counts"
+
+    status = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+    last_finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class SourceRecordCount(Base):
+    __tablename__ = "source_record_counts"
+
+    source = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+
+
+class DataGeneration(Base):
+    """
+    Single row counting commits that changed unified records, so API
+    processes can tell when another process (e.g. the ETL worker) wrote.
+    """
+
+    __tablename__ = "data_generation"
+
+    id = Column(Integer, primary_key=True)
+    generation = Column(BigInteger, nullable=False, default=0)
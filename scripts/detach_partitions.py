@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+import os
+
+# Add project root to PYTHONPATH
+ROOT_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT_DIR))
+
+# Load environment variables
+from dotenv import load_dotenv
+load_dotenv()
+
+# Fail fast if still misconfigured
+if not os.getenv("DATABASE_URL"):
+    raise RuntimeError("DATABASE_URL is not set")
+
+import argparse
+import asyncio
+from datetime import date
+
+from core.db import AsyncSessionLocal
+from core.partitions import detach_months_before, detach_source, list_partitions
+
+
+async def run(args) -> None:
+    async with AsyncSessionLocal() as session:
+        if args.list:
+            for parent in ("unified_records", "raw_payload_refs"):
+                for name, bound in await list_partitions(session, parent):
+                    print(f"{parent}: {name} {bound}")
+
+        if args.source:
+            await detach_source(session, args.source, drop=args.drop)
+
+        if args.raw_refs_before:
+            before = date.fromisoformat(f"{args.raw_refs_before}-01")
+            detached = await detach_months_before(session, before, drop=args.drop)
+            print(f"Detached: {', '.join(detached) or 'nothing'}")
+
+        await session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Detach partitions created with DB_PARTITIONING instead of bulk DELETEs."
+    )
+    parser.add_argument("--list", action="store_true", help="show current partitions")
+    parser.add_argument("--source", help="detach this source's unified_records partition")
+    parser.add_argument(
+        "--raw-refs-before",
+        metavar="YYYY-MM",
+        help="detach raw_payload_refs months that end on or before this month starts",
+    )
+    parser.add_argument("--drop", action="store_true", help="drop detached partitions")
+    asyncio.run(run(parser.parse_args()))
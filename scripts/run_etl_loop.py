@@ -15,34 +15,20 @@ if not os.getenv("DATABASE_URL"):
     raise RuntimeError("DATABASE_URL is not set")
 
 import asyncio
-import time
-from core.db import AsyncSessionLocal
-from services.api_ingestion import ingest_api_data
-from services.csv_ingestion import ingest_csv_data
-from services.vendor_ingestion import ingest_vendor_data
+from services.orchestrator import ETLOrchestrator, default_jobs
 
-INTERVAL_SECONDS = 3600  # 1 hour
 
+async def run(once: bool = False):
+    orchestrator = ETLOrchestrator(default_jobs())
 
-async def run():
-    while True:
-        async with AsyncSessionLocal() as session:
-            await ingest_api_data(session)
-            await session.commit()   # 🔥 REQUIRED
-            session.expunge_all()
+    if once:
+        await orchestrator.run_once()
+        print(f"ETL cycle completed: {orchestrator.snapshot()}")
+        return
 
-        async with AsyncSessionLocal() as session:
-            await ingest_csv_data(session)
-            await session.commit()
-            session.expunge_all()
-
-        async with AsyncSessionLocal() as session:
-            await ingest_vendor_data(session)
-            await session.commit()
-
-        print("ETL cycle completed. Sleeping...")
-        time.sleep(INTERVAL_SECONDS)
+    # Each source loops on its own interval (ETL_INTERVAL_<SOURCE>, default 1h)
+    await orchestrator.run_forever()
 
 
 if __name__ == "__main__":
-    asyncio.run(run())
+    asyncio.run(run(once="--once" in sys.argv[1:]))
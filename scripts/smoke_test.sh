@@ -1,8 +1,8 @@
 #!/bin/bash
 set -e
 
-echo "Running ETL loop inside container..."
-uv run python scripts/run_etl_loop.py
+echo "Running one ETL cycle inside container..."
+uv run python scripts/run_etl_loop.py --once
 
 echo "Checking health endpoint..."
 curl -f http://localhost:8000/health
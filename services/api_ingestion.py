@@ -1,112 +1,73 @@
 import logging
-from datetime import datetime, timezone
+import os
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert
 
-from ingestion.api_source.client import fetch_products
-from schemas.models import RawAPIData, UnifiedRecord, IngestionCheckpoint
-from schemas.run_models import ETLRun
-from schemas.schema_models import SchemaSnapshot
-from services.schema_drift import extract_schema_signature, diff_schemas
+from ingestion.api_source.source import coin_pages, transform_stage
+from ingestion.pipeline import Pipeline, UnifiedWriter
+from services.bulk_loader import BatchResult
+from services.checkpoints import advance_api_cursor, api_cursor, get_or_create_checkpoint
+from services.run_tracking import RunMetrics, finish_run, start_run
 
 logger = logging.getLogger(__name__)
 
 BATCH_SIZE = 200
 SOURCE_NAME = "coingecko_api"
+# Drain mode ingests every remaining page in one run instead of one batch.
+API_DRAIN = os.getenv("API_DRAIN", "false").lower() == "true"
 
 
-async def ingest_api_data(session: AsyncSession) -> None:
-    run = ETLRun(source=SOURCE_NAME, status="running")
-    session.add(run)
-    await session.flush()
+async def ingest_api_data(session: AsyncSession, drain: bool = API_DRAIN) -> BatchResult:
+    """
+    Ingest the next BATCH_SIZE coins after the checkpoint cursor.
+    Returns inserted / updated / unchanged counts for the run.
 
-    try:
-        checkpoint = await session.scalar(
-            select(IngestionCheckpoint).where(
-                IngestionCheckpoint.source == SOURCE_NAME
-            )
-        )
+    With `drain`, keep going until the listing is exhausted: the next page
+    is fetched while the current one is written, and the cursor is
+    committed after every page so a crash resumes where it stopped.
 
-        skip = int(checkpoint.last_processed_marker) if checkpoint else 0
-        data = await fetch_products(skip=skip, limit=BATCH_SIZE)
-        coins = data.get("coins", [])
+    Once the listing is exhausted the cursor goes back to 0; unchanged
+    coins are skipped by the content-hash upsert, so a re-sweep is cheap.
+    """
+    run = await start_run(session, SOURCE_NAME)
+    metrics = RunMetrics(SOURCE_NAME)
 
-        # ---------- Schema Drift ----------
-        current_schema = extract_schema_signature(data)
-        snapshot = await session.scalar(
-            select(SchemaSnapshot).where(
-                SchemaSnapshot.source == SOURCE_NAME
-            )
+    try:
+        checkpoint = await get_or_create_checkpoint(session, SOURCE_NAME)
+        writer = UnifiedWriter(
+            session,
+            SOURCE_NAME,
+            run.id,
+            metrics,
+            lambda cursor: advance_api_cursor(checkpoint, cursor),
         )
-
-        if snapshot:
-            diff = diff_schemas(snapshot.schema_signature, current_schema)
-            if diff["change_score"] > 0:
-                logger.warning(f"SCHEMA DRIFT DETECTED: {diff}")
-            snapshot.schema_signature = current_schema
-        else:
-            session.add(
-                SchemaSnapshot(
-                    source=SOURCE_NAME,
-                    schema_signature=current_schema,
-                )
-            )
-        # ----------------------------------
-
-        if not coins:
-            run.status = "success"
-            return
-
-        # Raw payload storage (ORM is fine here)
-        session.add(
-            RawAPIData(
-                source=SOURCE_NAME,
-                payload=data,
-            )
+        pipeline = Pipeline(
+            coin_pages(api_cursor(checkpoint), BATCH_SIZE, drain),
+            [transform_stage(SOURCE_NAME)],
+            writer,
+            metrics,
         )
-
-        # 🚨 CRITICAL FIX: Core insert ONLY
-        rows = [
-            {
-                "source": SOURCE_NAME,
-                "external_id": coin["id"],
-                "name": coin.get("name"),
-                "category": coin.get("symbol"),
-                "value": 0.0,
-                "event_timestamp": datetime.now(timezone.utc),
-            }
-            for coin in coins
-        ]
-
-        stmt = (
-            insert(UnifiedRecord)
-            .values(rows)
-            .on_conflict_do_nothing(
-                index_elements=["source", "external_id"]
-            )
+        pages = await pipeline.run()
+
+        if (drain or not pages) and api_cursor(checkpoint) != 0:
+            # Past the end of the listing: start the next sweep from the top,
+            # picking up new coins and changes to ones already passed.
+            advance_api_cursor(checkpoint, 0)
+            await session.commit()
+
+        await finish_run(session, run, "success", metrics=metrics)
+        if not pages:
+            return BatchResult()
+
+        totals = writer.totals
+        logger.warning(
+            f"COINGECKO INGESTION COMPLETED — pages {pages}, "
+            f"inserted {totals.inserted}, updated {totals.updated}, "
+            f"unchanged {totals.unchanged}"
         )
-
-        await session.execute(stmt)
-
-        new_skip = skip + len(coins)
-
-        if checkpoint:
-            checkpoint.last_processed_marker = str(new_skip)
-        else:
-            session.add(
-                IngestionCheckpoint(
-                    source=SOURCE_NAME,
-                    last_processed_marker=str(new_skip),
-                )
-            )
-
-        run.status = "success"
-        logger.warning("COINGECKO INGESTION COMPLETED")
+        return totals
 
     except Exception as e:
-        run.status = "failed"
-        run.error_message = str(e)
+        await finish_run(session, run, "failed", str(e), metrics=metrics)
         logger.exception("CoinGecko ingestion failed")
         raise
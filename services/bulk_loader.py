@@ -0,0 +1,264 @@
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from sqlalchemy import Table, insert as sa_insert, literal_column, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from schemas.models import UnifiedRecord
+from services.cache import mark_data_changed
+from services.stats_rollup import add_source_records
+
+logger = logging.getLogger(__name__)
+
+# Rows buffered per write; a full CSV chunk fits in one batch.
+DEFAULT_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "5000"))
+# Batches at or above this size go through COPY into a staging table
+# instead of a multi-row INSERT.
+COPY_THRESHOLD = int(os.getenv("BULK_COPY_THRESHOLD", "1000"))
+# Bind parameters asyncpg accepts in one statement; longer multi-row
+# INSERTs are split.
+MAX_BIND_PARAMS = 32767
+
+
+@dataclass
+class BatchResult:
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __iadd__(self, other: "BatchResult") -> "BatchResult":
+        self.rows += other.rows
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        return self
+
+
+class BulkLoader:
+    """
+    Buffers rows for one table and writes them in batches.
+
+    Small batches use a multi-row INSERT ... ON CONFLICT, large ones are
+    COPY'd into a temp staging table first. Conflicting rows are counted
+    instead of aborting the transaction. Pass copy_threshold=None to always
+    use INSERT (e.g. JSON columns).
+
+    With `update_columns` and `hash_column` conflicts become
+    DO UPDATE ... WHERE the stored hash differs, so only rows whose content
+    changed are rewritten; `hash_fn` fills the hash column on add().
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        table: Table,
+        *,
+        conflict_columns: tuple[str, ...] | None = None,
+        update_columns: tuple[str, ...] | None = None,
+        hash_column: str | None = None,
+        hash_fn: Callable[[dict], str] | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        copy_threshold: int | None = COPY_THRESHOLD,
+        on_flush: Callable[[BatchResult], Awaitable[None]] | None = None,
+    ):
+        self.session = session
+        self.table = table
+        self.conflict_columns = conflict_columns
+        self.update_columns = update_columns
+        self.hash_column = hash_column
+        self.hash_fn = hash_fn
+        self.batch_size = batch_size
+        self.copy_threshold = copy_threshold
+        self.on_flush = on_flush
+        self.totals = BatchResult()
+        self._buffer: list[dict] = []
+
+    @property
+    def upsert(self) -> bool:
+        return bool(self.conflict_columns and self.update_columns and self.hash_column)
+
+    async def add(self, row: dict) -> BatchResult | None:
+        if self.hash_fn is not None:
+            row[self.hash_column] = self.hash_fn(row)
+        self._buffer.append(row)
+        if len(self._buffer) >= self.batch_size:
+            return await self.flush()
+        return None
+
+    async def add_many(self, rows: list[dict]) -> BatchResult:
+        result = BatchResult()
+        for row in rows:
+            batch = await self.add(row)
+            if batch:
+                result += batch
+        return result
+
+    async def flush(self) -> BatchResult:
+        if not self._buffer:
+            return BatchResult()
+
+        rows, self._buffer = self._buffer, []
+        total = len(rows)
+
+        if self.upsert:
+            # DO UPDATE may not touch the same row twice in one statement.
+            rows = list({tuple(r[c] for c in self.conflict_columns): r for r in rows}.values())
+
+        if self.copy_threshold is not None and len(rows) >= self.copy_threshold:
+            inserted, updated = await self._copy_batch(rows)
+        else:
+            inserted, updated = await self._insert_batch(rows)
+
+        result = BatchResult(
+            rows=total,
+            inserted=inserted,
+            updated=updated,
+            unchanged=total - inserted - updated,
+        )
+        self.totals += result
+
+        if self.on_flush is not None:
+            await self.on_flush(result)
+
+        logger.info(
+            f"{self.table.name}: batch of {result.rows} rows — inserted "
+            f"{result.inserted}, updated {result.updated}, unchanged {result.unchanged}"
+        )
+        return result
+
+    def _returning_column(self):
+        return list(self.table.primary_key.columns)[0]
+
+    @staticmethod
+    def _count(returned) -> tuple[int, int]:
+        # Upserts return (xmax = 0): true for fresh inserts, false for updates.
+        inserted = sum(1 for (is_insert,) in returned if is_insert)
+        return inserted, len(returned) - inserted
+
+    async def _insert_batch(self, rows: list[dict]) -> tuple[int, int]:
+        if self.conflict_columns is None:
+            await self.session.execute(sa_insert(self.table), rows)
+            return len(rows), 0
+
+        per_statement = max(MAX_BIND_PARAMS // len(rows[0]), 1)
+        inserted = updated = 0
+        for start in range(0, len(rows), per_statement):
+            counts = await self._insert_rows(rows[start : start + per_statement])
+            inserted += counts[0]
+            updated += counts[1]
+        return inserted, updated
+
+    def _insert_statement(self, rows: list[dict]):
+        stmt = insert(self.table).values(rows)
+
+        if self.upsert:
+            return stmt.on_conflict_do_update(
+                index_elements=list(self.conflict_columns),
+                set_={c: stmt.excluded[c] for c in self.update_columns},
+                where=self.table.c[self.hash_column].is_distinct_from(
+                    stmt.excluded[self.hash_column]
+                ),
+            ).returning(literal_column("(xmax = 0)"))
+
+        return stmt.on_conflict_do_nothing(
+            index_elements=list(self.conflict_columns)
+        ).returning(self._returning_column())
+
+    async def _insert_rows(self, rows: list[dict]) -> tuple[int, int]:
+        result = await self.session.execute(self._insert_statement(rows))
+        if self.upsert:
+            return self._count(result.all())
+        return len(result.all()), 0
+
+    async def _copy_batch(self, rows: list[dict]) -> tuple[int, int]:
+        columns = list(rows[0].keys())
+        stage = f"_stage_{self.table.name}"
+        column_list = ", ".join(columns)
+
+        conn = await self.session.connection()
+
+        # Every column of the target, types only (no constraints/defaults),
+        # so a stage left from an earlier batch fits any set of row keys;
+        # COPY names the columns it fills. Dropped at commit.
+        await conn.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DROP AS "
+                f"SELECT * FROM {self.table.name} WITH NO DATA"
+            )
+        )
+
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            stage,
+            records=[tuple(row[c] for c in columns) for row in rows],
+            columns=columns,
+        )
+
+        stmt = f"INSERT INTO {self.table.name} ({column_list}) SELECT {column_list} FROM {stage}"
+
+        if self.upsert:
+            conflict = ", ".join(self.conflict_columns)
+            updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in self.update_columns)
+            stmt += (
+                f" ON CONFLICT ({conflict}) DO UPDATE SET {updates}"
+                f" WHERE {self.table.name}.{self.hash_column}"
+                f" IS DISTINCT FROM EXCLUDED.{self.hash_column}"
+                f" RETURNING (xmax = 0)"
+            )
+            result = await conn.execute(text(stmt))
+            counts = self._count(result.all())
+        elif self.conflict_columns is not None:
+            stmt += (
+                f" ON CONFLICT ({', '.join(self.conflict_columns)}) DO NOTHING"
+                f" RETURNING {self._returning_column().name}"
+            )
+            result = await conn.execute(text(stmt))
+            counts = len(result.all()), 0
+        else:
+            await conn.execute(text(stmt))
+            counts = len(rows), 0
+
+        await conn.execute(text(f"TRUNCATE {stage}"))
+        return counts
+
+
+UNIFIED_CONTENT_COLUMNS = ("name", "category", "value")
+
+
+def unified_row_hash(row: dict) -> str:
+    """
+    Hash of the fields whose change should rewrite a unified record.
+    """
+    content = "\x1f".join(str(row.get(c)) for c in UNIFIED_CONTENT_COLUMNS)
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def unified_record_loader(session: AsyncSession, source: str, **kwargs) -> BulkLoader:
+    """
+    Change-aware upsert loader for unified_records: new rows are inserted,
+    rows whose content hash changed are updated, identical rows are left
+    alone. Keeps the per-source record count rollup in step with every
+    batch, in the same transaction.
+    """
+
+    async def on_flush(result: BatchResult) -> None:
+        if result.inserted:
+            await add_source_records(session, source, result.inserted)
+        if result.inserted or result.updated:
+            mark_data_changed(session)
+
+    return BulkLoader(
+        session,
+        UnifiedRecord.__table__,
+        conflict_columns=("source", "external_id"),
+        update_columns=(*UNIFIED_CONTENT_COLUMNS, "event_timestamp", "content_hash"),
+        hash_column="content_hash",
+        hash_fn=unified_row_hash,
+        on_flush=on_flush,
+        **kwargs,
+    )
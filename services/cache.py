@@ -0,0 +1,209 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from schemas.stats_models import DataGeneration
+
+DATA_CACHE_SIZE = int(os.getenv("DATA_CACHE_SIZE", "256"))
+# Upper bound on how long any cached response is served.
+DATA_CACHE_TTL = float(os.getenv("DATA_CACHE_TTL", "300"))
+# How often the data_generation row is read to notice other processes' writes.
+DATA_GENERATION_POLL = float(os.getenv("DATA_GENERATION_POLL", "2"))
+
+
+class TTLCache:
+    """
+    Single-process cache whose entries expire `ttl` seconds after being set.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict[Any, tuple[float, Any]] = {}
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key, None)
+            return default
+
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class CacheBackend(ABC):
+    """
+    Storage for a response cache. Calls happen on the request path, so
+    keep them fast.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Any: ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None: ...
+
+    @abstractmethod
+    def generation(self) -> int: ...
+
+    @abstractmethod
+    def bump_generation(self) -> int: ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Size-bounded LRU, local to this process. Entries also expire `ttl`
+    seconds after being set.
+    """
+
+    def __init__(self, maxsize: int = DATA_CACHE_SIZE, ttl: float = DATA_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._generation = 0
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def generation(self) -> int:
+        return self._generation
+
+    def bump_generation(self) -> int:
+        self._generation += 1
+        # Entries keyed on older generations can never be hit again.
+        self._entries.clear()
+        return self._generation
+
+
+_response_caches: list["ResponseCache"] = []
+
+
+class ResponseCache:
+    """
+    Caches responses keyed on the request parameters plus the current data
+    generation, which is bumped whenever new unified records are committed:
+    at once for commits in this process, and within `poll_seconds` (see
+    sync_generation) for commits made elsewhere.
+    """
+
+    def __init__(self, backend: CacheBackend, poll_seconds: float = DATA_GENERATION_POLL):
+        self.backend = backend
+        self.poll_seconds = poll_seconds
+        self.hits = 0
+        self.misses = 0
+        self._db_generation: int | None = None
+        self._next_poll = 0.0
+        _response_caches.append(self)
+
+    async def sync_generation(self, session: AsyncSession) -> None:
+        """
+        Start a new generation if the data_generation row moved since the
+        last check. Reads it at most every `poll_seconds`.
+        """
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+        self._next_poll = now + self.poll_seconds
+
+        generation = await session.scalar(select(DataGeneration.generation)) or 0
+        if self._db_generation is not None and generation != self._db_generation:
+            self.backend.bump_generation()
+        self._db_generation = generation
+
+    def key(self, *parts: Any) -> str:
+        return ":".join([str(self.backend.generation()), *map(str, parts)])
+
+    def get(self, key: str) -> Any:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self.backend.set(key, value)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "generation": self.backend.generation(),
+        }
+
+
+data_cache = ResponseCache(InMemoryCacheBackend())
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    data_cache.backend = backend
+
+
+def mark_data_changed(session: Session | AsyncSession) -> None:
+    """
+    Flag the session so its next successful commit bumps the data generation.
+    """
+    session.info["data_changed"] = True
+
+
+_BUMP_DB_GENERATION = (
+    insert(DataGeneration)
+    .values(id=1, generation=1)
+    .on_conflict_do_update(
+        index_elements=[DataGeneration.id],
+        set_={"generation": DataGeneration.generation + 1},
+    )
+)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_db_generation(session: Session) -> None:
+    # In the committing transaction, so other processes see the new
+    # generation exactly when they can see the new data.
+    if session.info.get("data_changed") and session.bind is not None:
+        session.execute(_BUMP_DB_GENERATION)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_generation_on_commit(session: Session) -> None:
+    if session.info.pop("data_changed", False):
+        for cache in _response_caches:
+            cache.backend.bump_generation()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_flag_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop("data_changed", None)
@@ -0,0 +1,74 @@
+import logging
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ingestion.csv_source.chunks import fingerprint_matches
+from schemas.models import IngestionCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+async def get_or_create_checkpoint(
+    session: AsyncSession,
+    source: str,
+) -> IngestionCheckpoint:
+    checkpoint = await session.scalar(
+        select(IngestionCheckpoint).where(IngestionCheckpoint.source == source)
+    )
+
+    if checkpoint is None:
+        checkpoint = IngestionCheckpoint(source=source)
+        session.add(checkpoint)
+
+    return checkpoint
+
+
+def file_resume_position(
+    checkpoint: IngestionCheckpoint,
+    path: Path,
+) -> tuple[int, int]:
+    """
+    Returns (byte_offset, row_number) to resume reading `path` from.
+    Falls back to the start of the file if there is no usable checkpoint
+    or the file no longer matches its stored fingerprint.
+    """
+    if not checkpoint.file_fingerprint or not checkpoint.byte_offset:
+        return 0, 0
+
+    if not fingerprint_matches(path, checkpoint.file_fingerprint, checkpoint.byte_offset):
+        logger.warning(
+            f"{checkpoint.source}: file fingerprint changed, re-reading {path} from start"
+        )
+        return 0, 0
+
+    return checkpoint.byte_offset, checkpoint.row_number or 0
+
+
+def advance_file_checkpoint(
+    checkpoint: IngestionCheckpoint,
+    fingerprint: str,
+    byte_offset: int,
+    row_number: int,
+) -> None:
+    checkpoint.file_fingerprint = fingerprint
+    checkpoint.byte_offset = byte_offset
+    checkpoint.row_number = row_number
+    checkpoint.last_processed_marker = str(row_number)
+
+
+def api_cursor(checkpoint: IngestionCheckpoint) -> int:
+    if checkpoint.cursor is not None:
+        return checkpoint.cursor
+
+    # Checkpoints written before the typed cursor column existed
+    if checkpoint.last_processed_marker and checkpoint.last_processed_marker.isdigit():
+        return int(checkpoint.last_processed_marker)
+
+    return 0
+
+
+def advance_api_cursor(checkpoint: IngestionCheckpoint, cursor: int) -> None:
+    checkpoint.cursor = cursor
+    checkpoint.last_processed_marker = str(cursor)
@@ -1,16 +1,28 @@
 import logging
-import csv
-from datetime import datetime, timezone
 from pathlib import Path
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
-from pydantic import ValidationError
 
+from ingestion.csv_source.chunks import (
+    CSV_CHUNK_SIZE,
+    CSV_COMMIT_EVERY_CHUNKS,
+    file_fingerprint,
+)
+from ingestion.csv_source.source import (
+    csv_file_source,
+    product_records,
+    transform_stage,
+    validate_stage,
+)
+from ingestion.pipeline import Pipeline, UnifiedWriter
 from schemas.csv_schema import CSVProduct
-from schemas.models import RawCSVData, UnifiedRecord, IngestionCheckpoint
-from schemas.run_models import ETLRun
+from services.bulk_loader import BatchResult
+from services.checkpoints import (
+    advance_file_checkpoint,
+    file_resume_position,
+    get_or_create_checkpoint,
+)
+from services.run_tracking import RunMetrics, finish_run, start_run
 
 logger = logging.getLogger(__name__)
 
@@ -18,112 +30,74 @@ SOURCE_NAME = "products_csv"
 CSV_PATH = Path("data/products.csv")
 
 
-async def ingest_csv_data(session: AsyncSession) -> None:
+async def ingest_csv_data(
+    session: AsyncSession,
+    chunk_size: int = CSV_CHUNK_SIZE,
+    commit_every: int = CSV_COMMIT_EVERY_CHUNKS,
+) -> BatchResult:
+    """
+    Ingest new rows of the products CSV. Returns inserted / updated /
+    unchanged counts for the run. A failed run is recorded and the error
+    re-raised, so the orchestrator reports the source as failing.
+    """
     logger.warning("CSV INGESTION STARTED")
     logger.warning(f"CSV path resolved to: {CSV_PATH.resolve()}")
     logger.warning(f"CSV file exists: {CSV_PATH.exists()}")
 
-    run = ETLRun(source=SOURCE_NAME, status="running")
-    session.add(run)
-    await session.flush()
-
-    duplicate_count = 0
+    run = await start_run(session, SOURCE_NAME)
+    metrics = RunMetrics(SOURCE_NAME)
 
     if not CSV_PATH.exists():
         logger.error("CSV file not found inside container. Skipping CSV ingestion.")
-        run.status = "failed"
-        run.error_message = "CSV file not found"
-        return
+        await finish_run(session, run, "failed", "CSV file not found")
+        raise FileNotFoundError(f"{CSV_PATH} not found")
 
     try:
-        checkpoint = await session.scalar(
-            select(IngestionCheckpoint).where(
-                IngestionCheckpoint.source == SOURCE_NAME
-            )
+        checkpoint = await get_or_create_checkpoint(session, SOURCE_NAME)
+        fingerprint = file_fingerprint(CSV_PATH)
+        start_offset, start_row = file_resume_position(checkpoint, CSV_PATH)
+
+        writer = UnifiedWriter(
+            session,
+            SOURCE_NAME,
+            run.id,
+            metrics,
+            lambda position: advance_file_checkpoint(checkpoint, fingerprint, *position),
+            commit_every,
         )
+        pipeline = Pipeline(
+            csv_file_source(CSVProduct, CSV_PATH, chunk_size, start_offset, start_row),
+            [
+                validate_stage(CSVProduct),
+                transform_stage(product_records(SOURCE_NAME), "CSV"),
+            ],
+            writer,
+            metrics,
+        )
+        await pipeline.run()
 
-        processed_ids = set()
-        if checkpoint and checkpoint.last_processed_marker:
-            processed_ids = set(checkpoint.last_processed_marker.split(","))
-
-        new_processed_ids = set()
-
-        with CSV_PATH.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-
-            for row in reader:
-                try:
-                    product = CSVProduct(**row)
-                except ValidationError as e:
-                    logger.warning(
-                        f"Skipping invalid CSV row: {row} | validation error: {e}"
-                    )
-                    continue
-                except Exception as e:
-                    logger.error(
-                        f"Unexpected CSV error: {row} | error: {e}"
-                    )
-                    continue
-
-                if str(product.product_id) in processed_ids:
-                    continue
-
-                session.add(
-                    RawCSVData(
-                        source=SOURCE_NAME,
-                        payload=row,
-                    )
-                )
-
-                try:
-                    session.add(
-                        UnifiedRecord(
-                            source=SOURCE_NAME,
-                            external_id=str(product.product_id),
-                            name=product.name,
-                            category=product.category,
-                            value=product.price,
-                            event_timestamp=datetime.now(timezone.utc),
-                        )
-                    )
-                    await session.flush()
-
-                except IntegrityError:
-                    await session.rollback()
-                    duplicate_count += 1
-                    continue
-
-                new_processed_ids.add(str(product.product_id))
-
-        if not new_processed_ids:
-            run.status = "success"
+        if metrics.rows["read"] == 0:
+            await finish_run(session, run, "success", metrics=metrics)
             logger.warning("No new CSV records ingested")
-            return
-
-        merged_ids = sorted(processed_ids | new_processed_ids)
+            return writer.totals
 
-        if checkpoint:
-            checkpoint.last_processed_marker = ",".join(merged_ids)
-        else:
-            session.add(
-                IngestionCheckpoint(
-                    source=SOURCE_NAME,
-                    last_processed_marker=",".join(merged_ids),
-                )
-            )
+        totals = writer.totals
 
-        run.status = (
-            "success_with_duplicates"
-            if duplicate_count > 0
-            else "success"
+        await finish_run(
+            session,
+            run,
+            "success_with_duplicates" if totals.unchanged > 0 else "success",
+            metrics=metrics,
         )
 
         logger.warning(
-            f"CSV INGESTION COMPLETED — records added: {len(new_processed_ids)}, "
-            f"duplicates skipped: {duplicate_count}"
+            f"CSV INGESTION COMPLETED — records added: {totals.inserted}, "
+            f"updated: {totals.updated}, unchanged: {totals.unchanged}, "
+            f"rejected: {metrics.rows['invalid']}"
         )
+        return totals
 
     except Exception as e:
-        run.status = "failed"
-        run.error_message = str(e)
+        await finish_run(session, run, "failed", str(e), metrics=metrics)
         logger.exception("CSV ingestion failed unexpectedly")
+        raise
@@ -1,9 +1,59 @@
+import base64
+import json
 import time
 import uuid
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from schemas.models import UnifiedRecord
+from services.cache import data_cache
+from services.serialization import dumps
+
+# Columns returned by the list endpoints, selected as plain Core rows.
+DATA_COLUMNS = (
+    UnifiedRecord.id,
+    UnifiedRecord.source,
+    UnifiedRecord.external_id,
+    UnifiedRecord.name,
+    UnifiedRecord.category,
+    UnifiedRecord.value,
+    UnifiedRecord.event_timestamp,
+)
+
+
+def encode_cursor(source: str, record_id: int) -> str:
+    raw = json.dumps([source, record_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        source, record_id = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise ValueError("invalid cursor")
+
+    if not isinstance(source, str) or not isinstance(record_id, int):
+        raise ValueError("invalid cursor")
+
+    return source, record_id
+
+
+def serialize_page(rows, limit: int) -> bytes:
+    """
+    JSON body (without the per-request envelope) for a page of DATA_COLUMNS rows.
+    """
+    next_cursor = None
+    if rows and len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1].source, rows[-1].id)
+
+    return dumps(
+        {
+            "count": len(rows),
+            "next_cursor": next_cursor,
+            "data": [row._asdict() for row in rows],
+        }
+    )
 
 
 async def fetch_data(
@@ -11,36 +61,51 @@ async def fetch_data(
     source: str | None,
     limit: int,
     offset: int,
-):
+    cursor: str | None = None,
+) -> bytes:
+    """
+    Page through unified records ordered by (source, id), returned as
+    pre-serialized JSON.
+    With `cursor` the page starts after that key and `offset` is ignored;
+    this stays as cheap as the first page however deep it goes.
+    Pages are served from the response cache until new data is committed.
+    """
     start = time.time()
     request_id = str(uuid.uuid4())
+    after = decode_cursor(cursor) if cursor else None
+
+    await data_cache.sync_generation(session)
+    cache_key = data_cache.key("data", source, limit, offset, cursor)
+    page = data_cache.get(cache_key)
+    if page is None:
+        page = await _fetch_page(session, source, limit, offset, after)
+        data_cache.set(cache_key, page)
 
-    query = select(UnifiedRecord)
+    latency_ms = int((time.time() - start) * 1000)
+
+    # Splice the per-request fields in front of the cached page body.
+    envelope = dumps({"request_id": request_id, "api_latency_ms": latency_ms})
+    return envelope[:-1] + b"," + page[1:]
+
+
+async def _fetch_page(
+    session: AsyncSession,
+    source: str | None,
+    limit: int,
+    offset: int,
+    after: tuple[str, int] | None,
+) -> bytes:
+    query = select(*DATA_COLUMNS)
 
     if source:
         query = query.where(UnifiedRecord.source == source)
 
-    query = query.limit(limit).offset(offset)
+    if after:
+        query = query.where(tuple_(UnifiedRecord.source, UnifiedRecord.id) > after)
+    else:
+        query = query.offset(offset)
 
-    result = await session.execute(query)
-    records = result.scalars().all()
+    query = query.order_by(UnifiedRecord.source, UnifiedRecord.id).limit(limit)
 
-    latency_ms = int((time.time() - start) * 1000)
-
-    return {
-        "request_id": request_id,
-        "api_latency_ms": latency_ms,
-        "count": len(records),
-        "data": [
-            {
-                "id": r.id,
-                "source": r.source,
-                "external_id": r.external_id,
-                "name": r.name,
-                "category": r.category,
-                "value": r.value,
-                "event_timestamp": r.event_timestamp.isoformat(),
-            }
-            for r in records
-        ],
-    }
+    result = await session.execute(query)
+    return serialize_page(result.all(), limit)
@@ -0,0 +1,70 @@
+import csv
+import io
+import os
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from schemas.models import UnifiedRecord
+from services.data_service import DATA_COLUMNS
+from services.serialization import dumps
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _encode_ndjson(rows) -> bytes:
+    return b"".join(dumps(row._asdict()) + b"\n" for row in rows)
+
+
+def _encode_csv(rows) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerows(
+        (*row[:-1], row.event_timestamp.isoformat()) for row in rows
+    )
+    return buf.getvalue().encode()
+
+
+async def stream_export(
+    engine: AsyncEngine,
+    fmt: str,
+    source: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield every matching unified record as NDJSON lines or CSV rows.
+    Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE,
+    so memory stays bounded whatever the table size.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unsupported format: {fmt}")
+
+    query = select(*DATA_COLUMNS)
+
+    if source:
+        query = query.where(UnifiedRecord.source == source)
+    if since:
+        query = query.where(UnifiedRecord.ingested_at >= since)
+    if until:
+        query = query.where(UnifiedRecord.ingested_at < until)
+
+    query = query.order_by(UnifiedRecord.source, UnifiedRecord.id).execution_options(
+        yield_per=EXPORT_BATCH_SIZE
+    )
+
+    encode = _encode_ndjson if fmt == "ndjson" else _encode_csv
+
+    if fmt == "csv":
+        yield (",".join(c.name for c in DATA_COLUMNS) + "\r\n").encode()
+
+    async with engine.connect() as conn:
+        result = await conn.stream(query)
+        async for rows in result.partitions():
+            yield encode(rows)
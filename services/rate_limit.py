@@ -1,21 +1,181 @@
 import asyncio
 import time
+from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
+
+
+class BucketBackend(ABC):
+    """
+    Storage for token-bucket state. Subclass with a shared store (e.g. Redis
+    running the same logic in a script) so several workers draw from one
+    quota, and all slow down when one of them is rate limited. Times are
+    wall-clock so they mean the same thing across processes.
+    """
+
+    @abstractmethod
+    async def acquire(self, key: str, rate: float, capacity: float, tokens: float) -> float:
+        """
+        Take `tokens` from bucket `key` if available and return 0,
+        otherwise return how many seconds to wait before trying again.
+        While the bucket is penalized it refills at the penalty rate
+        instead of `rate`.
+        """
+
+    @abstractmethod
+    async def block_until(self, key: str, until: float) -> None: ...
+
+    @abstractmethod
+    async def set_penalty(self, key: str, rate: float | None, until: float = 0.0) -> None:
+        """Refill bucket `key` at `rate` until `until`; None lifts the penalty."""
+
+    @abstractmethod
+    async def penalty(self, key: str) -> tuple[float, float] | None:
+        """(rate, until) of the bucket's current penalty, if any."""
+
+
+class InMemoryBucketBackend(BucketBackend):
+    def __init__(self):
+        # key -> [tokens, updated_at, blocked_until, penalty_rate, penalty_until]
+        self._state: dict[str, list[float]] = {}
+
+    async def acquire(self, key: str, rate: float, capacity: float, tokens: float) -> float:
+        now = time.time()
+        state = self._state.setdefault(key, [capacity, now, 0.0, 0.0, 0.0])
+        available, updated_at, blocked_until, penalty_rate, penalty_until = state
+
+        if now < blocked_until:
+            return blocked_until - now
+
+        if now < penalty_until:
+            rate = penalty_rate
+
+        available = min(capacity, available + (now - updated_at) * rate)
+        state[1] = now
+
+        if available >= tokens:
+            state[0] = available - tokens
+            return 0.0
+
+        state[0] = available
+        return (tokens - available) / rate
+
+    async def block_until(self, key: str, until: float) -> None:
+        state = self._state.setdefault(key, [0.0, time.time(), 0.0, 0.0, 0.0])
+        state[2] = max(state[2], until)
+
+    async def set_penalty(self, key: str, rate: float | None, until: float = 0.0) -> None:
+        state = self._state.setdefault(key, [0.0, time.time(), 0.0, 0.0, 0.0])
+        state[3], state[4] = (rate, until) if rate is not None else (0.0, 0.0)
+
+    async def penalty(self, key: str) -> tuple[float, float] | None:
+        state = self._state.get(key)
+        if state is None or time.time() >= state[4]:
+            return None
+        return state[3], state[4]
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Retry-After is either delay-seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
 
 
 class RateLimiter:
     """
-    Simple async token-bucket style rate limiter.
+    Async token-bucket rate limiter.
+
+    Refills at `rate_per_sec` up to `capacity` tokens, so short bursts of up
+    to `capacity` calls go out immediately. Each named bucket is independent.
+    On a 429 call `penalize()`: the bucket is paused for Retry-After and its
+    rate halved, for every limiter sharing the backend. `reward()` on
+    successes creeps back to the base rate; a penalty also lapses after
+    `penalty_seconds`. `rate` is the rate this limiter last saw.
+    """
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        capacity: float = 1,
+        *,
+        name: str = "default",
+        backend: BucketBackend | None = None,
+        min_rate_per_sec: float | None = None,
+        penalty_seconds: float = 300.0,
+    ):
+        self.name = name
+        self.base_rate = rate_per_sec
+        self.rate = rate_per_sec
+        self.min_rate = min_rate_per_sec or rate_per_sec / 8
+        self.capacity = capacity
+        self.penalty_seconds = penalty_seconds
+        self.backend = backend or InMemoryBucketBackend()
+
+    async def wait(self, tokens: float = 1) -> None:
+        while True:
+            delay = await self.backend.acquire(self.name, self.base_rate, self.capacity, tokens)
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    async def penalize(self, retry_after: float | None = None) -> None:
+        penalty = await self.backend.penalty(self.name)
+        current = penalty[0] if penalty is not None else self.base_rate
+        self.rate = max(self.min_rate, current / 2)
+
+        now = time.time()
+        pause = retry_after if retry_after is not None else 1.0 / self.rate
+        await self.backend.set_penalty(self.name, self.rate, now + self.penalty_seconds)
+        await self.backend.block_until(self.name, now + pause)
+
+    async def reward(self) -> None:
+        penalty = await self.backend.penalty(self.name)
+        if penalty is None:
+            self.rate = self.base_rate
+            return
+
+        rate, until = penalty
+        self.rate = min(self.base_rate, rate + self.base_rate / 10)
+        if self.rate < self.base_rate:
+            await self.backend.set_penalty(self.name, self.rate, until)
+        else:
+            await self.backend.set_penalty(self.name, None)
+
+
+class RateLimiterRegistry:
+    """
+    Named buckets (per endpoint, per API key, ...) sharing one backend.
     """
 
-    def __init__(self, rate_per_sec: float):
-        self.interval = 1.0 / rate_per_sec
-        self._last_call = 0.0
-        self._lock = asyncio.Lock()
+    def __init__(self, backend: BucketBackend | None = None):
+        self.backend = backend or InMemoryBucketBackend()
+        self._limiters: dict[str, RateLimiter] = {}
+
+    def get(self, name: str, rate_per_sec: float, capacity: float = 1) -> RateLimiter:
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            limiter = RateLimiter(
+                rate_per_sec,
+                capacity,
+                name=name,
+                backend=self.backend,
+            )
+            self._limiters[name] = limiter
+        return limiter
+
+    def set_backend(self, backend: BucketBackend) -> None:
+        self.backend = backend
+        for limiter in self._limiters.values():
+            limiter.backend = backend
+
 
-    async def wait(self):
-        async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self._last_call
-            if elapsed < self.interval:
-                await asyncio.sleep(self.interval - elapsed)
-            self._last_call = time.monotonic()
+limiters = RateLimiterRegistry()
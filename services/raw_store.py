@@ -0,0 +1,153 @@
+import gzip
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from schemas.models import RawPayload, RawPayloadRef
+from services.bulk_loader import BulkLoader
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CODEC = "zstd" if zstandard is not None else "gzip"
+
+
+def canonical_json(payload: Any) -> bytes:
+    return json.dumps(
+        payload,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    ).encode()
+
+
+def compress(data: bytes, codec: str = CODEC) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    if codec == "identity":
+        return data
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(body: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd payloads")
+        return zstandard.ZstdDecompressor().decompress(body)
+    if codec == "identity":
+        return body
+    return gzip.decompress(body)
+
+
+@dataclass(frozen=True)
+class EncodedPayload:
+    """
+    A batch of payloads (one per line of canonical JSON) hashed and
+    compressed ahead of time, e.g. in a worker process.
+    """
+
+    content_hash: str
+    body: bytes
+    raw_size: int
+    row_count: int
+    codec: str = CODEC
+
+
+def encode_payloads(payloads: list[Any]) -> EncodedPayload:
+    """
+    One content-addressed blob for a whole batch: per-row bodies are too
+    small to compress, and each would cost a hash key and a ref row.
+    Stored uncompressed when compression would not make it smaller.
+    """
+    data = b"\n".join(canonical_json(payload) for payload in payloads)
+    codec, body = CODEC, compress(data)
+    if len(body) >= len(data):
+        codec, body = "identity", data
+    return EncodedPayload(hashlib.sha256(data).hexdigest(), body, len(data), len(payloads), codec)
+
+
+async def load_payload(session: AsyncSession, content_hash: str) -> Any:
+    """
+    Fetch and decode a stored payload, e.g. to replay a past run: the list
+    of payloads for a batch, row i on line i. Bodies stored one payload per
+    row (before batches, row_count NULL) decode to that payload.
+    """
+    row = await session.get(RawPayload, content_hash)
+    if row is None:
+        return None
+
+    data = decompress(row.body, row.codec)
+    if row.row_count is None:
+        return json.loads(data)
+    return [json.loads(line) for line in data.split(b"\n")]
+
+
+class RawPayloadStore:
+    """
+    Content-addressed raw payload writer for one run.
+
+    Each batch is hashed over its canonical JSON lines. The compressed body
+    is inserted only if that hash is new, and the run always gets a small
+    reference row per batch, so replay history is complete without
+    duplicate bodies.
+    """
+
+    def __init__(self, session: AsyncSession, source: str, run_id: int | None):
+        self.source = source
+        self.run_id = run_id
+        self._pending: set[str] = set()
+        self._payloads = BulkLoader(
+            session,
+            RawPayload.__table__,
+            conflict_columns=("content_hash",),
+            copy_threshold=None,
+        )
+        self._refs = BulkLoader(session, RawPayloadRef.__table__, copy_threshold=None)
+
+    async def add_batch(self, payloads: list[Any]) -> str | None:
+        if not payloads:
+            return None
+        return await self.add_encoded(encode_payloads(payloads))
+
+    async def add_encoded(self, encoded: EncodedPayload) -> str:
+        # Skip bodies already queued in the current flush.
+        if encoded.content_hash not in self._pending:
+            self._pending.add(encoded.content_hash)
+            flushed = await self._payloads.add(
+                {
+                    "content_hash": encoded.content_hash,
+                    "codec": encoded.codec,
+                    "body": encoded.body,
+                    "raw_size": encoded.raw_size,
+                    "row_count": encoded.row_count,
+                }
+            )
+            if flushed is not None:
+                self._pending.clear()
+
+        await self._refs.add(
+            {
+                "run_id": self.run_id,
+                "source": self.source,
+                "content_hash": encoded.content_hash,
+            }
+        )
+        return encoded.content_hash
+
+    async def flush(self) -> None:
+        await self._payloads.flush()
+        await self._refs.flush()
+        self._pending.clear()
+
+    @property
+    def new_payloads(self) -> int:
+        return self._payloads.totals.inserted
@@ -2,8 +2,29 @@ import asyncio
 import random
 import logging
 
+import httpx
+
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError, RetryBudget
+
 logger = logging.getLogger(__name__)
 
+RETRYABLE_STATUS_CODES = {408, 425, 429}
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Transient upstream errors are retryable; client errors (4xx other than
+    timeouts / rate limiting), open circuits and bad data are not.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status >= 500 or status in RETRYABLE_STATUS_CODES
+    if isinstance(exc, (ValueError, TypeError, KeyError)):
+        return False
+    return True
+
 
 async def retry_with_backoff(
     func,
@@ -12,21 +33,51 @@ async def retry_with_backoff(
     base_delay: float = 0.5,
     max_delay: float = 10.0,
     retry_exceptions: tuple = (Exception,),
+    classify=is_retryable,
+    breaker: CircuitBreaker | None = None,
+    budget: RetryBudget | None = None,
 ):
     """
     Retry an async function with exponential backoff + jitter.
+
+    Only errors `classify` accepts are retried. With a `breaker`, calls fail
+    fast while the upstream's circuit is open and retryable failures count
+    towards opening it. With a `budget`, retries stop once they exceed the
+    budget's share of recent calls.
     """
     attempt = 0
 
     while True:
+        if breaker is not None:
+            breaker.before_call()
+        if budget is not None:
+            budget.record_call()
+
         try:
-            return await func()
+            result = await func()
         except retry_exceptions as e:
+            retryable = classify(e)
+            if breaker is not None:
+                # A non-retryable error still means the upstream answered.
+                if retryable:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+            if not retryable:
+                raise
+
             attempt += 1
             if attempt > retries:
                 logger.error(f"Retry limit exceeded: {e}")
                 raise
 
+            if budget is not None:
+                if not budget.can_retry():
+                    logger.error(f"Retry budget exhausted, giving up: {e}")
+                    raise
+                budget.record_retry()
+
             delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
             jitter = random.uniform(0, delay * 0.1)
             sleep_for = delay + jitter
@@ -36,3 +87,7 @@ async def retry_with_backoff(
             )
 
             await asyncio.sleep(sleep_for)
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
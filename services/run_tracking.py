@@ -0,0 +1,145 @@
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterable, Iterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from schemas.run_models import ETLRun
+from services.metrics import ETL_ROWS, ETL_RUN_SECONDS, ETL_RUNS, ETL_STAGE_SECONDS
+from services.stats_rollup import bump_run_status
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("fetch", "validate", "transform", "write", "commit")
+ROW_COUNTS = ("read", "valid", "invalid", "inserted", "updated", "skipped")
+_DONE = object()
+
+
+class RunMetrics:
+    """
+    Row counts and per-stage wall time for one ETL run. Each timed step is
+    also observed in the etl_stage_seconds histogram; the totals are stored
+    on the ETLRun row by finish_run().
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self.rows = dict.fromkeys(ROW_COUNTS, 0)
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.seconds[name] += elapsed
+            ETL_STAGE_SECONDS.observe(elapsed, source=self.source, stage=name)
+
+    def timed(self, items: Iterable, stage: str = "fetch") -> Iterator:
+        """
+        Iterate `items`, charging the time spent producing each one to `stage`.
+        """
+        iterator = iter(items)
+        while True:
+            with self.stage(stage):
+                item = next(iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+
+    def count(self, read: int = 0, valid: int = 0, invalid: int = 0) -> None:
+        self.rows["read"] += read
+        self.rows["valid"] += valid
+        self.rows["invalid"] += invalid
+
+    def count_written(self, result) -> None:
+        """Record a BulkLoader BatchResult."""
+        self.rows["inserted"] += result.inserted
+        self.rows["updated"] += result.updated
+        self.rows["skipped"] += result.unchanged
+
+    def apply(self, run: ETLRun) -> None:
+        for name, value in self.rows.items():
+            setattr(run, f"rows_{name}", value)
+            if value:
+                ETL_ROWS.inc(value, source=self.source, outcome=name)
+        for name, value in self.seconds.items():
+            setattr(run, f"{name}_ms", round(value * 1000, 3))
+        ETL_RUN_SECONDS.observe(time.perf_counter() - self._started, source=self.source)
+
+
+@asynccontextmanager
+async def _own_transaction(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """A short transaction next to `session`'s, committed on exit."""
+    async with AsyncSession(session.bind, expire_on_commit=False) as own:
+        async with own.begin():
+            yield own
+
+
+async def start_run(session: AsyncSession, source: str) -> ETLRun:
+    """
+    Record a "running" run and commit it straight away. Bumping the shared
+    "running" rollup row in the ingest transaction would keep it locked
+    until the run's first commit, so concurrent sources would queue on it.
+    Returns the run loaded in `session`.
+    """
+    async with _own_transaction(session) as own:
+        run = ETLRun(source=source, status="running")
+        own.add(run)
+        await own.flush()
+        await bump_run_status(own, "running")
+
+    return await session.get(ETLRun, run.id)
+
+
+async def _record_finish(
+    session: AsyncSession,
+    run: ETLRun,
+    status: str,
+    error_message: str | None,
+    metrics: RunMetrics | None,
+) -> None:
+    now = datetime.now(timezone.utc)
+
+    run.status = status
+    run.finished_at = now
+    if error_message is not None:
+        run.error_message = error_message
+    if metrics is not None:
+        metrics.apply(run)
+
+    await bump_run_status(session, "running", -1)
+    await bump_run_status(session, status, 1, finished_at=now)
+    ETL_RUNS.inc(source=run.source, status=status)
+
+
+async def finish_run(
+    session: AsyncSession,
+    run: ETLRun,
+    status: str,
+    error_message: str | None = None,
+    metrics: RunMetrics | None = None,
+) -> None:
+    """
+    Mark the run finished and move it out of "running" in the stats rollup.
+    `metrics`, if given, is stored on the run and exported.
+
+    A successful run is finished in the same transaction as its last
+    writes. A failed run's transaction may be broken by the error, so it is
+    rolled back and the failure is recorded and committed on its own;
+    chunks the run already committed stay.
+    """
+    if status != "failed":
+        await _record_finish(session, run, status, error_message, metrics)
+        return
+
+    run_id = run.id
+    await session.rollback()
+    async with _own_transaction(session) as own:
+        failed = await own.get(ETLRun, run_id)
+        await _record_finish(own, failed, status, error_message, metrics)
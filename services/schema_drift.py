@@ -1,29 +1,187 @@
-def extract_schema_signature(payload: dict) -> dict:
+import hashlib
+import json
+import logging
+import os
+from collections import defaultdict
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from schemas.schema_models import SchemaSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Items sampled from each list when building a signature.
+SCHEMA_SAMPLE_SIZE = int(os.getenv("SCHEMA_SAMPLE_SIZE", "50"))
+
+# Last committed signature hash per source in this process; lets the
+# common "no change" case skip the database entirely.
+_known_hashes: dict[str, str] = {}
+
+
+def _remember_on_commit(session: AsyncSession, source: str, current_hash: str) -> None:
+    """
+    Record `current_hash` as known once the snapshot write is committed.
+    On rollback it is dropped, so the next check goes to the database.
+    """
+    session.info.setdefault("schema_hashes", {})[source] = current_hash
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_hashes_on_commit(session: Session) -> None:
+    _known_hashes.update(session.info.pop("schema_hashes", {}))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_hashes_on_rollback(session: Session, previous_transaction) -> None:
+    session.info.pop("schema_hashes", None)
+
+
+def _type_name(value) -> str:
+    return "null" if value is None else type(value).__name__
+
+
+def _sample(items: list, sample_size: int) -> list:
+    if len(items) <= sample_size:
+        return items
+    step = len(items) / sample_size
+    return [items[int(i * step)] for i in range(sample_size)]
+
+
+def extract_schema_signature(payload, sample_size: int = SCHEMA_SAMPLE_SIZE) -> dict:
     """
-    Extract a lightweight schema signature from JSON payload.
-    Only top-level keys and value types.
+    Recursive schema signature of a JSON-like payload.
+
+    Paths look like "coins[].id". `fields` maps each path to its observed
+    type(s); `optional` holds the presence frequency of fields that were
+    missing from some of the sampled objects. Lists are sampled evenly,
+    at most `sample_size` items each.
     """
-    signature = {}
+    types: dict[str, set] = defaultdict(set)
+    present: dict[str, int] = defaultdict(int)
+    visits: dict[str, int] = defaultdict(int)
 
-    for key, value in payload.items():
-        signature[key] = type(value).__name__
+    def walk(value, path: str) -> None:
+        if path:
+            types[path].add(_type_name(value))
 
-    return signature
+        if isinstance(value, dict):
+            visits[path] += 1
+            for key, child in value.items():
+                child_path = f"{path}.{key}" if path else str(key)
+                present[child_path] += 1
+                walk(child, child_path)
+        elif isinstance(value, list):
+            for item in _sample(value, sample_size):
+                walk(item, f"{path}[]")
+
+    walk(payload, "")
+
+    optional = {}
+    for path, count in present.items():
+        parent = path.rsplit(".", 1)[0] if "." in path else ""
+        frequency = count / visits[parent]
+        if frequency < 1:
+            optional[path] = round(frequency, 3)
+
+    return {
+        "fields": {path: "|".join(sorted(t)) for path, t in sorted(types.items())},
+        "optional": optional,
+    }
+
+
+def signature_hash(signature: dict) -> str:
+    """
+    Stable hash of a signature. Exact optional-field frequencies vary between
+    samples, so only which fields are optional is hashed.
+    """
+    stable = {
+        "fields": signature.get("fields", {}),
+        "optional": sorted(signature.get("optional", {})),
+    }
+    return hashlib.sha256(
+        json.dumps(stable, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
 
 
 def diff_schemas(old: dict, new: dict) -> dict:
-    added = sorted(set(new) - set(old))
-    removed = sorted(set(old) - set(new))
+    # Snapshots written before nested signatures were flat {key: type} maps
+    old_fields = old["fields"] if isinstance(old.get("fields"), dict) else old
+    new_fields = new["fields"] if isinstance(new.get("fields"), dict) else new
+
+    added = sorted(set(new_fields) - set(old_fields))
+    removed = sorted(set(old_fields) - set(new_fields))
 
     type_changes = {
-        k: {"old": old[k], "new": new[k]}
-        for k in old.keys() & new.keys()
-        if old[k] != new[k]
+        k: {"old": old_fields[k], "new": new_fields[k]}
+        for k in old_fields.keys() & new_fields.keys()
+        if old_fields[k] != new_fields[k]
     }
 
+    old_optional = set(old.get("optional", {}))
+    new_optional = set(new.get("optional", {}))
+    common = old_fields.keys() & new_fields.keys()
+
+    became_optional = sorted((new_optional - old_optional) & common)
+    became_required = sorted((old_optional - new_optional) & common)
+
     return {
         "added_fields": added,
         "removed_fields": removed,
         "type_changes": type_changes,
-        "change_score": len(added) + len(removed) + len(type_changes),
+        "became_optional": became_optional,
+        "became_required": became_required,
+        "change_score": (
+            len(added)
+            + len(removed)
+            + len(type_changes)
+            + len(became_optional)
+            + len(became_required)
+        ),
     }
+
+
+async def check_schema_drift(
+    session: AsyncSession,
+    source: str,
+    signature: dict,
+) -> dict | None:
+    """
+    Compare `signature` with the stored snapshot for `source`, log drift and
+    update the snapshot. Returns the diff, or None when the signature hash is
+    unchanged (no diff computed, nothing written).
+    """
+    current_hash = signature_hash(signature)
+    if _known_hashes.get(source) == current_hash:
+        return None
+
+    snapshot = await session.scalar(
+        select(SchemaSnapshot).where(SchemaSnapshot.source == source)
+    )
+
+    if snapshot is None:
+        session.add(
+            SchemaSnapshot(
+                source=source,
+                schema_signature=signature,
+                signature_hash=current_hash,
+            )
+        )
+        _remember_on_commit(session, source, current_hash)
+        return None
+
+    if snapshot.signature_hash == current_hash:
+        _known_hashes[source] = current_hash
+        return None
+
+    diff = diff_schemas(snapshot.schema_signature, signature)
+
+    # Snapshots without a hash predate nested signatures; just upgrade them.
+    if snapshot.signature_hash is not None and diff["change_score"] > 0:
+        logger.warning(f"SCHEMA DRIFT DETECTED for {source}: {diff}")
+
+    snapshot.schema_signature = signature
+    snapshot.signature_hash = current_hash
+    _remember_on_commit(session, source, current_hash)
+    return diff
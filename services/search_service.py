@@ -0,0 +1,184 @@
+"""
+Name / external_id lookup behind GET /data/search, sized for typeahead.
+
+A search is one round trip: a UNION ALL of short index-backed branches,
+each with its own LIMIT, so the work is bounded by the limit rather than
+by how many rows match:
+
+- exact: lower(name) or lower(external_id) equals the query
+- prefix: starts with the query, read in ix_unified_*_lower index order
+- fuzzy: pg_trgm word similarity over the GIN trigram indexes, or an
+  ILIKE substring scan when the extension is not installed
+
+Rows are ranked exact > prefix > fuzzy, then by similarity and name.
+"""
+import os
+import time
+import uuid
+
+from sqlalchemy import Float, func, literal, or_, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from schemas.models import UnifiedRecord
+from services.cache import InMemoryCacheBackend, ResponseCache
+from services.data_service import DATA_COLUMNS
+from services.serialization import dumps
+
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "50"))
+SEARCH_MAX_QUERY_LENGTH = int(os.getenv("SEARCH_MAX_QUERY_LENGTH", "100"))
+# Shorter queries have too few trigrams to match on; they get exact and
+# prefix matches only.
+SEARCH_FUZZY_MIN_LENGTH = int(os.getenv("SEARCH_FUZZY_MIN_LENGTH", "3"))
+# Typeahead produces many distinct keys; keep them out of the /data cache.
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+
+MATCH_RANKS = {"exact": 0, "prefix": 1, "fuzzy": 2}
+
+search_cache = ResponseCache(InMemoryCacheBackend(maxsize=SEARCH_CACHE_SIZE))
+
+_trigram_available = False
+
+
+async def trigram_available(session: AsyncSession) -> bool:
+    """
+    Whether pg_trgm is installed. Only a positive answer is cached, so
+    installing the extension later is picked up without a restart.
+    """
+    global _trigram_available
+    if not _trigram_available:
+        _trigram_available = bool(
+            await session.scalar(
+                text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            )
+        )
+    return _trigram_available
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_query(
+    q: str,
+    source: str | None,
+    category: str | None,
+    limit: int,
+    trigram: bool,
+) -> Select:
+    """UNION ALL of the match branches for a lower-cased query `q`."""
+    name_key = func.lower(UnifiedRecord.name).collate("C")
+    id_key = func.lower(UnifiedRecord.external_id).collate("C")
+    prefix = _escape_like(q) + "%"
+
+    filters = []
+    if source:
+        filters.append(UnifiedRecord.source == source)
+    if category:
+        filters.append(UnifiedRecord.category == category)
+
+    def branch(match: str, condition, score, *order_by) -> Select:
+        return (
+            select(*DATA_COLUMNS, literal(match).label("match"), score.label("score"))
+            .where(condition, *filters)
+            .order_by(*order_by)
+            .limit(limit)
+        )
+
+    full = literal(1.0, Float)
+    branches = [
+        branch("exact", or_(name_key == q, id_key == q), full),
+        branch("prefix", name_key.like(prefix, escape="\\"), full, name_key),
+        branch("prefix", id_key.like(prefix, escape="\\"), full, id_key),
+    ]
+
+    if trigram:
+        if len(q) >= SEARCH_FUZZY_MIN_LENGTH:
+            # `q <% column` is the indexable form of word_similarity(q, column)
+            score = func.greatest(
+                func.word_similarity(q, UnifiedRecord.name),
+                func.word_similarity(q, UnifiedRecord.external_id),
+            )
+            similar = or_(
+                literal(q).op("<%")(UnifiedRecord.name),
+                literal(q).op("<%")(UnifiedRecord.external_id),
+            )
+            branches.append(branch("fuzzy", similar, score, score.desc()))
+    else:
+        contains = "%" + _escape_like(q) + "%"
+        substring = or_(
+            UnifiedRecord.name.ilike(contains, escape="\\"),
+            UnifiedRecord.external_id.ilike(contains, escape="\\"),
+        )
+        branches.append(branch("fuzzy", substring, literal(0.0, Float), name_key))
+
+    return union_all(*branches)
+
+
+def _rank_key(item: dict) -> tuple:
+    return (MATCH_RANKS[item["match"]], -item["score"], item["name"].lower(), item["id"])
+
+
+def rank_matches(rows, limit: int) -> list[dict]:
+    """Best match per record, ordered by rank, score and name."""
+    best: dict[int, dict] = {}
+    for row in rows:
+        item = row._asdict()
+        current = best.get(item["id"])
+        if current is None or _rank_key(item) < _rank_key(current):
+            best[item["id"]] = item
+
+    ranked = sorted(best.values(), key=_rank_key)[:limit]
+    for item in ranked:
+        item["score"] = round(float(item["score"]), 3)
+    return ranked
+
+
+def normalize_category(category: str | None) -> str | None:
+    """Categories are stored lower-cased; match the filter the same way."""
+    category = (category or "").strip().lower()
+    return category or None
+
+
+def normalize_query(q: str | None, limit: int) -> str:
+    q = (q or "").strip().lower()
+    if not q:
+        raise ValueError("q must not be empty")
+    if len(q) > SEARCH_MAX_QUERY_LENGTH:
+        raise ValueError(f"q must be at most {SEARCH_MAX_QUERY_LENGTH} characters")
+    if not 1 <= limit <= SEARCH_MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {SEARCH_MAX_LIMIT}")
+    return q
+
+
+async def search_data(
+    session: AsyncSession,
+    q: str | None,
+    source: str | None = None,
+    category: str | None = None,
+    limit: int = 10,
+) -> bytes:
+    """
+    Ranked matches for `q` as pre-serialized JSON. Matching ignores case,
+    and results are served from the search cache until new data is
+    committed.
+    """
+    start = time.time()
+    request_id = str(uuid.uuid4())
+    q = normalize_query(q, limit)
+    category = normalize_category(category)
+
+    await search_cache.sync_generation(session)
+    cache_key = search_cache.key("search", q, source, category, limit)
+    body = search_cache.get(cache_key)
+    if body is None:
+        query = search_query(q, source, category, limit, await trigram_available(session))
+        result = await session.execute(query)
+        matches = rank_matches(result.all(), limit)
+        body = dumps({"query": q, "count": len(matches), "data": matches})
+        search_cache.set(cache_key, body)
+
+    latency_ms = int((time.time() - start) * 1000)
+
+    envelope = dumps({"request_id": request_id, "api_latency_ms": latency_ms})
+    return envelope[:-1] + b"," + body[1:]
@@ -0,0 +1,94 @@
+from datetime import datetime
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from schemas.models import UnifiedRecord
+from schemas.run_models import ETLRun
+from schemas.stats_models import RunStatusCount, SourceRecordCount
+
+
+async def bump_run_status(
+    session: AsyncSession,
+    status: str,
+    delta: int = 1,
+    finished_at: datetime | None = None,
+) -> None:
+    stmt = insert(RunStatusCount).values(
+        status=status,
+        count=delta,
+        last_finished_at=finished_at,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RunStatusCount.status],
+        set_={
+            "count": RunStatusCount.count + stmt.excluded.count,
+            "last_finished_at": func.coalesce(
+                stmt.excluded.last_finished_at,
+                RunStatusCount.last_finished_at,
+            ),
+        },
+    )
+    await session.execute(stmt)
+
+
+async def add_source_records(session: AsyncSession, source: str, count: int) -> None:
+    if not count:
+        return
+
+    stmt = insert(SourceRecordCount).values(source=source, count=count)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SourceRecordCount.source],
+        set_={"count": SourceRecordCount.count + stmt.excluded.count},
+    )
+    await session.execute(stmt)
+
+
+async def rebuild_rollup(session: AsyncSession) -> None:
+    """
+    Recompute both rollup tables from etl_runs / unified_records.
+    Full scans — only meant for seeding an existing database.
+    """
+    await session.execute(delete(RunStatusCount))
+    await session.execute(delete(SourceRecordCount))
+
+    runs = await session.execute(
+        select(ETLRun.status, func.count(), func.max(ETLRun.finished_at))
+        .group_by(ETLRun.status)
+    )
+    for status, count, last_finished_at in runs.all():
+        session.add(
+            RunStatusCount(
+                status=status,
+                count=count,
+                last_finished_at=last_finished_at,
+            )
+        )
+
+    records = await session.execute(
+        select(UnifiedRecord.source, func.count()).group_by(UnifiedRecord.source)
+    )
+    for source, count in records.all():
+        session.add(SourceRecordCount(source=source, count=count))
+
+    await session.flush()
+
+
+async def ensure_rollup(session: AsyncSession) -> None:
+    """
+    Seed the rollup once if it is empty but the base tables are not.
+    """
+    has_rollup = await session.scalar(
+        select(RunStatusCount.status)
+        .union_all(select(SourceRecordCount.source))
+        .limit(1)
+    )
+    if has_rollup is not None:
+        return
+
+    has_data = await session.scalar(
+        select(ETLRun.id).union_all(select(UnifiedRecord.id)).limit(1)
+    )
+    if has_data is not None:
+        await rebuild_rollup(session)
@@ -1,53 +1,78 @@
+import os
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import DateTime, String, cast, literal, null, select
 
-from schemas.run_models import ETLRun
-from schemas.models import IngestionCheckpoint, UnifiedRecord
+from schemas.models import IngestionCheckpoint
+from schemas.stats_models import RunStatusCount, SourceRecordCount
+from services.cache import TTLCache
 
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "2"))
 
-async def get_stats(session: AsyncSession) -> dict:
-    total_runs = await session.scalar(
-        select(func.count()).select_from(ETLRun)
-    )
+_stats_cache = TTLCache(ttl=STATS_CACHE_TTL)
 
-    success_runs = await session.scalar(
-        select(func.count()).where(ETLRun.status == "success")
-    )
 
-    failed_runs = await session.scalar(
-        select(func.count()).where(ETLRun.status == "failed")
+def _stats_query():
+    """
+    Rollup rows and checkpoints as one UNION ALL, so /stats is a single
+    round trip over a handful of rows regardless of table sizes.
+    """
+    runs = select(
+        literal("run").label("kind"),
+        RunStatusCount.status.label("key"),
+        RunStatusCount.count.label("count"),
+        RunStatusCount.last_finished_at.label("at"),
+        cast(null(), String).label("marker"),
     )
-
-    last_success = await session.scalar(
-        select(func.max(ETLRun.finished_at)).where(ETLRun.status == "success")
+    records = select(
+        literal("records"),
+        SourceRecordCount.source,
+        SourceRecordCount.count,
+        cast(null(), DateTime(timezone=True)),
+        cast(null(), String),
     )
-
-    last_failure = await session.scalar(
-        select(func.max(ETLRun.finished_at)).where(ETLRun.status == "failed")
+    checkpoints = select(
+        literal("checkpoint"),
+        IngestionCheckpoint.source,
+        literal(0),
+        cast(null(), DateTime(timezone=True)),
+        IngestionCheckpoint.last_processed_marker,
     )
+    return runs.union_all(records, checkpoints)
 
-    records_result = await session.execute(
-        select(UnifiedRecord.source, func.count())
-        .group_by(UnifiedRecord.source)
-    )
-    records_by_source = {row[0]: row[1] for row in records_result.all()}
 
-    checkpoint_result = await session.execute(
-        select(
-            IngestionCheckpoint.source,
-            IngestionCheckpoint.last_processed_marker,
-        )
-    )
-    checkpoints = {row[0]: row[1] for row in checkpoint_result.all()}
+async def get_stats(session: AsyncSession) -> dict:
+    cached = _stats_cache.get("stats")
+    if cached is not None:
+        return cached
+
+    result = await session.execute(_stats_query())
 
-    return {
+    run_counts = {}
+    run_finished = {}
+    records_by_source = {}
+    checkpoints = {}
+
+    for kind, key, count, at, marker in result.all():
+        if kind == "run":
+            run_counts[key] = count
+            run_finished[key] = at
+        elif kind == "records":
+            records_by_source[key] = count
+        else:
+            checkpoints[key] = marker
+
+    stats = {
         "runs": {
-            "total": total_runs or 0,
-            "success": success_runs or 0,
-            "failed": failed_runs or 0,
-            "last_success_at": last_success,
-            "last_failure_at": last_failure,
+            "total": sum(run_counts.values()),
+            "success": run_counts.get("success", 0),
+            "failed": run_counts.get("failed", 0),
+            "last_success_at": run_finished.get("success"),
+            "last_failure_at": run_finished.get("failed"),
         },
         "records": records_by_source,
         "checkpoints": checkpoints,
     }
+
+    _stats_cache.set("stats", stats)
+    return stats
@@ -1,14 +1,24 @@
-import csv
 import logging
-from datetime import datetime, timezone
 from pathlib import Path
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
+from ingestion.csv_source.chunks import (
+    CSV_CHUNK_SIZE,
+    CSV_COMMIT_EVERY_CHUNKS,
+    file_fingerprint,
+)
+from ingestion.csv_source.source import csv_file_source, transform_stage, validate_stage
+from ingestion.pipeline import Pipeline, UnifiedWriter
+from ingestion.third_source.source import vendor_records
 from schemas.vendor_schema import VendorProduct
-from schemas.models import RawCSVData, UnifiedRecord, IngestionCheckpoint
-from schemas.run_models import ETLRun
+from services.bulk_loader import BatchResult
+from services.checkpoints import (
+    advance_file_checkpoint,
+    file_resume_position,
+    get_or_create_checkpoint,
+)
+from services.run_tracking import RunMetrics, finish_run, start_run
 
 logger = logging.getLogger(__name__)
 
@@ -16,78 +26,71 @@ SOURCE_NAME = "vendors_csv"
 CSV_PATH = Path("data/vendors.csv")
 
 
-
-async def ingest_vendor_data(session: AsyncSession) -> None:
+async def ingest_vendor_data(
+    session: AsyncSession,
+    chunk_size: int = CSV_CHUNK_SIZE,
+    commit_every: int = CSV_COMMIT_EVERY_CHUNKS,
+) -> BatchResult:
+    """
+    Ingest new rows of the vendor CSV. Returns inserted / updated /
+    unchanged counts for the run. A failed run is recorded and the error
+    re-raised, so the orchestrator reports the source as failing.
+    """
     logger.warning("VENDOR INGESTION STARTED")
-    run = ETLRun(source=SOURCE_NAME, status="running")
-    session.add(run)
-    await session.flush()
+    run = await start_run(session, SOURCE_NAME)
+    metrics = RunMetrics(SOURCE_NAME)
 
     if not CSV_PATH.exists():
         logger.error("Vendor CSV not found")
-        return
-
-    checkpoint = await session.scalar(
-        select(IngestionCheckpoint).where(IngestionCheckpoint.source == SOURCE_NAME)
-    )
-
-    processed_ids = set()
-    if checkpoint and checkpoint.last_processed_marker:
-        processed_ids = set(checkpoint.last_processed_marker.split(","))
-
-    new_ids = set()
-
-    with CSV_PATH.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-
-        for row in reader:
-            try:
-                product = VendorProduct(**row)
-            except Exception as e:
-                run.status = "failed"
-                run.error_message = str(e)
-                raise
-
-                
-
-            if product.vendor_id in processed_ids:
-                continue
-
-            session.add(
-                RawCSVData(
-                    source=SOURCE_NAME,
-                    payload=row,
-                )
-            )
-
-            session.add(
-                UnifiedRecord(
-                    source=SOURCE_NAME,
-                    external_id=product.vendor_id,
-                    name=product.product_name,
-                    category=product.group,
-                    value=product.amount,
-                    event_timestamp=datetime.now(timezone.utc),
-                )
-            )
+        await finish_run(session, run, "failed", "Vendor CSV not found")
+        raise FileNotFoundError(f"{CSV_PATH} not found")
+
+    try:
+        checkpoint = await get_or_create_checkpoint(session, SOURCE_NAME)
+        fingerprint = file_fingerprint(CSV_PATH)
+        start_offset, start_row = file_resume_position(checkpoint, CSV_PATH)
+
+        writer = UnifiedWriter(
+            session,
+            SOURCE_NAME,
+            run.id,
+            metrics,
+            lambda position: advance_file_checkpoint(checkpoint, fingerprint, *position),
+            commit_every,
+        )
+        pipeline = Pipeline(
+            csv_file_source(VendorProduct, CSV_PATH, chunk_size, start_offset, start_row),
+            [
+                validate_stage(VendorProduct),
+                transform_stage(vendor_records(SOURCE_NAME), "vendor"),
+            ],
+            writer,
+            metrics,
+        )
+        await pipeline.run()
 
-            new_ids.add(product.vendor_id)
+        if metrics.rows["read"] == 0:
+            await finish_run(session, run, "success", metrics=metrics)
+            logger.warning("No new vendor records")
+            return writer.totals
 
-    if not new_ids:
-        logger.warning("No new vendor records")
-        return
+        totals = writer.totals
 
-    merged = sorted(processed_ids | new_ids)
+        await finish_run(
+            session,
+            run,
+            "success_with_duplicates" if totals.unchanged > 0 else "success",
+            metrics=metrics,
+        )
 
-    if checkpoint:
-        checkpoint.last_processed_marker = ",".join(merged)
-    else:
-        session.add(
-            IngestionCheckpoint(
-                source=SOURCE_NAME,
-                last_processed_marker=",".join(merged),
-            )
+        logger.warning(
+            f"VENDOR INGESTION COMPLETED — {totals.inserted} records, "
+            f"updated: {totals.updated}, unchanged: {totals.unchanged}, "
+            f"rejected: {metrics.rows['invalid']}"
         )
-    run.status = "success"
+        return totals
 
-    logger.warning(f"VENDOR INGESTION COMPLETED — {len(new_ids)} records")
+    except Exception as e:
+        await finish_run(session, run, "failed", str(e), metrics=metrics)
+        logger.exception("Vendor ingestion failed unexpectedly")
+        raise
@@ -0,0 +1,57 @@
+import httpx
+import pytest
+
+from ingestion.api_source.client import CoinGeckoClient
+from services.rate_limit import RateLimiter
+
+COINS = [{"id": f"coin-{i}", "symbol": f"c{i}", "name": f"Coin {i}"} for i in range(5)]
+
+
+def make_client(handler, **kwargs) -> CoinGeckoClient:
+    return CoinGeckoClient(
+        "https://api.test/api/v3",
+        transport=httpx.MockTransport(handler),
+        limiter=RateLimiter(rate_per_sec=1000),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_page_slices_share_one_download():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=COINS, headers={"ETag": '"v1"'})
+
+    client = make_client(handler)
+
+    first = await client.fetch_products(skip=0, limit=2)
+    second = await client.fetch_products(skip=2, limit=2)
+
+    assert len(calls) == 1
+    assert calls[0].url.path == "/api/v3/coins/list"
+    assert [c["id"] for c in first["coins"] + second["coins"]] == [
+        "coin-0", "coin-1", "coin-2", "coin-3",
+    ]
+    assert first["total"] == 5
+
+
+@pytest.mark.asyncio
+async def test_unchanged_list_is_revalidated_with_etag():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json=COINS, headers={"ETag": '"v1"'})
+
+    client = make_client(handler, list_max_age=0)
+
+    await client.fetch_products(skip=0, limit=2)
+    page = await client.fetch_products(skip=3, limit=2)
+
+    assert len(calls) == 2
+    assert "If-None-Match" not in calls[0].headers
+    assert [c["id"] for c in page["coins"]] == ["coin-3", "coin-4"]
@@ -0,0 +1,164 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from ingestion.api_source import client as api_client
+from ingestion.api_source import source as api_source
+from ingestion.api_source.client import CoinGeckoClient
+from schemas.models import IngestionCheckpoint
+from services import api_ingestion
+from services.rate_limit import RateLimiter
+
+def coin(i):
+    return {"id": f"coin-{i}", "symbol": f"c{i}", "name": f"Coin {i}"}
+
+
+class Result:
+    def all(self):
+        return []
+
+
+class FakeSession:
+    """Accepts the writer's statements; records the cursor at each commit."""
+
+    def __init__(self, checkpoint, events):
+        self.checkpoint = checkpoint
+        self.events = events
+        self.info = {}
+
+    async def execute(self, statement, params=None):
+        return Result()
+
+    async def scalar(self, statement):
+        return None
+
+    def add(self, obj):
+        pass
+
+    async def commit(self):
+        await asyncio.sleep(0.01)  # slow enough for the next page to be fetched meanwhile
+        self.events.append(("commit", self.checkpoint.cursor))
+
+
+@pytest.fixture
+def listing():
+    return [coin(i) for i in range(450)]
+
+
+@pytest.fixture
+def fetched():
+    """Ids of every coin returned by the source, in fetch order."""
+    return []
+
+
+@pytest.fixture
+def api_run(monkeypatch, listing, fetched):
+    events = []
+    checkpoint = IngestionCheckpoint(source=api_ingestion.SOURCE_NAME)
+    finished = []
+
+    client = CoinGeckoClient(
+        "https://api.test/api/v3",
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json=listing)),
+        list_max_age=0,
+        limiter=RateLimiter(rate_per_sec=1000),
+    )
+    fetch_products = api_source.fetch_products
+
+    async def logged_fetch(skip, limit):
+        events.append(("fetch", skip))
+        data = await fetch_products(skip=skip, limit=limit)
+        fetched.extend(c["id"] for c in data["coins"])
+        return data
+
+    async def start_run(session, source):
+        return SimpleNamespace(id=1, source=source)
+
+    async def finish_run(session, run, status, error_message=None, metrics=None):
+        finished.append((status, metrics.rows["read"]))
+
+    async def get_checkpoint(session, source):
+        return checkpoint
+
+    monkeypatch.setattr(api_client, "client", client)
+    monkeypatch.setattr(api_source, "fetch_products", logged_fetch)
+    monkeypatch.setattr(api_ingestion, "start_run", start_run)
+    monkeypatch.setattr(api_ingestion, "finish_run", finish_run)
+    monkeypatch.setattr(api_ingestion, "get_or_create_checkpoint", get_checkpoint)
+
+    async def run(drain):
+        events.clear()
+        finished.clear()
+        await api_ingestion.ingest_api_data(FakeSession(checkpoint, events), drain=drain)
+        return events, checkpoint, finished
+
+    return run
+
+
+@pytest.mark.asyncio
+async def test_single_batch_without_drain(api_run):
+    events, checkpoint, finished = await api_run(drain=False)
+
+    assert events == [("fetch", 0), ("commit", 200)]
+    assert checkpoint.cursor == 200
+    assert finished == [("success", 200)]
+
+
+@pytest.mark.asyncio
+async def test_drain_commits_every_page_until_the_listing_is_exhausted(api_run):
+    events, checkpoint, finished = await api_run(drain=True)
+
+    commits = [cursor for kind, cursor in events if kind == "commit"]
+    fetches = [skip for kind, skip in events if kind == "fetch"]
+
+    assert commits == [200, 400, 0]  # the short page at 400 is the last one
+    assert fetches == [0, 200, 400]
+    assert checkpoint.cursor == 0
+    assert finished == [("success", 450)]
+
+
+@pytest.mark.asyncio
+async def test_drain_ending_on_an_empty_page_resets_the_cursor(api_run, listing):
+    del listing[400:]
+
+    events, checkpoint, finished = await api_run(drain=True)
+
+    assert [skip for kind, skip in events if kind == "fetch"] == [0, 200, 400]
+    assert [cursor for kind, cursor in events if kind == "commit"] == [200, 400, 0]
+    assert checkpoint.cursor == 0
+    assert finished == [("success", 400)]
+
+
+@pytest.mark.asyncio
+async def test_run_past_the_end_starts_the_next_sweep(api_run):
+    _, checkpoint, _ = await api_run(drain=False)
+    checkpoint.cursor = 450  # e.g. saved before the listing shrank
+
+    events, checkpoint, _ = await api_run(drain=False)
+
+    assert events == [("fetch", 450), ("commit", 0)]
+    assert checkpoint.cursor == 0
+
+
+@pytest.mark.asyncio
+async def test_next_drain_picks_up_coins_added_before_the_cursor(api_run, listing, fetched):
+    await api_run(drain=True)
+    listing.insert(0, {"id": "aaa-new", "symbol": "new", "name": "New Coin"})
+    fetched.clear()
+
+    _, checkpoint, finished = await api_run(drain=True)
+
+    assert fetched[0] == "aaa-new"
+    assert len(fetched) == 451
+    assert checkpoint.cursor == 0
+    assert finished == [("success", 451)]
+
+
+@pytest.mark.asyncio
+async def test_drain_prefetches_the_next_page_while_writing(api_run):
+    events, _, _ = await api_run(drain=True)
+
+    # Page 2 (skip=200) is requested before page 1 is committed.
+    assert events.index(("fetch", 200)) < events.index(("commit", 200))
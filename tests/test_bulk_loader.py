@@ -0,0 +1,221 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from core.schema import ensure_schema
+from ingestion.csv_source.chunks import CSV_CHUNK_SIZE
+from schemas.models import UnifiedRecord
+from services.bulk_loader import (
+    BatchResult,
+    BulkLoader,
+    unified_record_loader,
+    unified_row_hash,
+)
+
+
+def db_reachable() -> bool:
+    try:
+        socket.gethostbyname("db")
+        return True
+    except socket.error:
+        return False
+
+
+def test_unified_row_hash_tracks_content_columns():
+    row = {"source": "csv", "external_id": "1", "name": "a", "category": "x", "value": 1.0}
+
+    assert unified_row_hash(row) == unified_row_hash({**row, "event_timestamp": "later"})
+    assert unified_row_hash(row) != unified_row_hash({**row, "value": 2.0})
+    assert len(unified_row_hash(row)) == 32
+
+
+@pytest.mark.asyncio
+async def test_upsert_batch_dedupes_conflict_keys():
+    loader = BulkLoader(
+        None,
+        UnifiedRecord.__table__,
+        conflict_columns=("source", "external_id"),
+        update_columns=("name",),
+        hash_column="content_hash",
+        hash_fn=unified_row_hash,
+        copy_threshold=None,
+    )
+    written = []
+
+    async def fake_insert(rows):
+        written.extend(rows)
+        return len(rows), 0
+
+    loader._insert_batch = fake_insert
+    await loader.add({"source": "csv", "external_id": "1", "name": "old"})
+    await loader.add({"source": "csv", "external_id": "1", "name": "new"})
+    result = await loader.flush()
+
+    assert [r["name"] for r in written] == ["new"]
+    assert result == BatchResult(rows=2, inserted=1, updated=0, unchanged=1)
+
+
+@pytest.mark.asyncio
+async def test_full_csv_chunk_is_written_with_copy():
+    loader = unified_record_loader(None, "csv")
+    calls = []
+
+    async def fake_copy(rows):
+        calls.append(("copy", len(rows)))
+        return len(rows), 0
+
+    async def fake_insert(rows):
+        calls.append(("insert", len(rows)))
+        return len(rows), 0
+
+    loader._copy_batch = fake_copy
+    loader._insert_batch = fake_insert
+
+    async def on_flush(result):
+        pass
+
+    loader.on_flush = on_flush
+
+    chunk = [
+        {"source": "csv", "external_id": str(i), "name": "n", "category": "c", "value": 1.0}
+        for i in range(CSV_CHUNK_SIZE)
+    ]
+    await loader.add_many(chunk)
+    await loader.flush()
+    await loader.add_many(chunk[:10])
+    await loader.flush()
+
+    assert calls == [("copy", CSV_CHUNK_SIZE), ("insert", 10)]
+
+
+def unified_rows(source: str, names: list[str]) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    # Keys deliberately not in table column order
+    return [
+        {
+            "value": float(i),
+            "name": name,
+            "event_timestamp": now,
+            "category": f"cat-{i}",
+            "external_id": str(i),
+            "source": source,
+        }
+        for i, name in enumerate(names)
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not db_reachable(), reason="Database not reachable outside Docker")
+@pytest.mark.parametrize("copy_threshold", [1, None], ids=["copy", "insert"])
+async def test_upsert_counts_and_columns_against_postgres(copy_threshold):
+    engine = create_async_engine(os.environ["DATABASE_URL"])
+    await ensure_schema(engine)
+    source = f"test_bulk_{uuid.uuid4().hex}"
+
+    try:
+        async with AsyncSession(engine) as session:
+            loader = unified_record_loader(session, source, copy_threshold=copy_threshold)
+
+            await loader.add_many(unified_rows(source, ["a", "b", "c"]))
+            first = await loader.flush()
+            await loader.add_many(unified_rows(source, ["a", "B", "c", "d"]))
+            second = await loader.flush()
+
+            stored = await session.execute(
+                select(
+                    UnifiedRecord.external_id,
+                    UnifiedRecord.name,
+                    UnifiedRecord.category,
+                    UnifiedRecord.value,
+                )
+                .where(UnifiedRecord.source == source)
+                .order_by(UnifiedRecord.external_id)
+            )
+
+            assert first == BatchResult(rows=3, inserted=3, updated=0, unchanged=0)
+            assert second == BatchResult(rows=4, inserted=1, updated=1, unchanged=2)
+            assert stored.all() == [
+                ("0", "a", "cat-0", 0.0),
+                ("1", "B", "cat-1", 1.0),
+                ("2", "c", "cat-2", 2.0),
+                ("3", "d", "cat-3", 3.0),
+            ]
+            await session.rollback()
+    finally:
+        await engine.dispose()
+
+
+def unified_upsert_loader() -> BulkLoader:
+    return unified_record_loader(None, "csv", copy_threshold=None)
+
+
+def test_upsert_statement_only_rewrites_changed_rows():
+    loader = unified_upsert_loader()
+    row = {
+        "source": "csv",
+        "external_id": "1",
+        "name": "a",
+        "category": "x",
+        "value": 1.0,
+        "event_timestamp": datetime(2026, 1, 1, tzinfo=timezone.utc),
+        "content_hash": "h",
+    }
+
+    sql = str(loader._insert_statement([row]).compile(dialect=postgresql.dialect()))
+    sql = " ".join(sql.split())
+
+    assert "ON CONFLICT (source, external_id) DO UPDATE SET" in sql
+    for column in ("name", "category", "value", "event_timestamp", "content_hash"):
+        assert f"{column} = excluded.{column}" in sql
+    assert "external_id = excluded" not in sql
+    assert (
+        "WHERE unified_records.content_hash IS DISTINCT FROM excluded.content_hash" in sql
+    )
+    assert sql.endswith("RETURNING (xmax = 0)")
+
+
+class ReturningSession:
+    """Returns the given (xmax = 0) rows for every statement."""
+
+    def __init__(self, returned):
+        self.returned = returned
+        self.statements = 0
+
+    async def execute(self, statement):
+        self.statements += 1
+        returned = self.returned
+
+        class Result:
+            def all(self):
+                return returned
+
+        return Result()
+
+
+@pytest.mark.asyncio
+async def test_returning_rows_split_into_inserted_updated_unchanged():
+    # 5 distinct keys: 2 fresh inserts, 1 rewritten, 2 unchanged (no row returned)
+    session = ReturningSession([(True,), (False,), (True,)])
+    loader = BulkLoader(
+        session,
+        UnifiedRecord.__table__,
+        conflict_columns=("source", "external_id"),
+        update_columns=("name",),
+        hash_column="content_hash",
+        hash_fn=unified_row_hash,
+        copy_threshold=None,
+    )
+
+    await loader.add_many(
+        [{"source": "csv", "external_id": str(i), "name": f"n{i}"} for i in range(5)]
+    )
+    result = await loader.flush()
+
+    assert session.statements == 1
+    assert result == BatchResult(rows=5, inserted=2, updated=1, unchanged=2)
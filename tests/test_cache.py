@@ -0,0 +1,143 @@
+import os
+import socket
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from core.schema import ensure_schema
+from schemas.stats_models import DataGeneration
+from services.cache import (
+    CacheBackend,
+    InMemoryCacheBackend,
+    ResponseCache,
+    data_cache,
+    mark_data_changed,
+)
+
+
+def db_reachable() -> bool:
+    try:
+        socket.gethostbyname("db")
+        return True
+    except socket.error:
+        return False
+
+
+class GenerationSession:
+    """Stands in for an AsyncSession reading the data_generation row."""
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.reads = 0
+
+    async def scalar(self, statement):
+        self.reads += 1
+        return self.generation
+
+
+def test_in_memory_backend_evicts_least_recently_used():
+    backend = InMemoryCacheBackend(maxsize=2)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+
+    assert backend.get("a") == 1
+    assert backend.get("b") is None
+    assert backend.get("c") == 3
+
+
+def test_response_cache_counts_hits_and_misses():
+    cache = ResponseCache(InMemoryCacheBackend())
+    key = cache.key("data", None, 50, 0, None)
+
+    assert cache.get(key) is None
+    cache.set(key, {"count": 0})
+    assert cache.get(key) == {"count": 0}
+
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_commit_with_new_data_bumps_generation():
+    before = data_cache.backend.generation()
+
+    session = Session()
+    session.commit()
+    assert data_cache.backend.generation() == before
+
+    mark_data_changed(session)
+    session.commit()
+    assert data_cache.backend.generation() == before + 1
+
+    session.begin()
+    mark_data_changed(session)
+    session.rollback()
+    session.commit()
+    assert data_cache.backend.generation() == before + 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("services.cache.time.monotonic", lambda: now[0])
+    backend = InMemoryCacheBackend(ttl=10)
+    backend.set("a", 1)
+
+    now[0] += 9
+    assert backend.get("a") == 1
+    now[0] += 2
+    assert backend.get("a") is None
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+@pytest.mark.asyncio
+async def test_sync_generation_picks_up_writes_from_other_processes():
+    cache = ResponseCache(InMemoryCacheBackend(), poll_seconds=0)
+    session = GenerationSession(None)
+
+    await cache.sync_generation(session)
+    key = cache.key("data")
+    cache.set(key, b"page")
+
+    await cache.sync_generation(session)
+    assert cache.get(cache.key("data")) == b"page"
+
+    session.generation = 1
+    await cache.sync_generation(session)
+    assert cache.key("data") != key
+    assert cache.get(cache.key("data")) is None
+
+
+@pytest.mark.asyncio
+async def test_sync_generation_polls_at_most_every_interval():
+    cache = ResponseCache(InMemoryCacheBackend(), poll_seconds=60)
+    session = GenerationSession(3)
+
+    await cache.sync_generation(session)
+    await cache.sync_generation(session)
+
+    assert session.reads == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not db_reachable(), reason="Database not reachable outside Docker")
+async def test_commit_with_new_data_bumps_db_generation():
+    engine = create_async_engine(os.environ["DATABASE_URL"])
+    await ensure_schema(engine)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    try:
+        async with factory() as session:
+            before = await session.scalar(select(DataGeneration.generation)) or 0
+            mark_data_changed(session)
+            await session.commit()
+
+            assert await session.scalar(select(DataGeneration.generation)) == before + 1
+    finally:
+        await engine.dispose()
@@ -0,0 +1,83 @@
+import httpx
+import pytest
+
+from services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+)
+from services.retry import is_retryable, retry_with_backoff
+
+
+def http_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://api.test/coins/list")
+    return httpx.HTTPStatusError(
+        "error", request=request, response=httpx.Response(status, request=request)
+    )
+
+
+def test_breaker_opens_then_half_opens_then_closes():
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=0)
+
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_open_breaker_fails_fast():
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_classification():
+    assert is_retryable(http_error(503))
+    assert is_retryable(http_error(429))
+    assert not is_retryable(http_error(404))
+    assert not is_retryable(CircuitOpenError("open"))
+    assert is_retryable(httpx.ConnectError("boom"))
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    calls = 0
+
+    async def not_found():
+        nonlocal calls
+        calls += 1
+        raise http_error(404)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await retry_with_backoff(not_found, retries=3, base_delay=0)
+
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_caps_retries():
+    budget = RetryBudget(ratio=0, min_retries=1)
+    calls = 0
+
+    async def down():
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("server error 503")
+
+    with pytest.raises(RuntimeError):
+        await retry_with_backoff(down, retries=5, base_delay=0, budget=budget)
+
+    assert calls == 2
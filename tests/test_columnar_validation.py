@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from ingestion.csv_source.chunks import CSVChunk
+from ingestion.csv_source.columnar import validate_columns
+from schemas.csv_schema import CSVProduct
+from schemas.vendor_schema import VendorProduct
+
+pytest.importorskip("numpy")
+
+PRODUCT_HEADER = ["product_id", "name", "category", "price", "extra_col"]
+VENDOR_HEADER = ["vendor_id", "product_name", "group", "amount"]
+
+
+def assert_same_result(model, header, records):
+    reference = validate_columns(model, CSVChunk(header, records, 0, 0), "pydantic")
+    columnar = validate_columns(model, CSVChunk(header, records, 0, 0), "columnar")
+
+    assert columnar.positions == reference.positions
+    assert columnar.columns == reference.columns
+    assert columnar.rejected == reference.rejected
+    assert columnar.rows == reference.rows
+    return columnar
+
+
+def test_columnar_matches_pydantic_on_edge_cases():
+    records = [
+        ["1", "Phone", "Electronics", "699", "x"],
+        ["2", "Laptop", "ELECTRONICS", "1299.99", "x"],
+        ["3", "Chair", "Furniture", "not_a_number", "x"],
+        ["", "Table", "Furniture", "199", "x"],
+        ["0005", "Lamp", "İSTANBUL", ".5", "x"],
+        ["6", "Desk", "Garden", "5.", "x"],
+        ["7", "Rug", "Garden", "-5", "x"],
+        ["8", "Sofa", "Garden", "0.00", "x"],
+        [" 9 ", "Bed", "Garden", "1e3", "x"],
+        ["10", "Cup", "Garden", "1_000", "x"],
+        ["11", "Pen"],
+        ["12", "Box", "Misc", "3", "x", "surplus"],
+        ["13", "Mat", "Misc", "1234567890123456.5", "x"],
+    ]
+
+    result = assert_same_result(CSVProduct, PRODUCT_HEADER, records)
+
+    assert result.columns["product_id"][:3] == [1, 2, 5]
+    assert result.columns["category"][2] == "i̇stanbul"
+    assert result.fallback_rows > 0
+
+
+def test_columnar_matches_pydantic_on_random_vendor_rows():
+    rng = random.Random(7)
+    alphabet = "0123456789.-+e _x"
+    records = []
+    for i in range(3000):
+        amount = (
+            f"{rng.random() * 10 ** rng.randint(0, 10):.{rng.randint(0, 6)}f}"
+            if rng.random() < 0.7
+            else "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 6)))
+        )
+        name = rng.choice(["Desk", "", "  ", "Lamp\nbig"])
+        records.append([f"V{i}", name, rng.choice(["FURNITURE", "Électronique"]), amount])
+
+    assert_same_result(VendorProduct, VENDOR_HEADER, records)
+
+
+def test_missing_column_falls_back_to_pydantic():
+    records = [["1", "Phone", "699"]]
+
+    result = assert_same_result(CSVProduct, ["product_id", "name", "price"], records)
+
+    assert result.positions == []
+    assert len(result.rejected) == 1
@@ -0,0 +1,78 @@
+from ingestion.csv_source.chunks import (
+    file_fingerprint,
+    fingerprint_matches,
+    iter_csv_chunks,
+    validate_chunk,
+)
+from schemas.csv_schema import CSVProduct
+from schemas.vendor_schema import VendorProduct
+
+
+def test_iter_csv_chunks_respects_chunk_size(tmp_path):
+    path = tmp_path / "products.csv"
+    lines = ["product_id,name,category,price"]
+    lines += [f"{i},Item {i},Misc,{i}.5" for i in range(1, 8)]
+    path.write_text("\n".join(lines) + "\n")
+
+    chunks = list(iter_csv_chunks(path, chunk_size=3))
+
+    assert [len(c.rows) for c in chunks] == [3, 3, 1]
+    assert chunks[0].rows[0]["product_id"] == "1"
+    assert chunks[-1].rows[0]["product_id"] == "7"
+    assert chunks[-1].end_row == 7
+    assert chunks[-1].end_offset == path.stat().st_size
+
+
+def test_iter_csv_chunks_resumes_from_offset_after_append(tmp_path):
+    path = tmp_path / "vendors.csv"
+    path.write_text('vendor_id,product_name,group,amount\nA1,Desk,FURNITURE,250.50\nA2,"Lamp, big",Furniture,10\n')
+
+    first = list(iter_csv_chunks(path, chunk_size=10))
+    fingerprint = file_fingerprint(path)
+    end_offset, end_row = first[-1].end_offset, first[-1].end_row
+
+    with path.open("a") as f:
+        f.write("A3,Mouse,Electronics,29.99\n")
+
+    assert fingerprint_matches(path, fingerprint, end_offset)
+
+    resumed = list(iter_csv_chunks(path, 10, end_offset, end_row))
+
+    assert [r["vendor_id"] for c in resumed for r in c.rows] == ["A3"]
+    assert resumed[-1].end_row == 3
+
+
+def test_fingerprint_detects_rewritten_file(tmp_path):
+    path = tmp_path / "products.csv"
+    path.write_text("product_id,name,category,price\n1,Phone,Electronics,699\n")
+    fingerprint = file_fingerprint(path)
+
+    path.write_text("product_id,name,category,price\n2,Laptop,Electronics,1299\n")
+
+    assert not fingerprint_matches(path, fingerprint, 10)
+
+
+def test_validate_chunk_splits_valid_and_rejected():
+    rows = [
+        {"product_id": "1", "name": "Phone", "category": "Electronics", "price": "699"},
+        {"product_id": "3", "name": "Chair", "category": "Furniture", "price": "not_a_number"},
+        {"product_id": "", "name": "Table", "category": "Furniture", "price": "199"},
+    ]
+
+    valid, rejected = validate_chunk(CSVProduct, rows)
+
+    assert [p.product_id for _, p in valid] == [1]
+    assert valid[0][1].category == "electronics"
+    assert len(rejected) == 2
+
+
+def test_validate_chunk_vendor_rows():
+    rows = [
+        {"vendor_id": "A1", "product_name": "Desk", "group": "FURNITURE", "amount": "250.50"},
+        {"vendor_id": "A4", "product_name": "", "group": "Electronics", "amount": "19.99"},
+    ]
+
+    valid, rejected = validate_chunk(VendorProduct, rows)
+
+    assert [p.vendor_id for _, p in valid] == ["A1"]
+    assert rejected[0][0]["vendor_id"] == "A4"
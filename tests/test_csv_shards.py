@@ -0,0 +1,103 @@
+import csv
+
+from ingestion.csv_source.columnar import ValidatedChunk, validate_columns
+from ingestion.csv_source.shards import iter_byte_ranges, read_chunks
+from schemas.vendor_schema import VendorProduct
+from services.raw_store import canonical_json, decompress
+
+HEADER = ["vendor_id", "product_name", "group", "amount"]
+
+
+def write_vendors(path, rows):
+    with path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+    return path
+
+
+def vendor_rows(count):
+    rows = []
+    for i in range(count):
+        if i % 7 == 0:
+            rows.append([f"V{i}", f'Lamp, "big"\nmodel {i}', "Furniture", "10.5"])
+        elif i % 11 == 0:
+            rows.append([f"V{i}", "", "Garden", "0"])
+        else:
+            rows.append([f"V{i}", f"Item {i}", "ELECTRONICS", f"{i}.25"])
+    return rows
+
+
+def payload_lines(validated):
+    """Canonical JSON of each valid row, from the worker's encoded batch if any."""
+    payload = validated.payload
+    if payload is None:
+        return [canonical_json(row) for row in validated.rows]
+
+    assert payload.row_count == len(validated.rows)
+    if not payload.row_count:
+        return []
+    return decompress(payload.body, payload.codec).split(b"\n")
+
+
+async def collect(path, **kwargs):
+    chunks = [
+        chunk if isinstance(chunk, ValidatedChunk) else validate_columns(VendorProduct, chunk)
+        async for chunk in read_chunks(VendorProduct, path, chunk_size=4, **kwargs)
+    ]
+    rows = [row for v in chunks for row in v.rows]
+    payloads = [line for v in chunks for line in payload_lines(v)]
+    columns = {name: [x for v in chunks for x in v.columns[name]] for name in VendorProduct.model_fields}
+    rejected = [r for v in chunks for r in v.rejected]
+    return chunks, rows, payloads, columns, rejected
+
+
+def test_byte_ranges_split_on_record_boundaries(tmp_path):
+    path = write_vendors(tmp_path / "vendors.csv", vendor_rows(60))
+    data = path.read_bytes()
+
+    ranges = list(iter_byte_ranges(path, shard_bytes=100))
+
+    assert len(ranges) > 5
+    assert ranges[0][0] == data.index(b"\n") + 1
+    assert ranges[-1][1] is None
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        # Every boundary is outside quotes
+        assert data[:end].count(b'"') % 2 == 0
+        assert data[end - 1 : end] == b"\n"
+
+
+async def test_parallel_read_matches_serial(tmp_path):
+    path = write_vendors(tmp_path / "vendors.csv", vendor_rows(200))
+
+    serial = await collect(path, workers=0)
+    parallel = await collect(path, workers=2, shard_bytes=500, in_flight=2)
+
+    assert len({v.chunk.end_offset for v in parallel[0]}) > len(serial[0]) // 4
+    assert parallel[1:] == serial[1:]
+    assert parallel[0][-1].chunk.end_offset == path.stat().st_size
+    assert parallel[0][-1].chunk.end_row == serial[0][-1].chunk.end_row == 200
+
+    # Checkpoint positions only ever move forward
+    offsets = [v.chunk.end_offset for v in parallel[0]]
+    assert offsets == sorted(offsets)
+
+
+async def test_misaligned_shard_falls_back_to_serial(tmp_path):
+    # The stray quote in `5" screen` is data, not quoting, so the quote
+    # count puts a shard boundary inside the quoted field that follows.
+    rows = [[f"V{i}", f"Item {i}", "Garden", "1"] for i in range(20)]
+    rows.insert(5, ["V-a", '5" screen', "Electronics", "99"])
+    rows.insert(8, ["V-b", "Lamp\nbig\nwhite\ntall", "Furniture", "10"])
+    path = tmp_path / "vendors.csv"
+    with path.open("w", newline="") as f:
+        f.write(",".join(HEADER) + "\n")
+        for row in rows:
+            f.write(",".join(f'"{v}"' if "\n" in v else v for v in row) + "\n")
+
+    serial = await collect(path, workers=0)
+    parallel = await collect(path, workers=2, shard_bytes=1)
+
+    assert parallel[1:] == serial[1:]
+    assert "Lamp\nbig\nwhite\ntall" in parallel[3]["product_name"]
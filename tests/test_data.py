@@ -1,4 +1,29 @@
+import csv
+import io
+import json
+import os
+import socket
+import uuid
+from datetime import datetime, timezone
+
 import pytest
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+import main
+from core.schema import ensure_schema
+from schemas.models import UnifiedRecord
+from services.data_service import decode_cursor, encode_cursor
+
+
+def db_reachable() -> bool:
+    try:
+        socket.gethostbyname("db")
+        return True
+    except socket.error:
+        return False
+
 
 @pytest.mark.asyncio
 async def test_data_endpoint(client):
@@ -8,3 +33,81 @@ async def test_data_endpoint(client):
     assert "request_id" in body
     assert "api_latency_ms" in body
     assert "data" in body
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("products_csv", 42)
+    assert decode_cursor(cursor) == ("products_csv", 42)
+
+
+@pytest.mark.asyncio
+async def test_data_endpoint_rejects_invalid_cursor(client):
+    resp = await client.get("/data?cursor=not-a-cursor")
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_rejects_unknown_format(client):
+    resp = await client.get("/data/export?format=xml")
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not db_reachable(), reason="Database not reachable outside Docker")
+async def test_export_streams_filtered_rows(client, monkeypatch):
+    source = f"test_export_{uuid.uuid4().hex}"
+    event = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        {
+            "source": source,
+            "external_id": str(i),
+            "name": f"Item {i}",
+            "category": "misc",
+            "value": i + 0.5,
+            "event_timestamp": event,
+            "ingested_at": datetime(2024, 1, i, tzinfo=timezone.utc),
+        }
+        for i in range(1, 4)
+    ]
+
+    # Unpooled, so no connection bound to this test's event loop is left behind.
+    engine = create_async_engine(os.environ["DATABASE_URL"], poolclass=NullPool)
+    monkeypatch.setattr(main, "engine", engine)
+    await ensure_schema(engine)
+    async with engine.begin() as conn:
+        await conn.execute(insert(UnifiedRecord), rows)
+
+    try:
+        window = f"source={source}&since=2024-01-02T00:00:00Z&until=2024-01-03T12:00:00Z"
+
+        resp = await client.get(f"/data/export?format=ndjson&{window}")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "application/x-ndjson"
+        assert resp.headers["content-disposition"] == (
+            'attachment; filename="unified_records.ndjson"'
+        )
+        lines = [json.loads(line) for line in resp.text.splitlines()]
+        assert [(r["external_id"], r["name"], r["value"]) for r in lines] == [
+            ("2", "Item 2", 2.5),
+            ("3", "Item 3", 3.5),
+        ]
+        assert all(r["source"] == source for r in lines)
+
+        resp = await client.get(f"/data/export?format=csv&{window}")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/csv")
+        assert resp.headers["content-disposition"] == (
+            'attachment; filename="unified_records.csv"'
+        )
+        header, *records = csv.reader(io.StringIO(resp.text))
+        assert header == [
+            "id", "source", "external_id", "name", "category", "value", "event_timestamp"
+        ]
+        assert [r[2:] for r in records] == [
+            ["2", "Item 2", "misc", "2.5", event.isoformat()],
+            ["3", "Item 3", "misc", "3.5", event.isoformat()],
+        ]
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(delete(UnifiedRecord).where(UnifiedRecord.source == source))
+        await engine.dispose()
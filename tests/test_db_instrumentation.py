@@ -0,0 +1,59 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
+
+from core.instrumentation import (
+    EngineInstrumentation,
+    redact_parameters,
+    statement_operation,
+)
+
+
+def test_redact_parameters_hides_values():
+    assert redact_parameters({"name": "secret", "id": 1}) == "{name=?, id=?}"
+    assert redact_parameters(("secret", 1)) == "<2 parameters>"
+    assert redact_parameters([{"a": 1}, {"a": 2}]) == "<2 parameter sets>"
+
+
+def test_statement_operation():
+    assert statement_operation("  select 1") == "SELECT"
+    assert statement_operation("VACUUM") == "OTHER"
+
+
+def test_slow_statements_are_logged_redacted(caplog):
+    engine = create_engine("sqlite://", poolclass=QueuePool)
+    inst = EngineInstrumentation(engine, slow_query_ms=0)
+    event.listen(engine, "before_cursor_execute", inst.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", inst.after_cursor_execute)
+
+    with caplog.at_level(logging.WARNING), engine.connect() as conn:
+        conn.execute(text("SELECT :secret"), {"secret": "hunter2"})
+        pool = inst.pool_status()
+
+    snapshot = inst.snapshot()
+    assert snapshot["statements"]["SELECT"]["count"] == 1
+    # Drivers bind positionally at the cursor level
+    assert snapshot["slow_statements"][0]["parameters"] == "<1 parameters>"
+    assert "hunter2" not in caplog.text
+    assert pool["checked_out"] == 1
+
+
+def test_failed_statements_do_not_leak_start_times():
+    engine = create_engine("sqlite://")
+    inst = EngineInstrumentation(engine, slow_query_ms=1000)
+    event.listen(engine, "before_cursor_execute", inst.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", inst.after_cursor_execute)
+    event.listen(engine, "handle_error", inst.handle_error)
+
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+
+        assert conn.info["_query_started"] == []
+
+    assert inst.snapshot()["statements"]["SELECT"]["count"] == 1
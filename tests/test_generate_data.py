@@ -0,0 +1,27 @@
+import csv
+
+from benchmarks.generate_data import parse_rows, write_products_csv
+from ingestion.csv_source.chunks import validate_chunk
+from schemas.csv_schema import CSVProduct
+
+
+def test_generated_products_respect_ratios(tmp_path):
+    path = write_products_csv(
+        tmp_path / "products.csv", 2000, invalid_ratio=0.1, duplicate_ratio=0.2
+    )
+
+    with path.open(newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    valid, rejected = validate_chunk(CSVProduct, rows)
+    ids = [product.product_id for _, product in valid]
+
+    assert len(rows) == 2000
+    assert 0.05 < len(rejected) / len(rows) < 0.15
+    assert 0.1 < 1 - len(set(ids)) / len(ids) < 0.3
+
+
+def test_parse_rows():
+    assert parse_rows("10k") == 10_000
+    assert parse_rows("10M") == 10_000_000
+    assert parse_rows("2_500") == 2500
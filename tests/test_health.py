@@ -1,5 +1,14 @@
+import os
 import pytest
 import socket
+from types import SimpleNamespace
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+import main
+from services import csv_ingestion
+from services.orchestrator import ETLOrchestrator, SourceJob
 
 
 def db_reachable() -> bool:
@@ -23,3 +32,56 @@ async def test_health_endpoint(client):
         assert data["database"] == "ok"
     else:
         assert data["database"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_health_reports_readiness_and_etl_separately(client):
+    resp = await client.get("/health")
+    data = resp.json()
+
+    assert isinstance(data["ready"], bool)
+    assert set(data["etl"]) == {"coingecko_api", "products_csv", "vendors_csv"}
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_health_reports_failed_csv_run_as_error(client, monkeypatch, tmp_path):
+    finished = []
+
+    async def start_run(session, source):
+        return SimpleNamespace(id=1, source=source)
+
+    async def finish_run(session, run, status, error_message=None, metrics=None):
+        finished.append((status, error_message))
+
+    monkeypatch.setattr(csv_ingestion, "start_run", start_run)
+    monkeypatch.setattr(csv_ingestion, "finish_run", finish_run)
+    monkeypatch.setattr(csv_ingestion, "CSV_PATH", tmp_path / "missing.csv")
+
+    orchestrator = ETLOrchestrator(
+        [SourceJob(csv_ingestion.SOURCE_NAME, csv_ingestion.ingest_csv_data)],
+        session_factory=FakeSession,
+        maintenance=None,
+    )
+    monkeypatch.setattr(main, "orchestrator", orchestrator)
+    # Unpooled, so no connection bound to this test's event loop is left behind.
+    engine = create_async_engine(os.environ["DATABASE_URL"], poolclass=NullPool)
+    monkeypatch.setattr(main, "engine", engine)
+    await orchestrator.run_once()
+
+    etl = (await client.get("/health")).json()["etl"]
+    await engine.dispose()
+
+    assert finished == [("failed", "CSV file not found")]
+    assert etl["products_csv"]["state"] == "error"
+    assert "missing.csv" in etl["products_csv"]["last_error"]
@@ -0,0 +1,57 @@
+import pytest
+
+from schemas.run_models import ETLRun
+from services.metrics import MetricsRegistry, _Metric
+from services.run_tracking import RunMetrics
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    runs = registry.counter("runs_total", "Runs.", ("source",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("path",), buckets=(0.1, 1.0))
+
+    runs.inc(source='a"b')
+    runs.inc(2, source='a"b')
+    latency.observe(0.05, path="/data")
+    latency.observe(0.5, path="/data")
+    latency.observe(5, path="/data")
+
+    text = registry.render()
+
+    assert "# TYPE runs_total counter" in text
+    assert 'runs_total{source="a\\"b"} 3.0' in text
+    assert 'latency_seconds_bucket{path="/data",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{path="/data",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{path="/data",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{path="/data"} 3' in text
+
+
+def test_metric_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        _Metric("base", "No samples.")
+
+
+def test_run_metrics_fill_run_columns():
+    metrics = RunMetrics("test_source")
+
+    chunks = list(metrics.timed(iter([[1, 2], [3]]), "fetch"))
+    with metrics.stage("validate"):
+        metrics.count(read=3, valid=2, invalid=1)
+
+    run = ETLRun(source="test_source", status="running")
+    metrics.apply(run)
+
+    assert chunks == [[1, 2], [3]]
+    assert (run.rows_read, run.rows_valid, run.rows_invalid) == (3, 2, 1)
+    assert run.rows_inserted == 0
+    assert run.fetch_ms >= 0 and run.validate_ms >= 0 and run.commit_ms == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_records_request_latency(client):
+    await client.get("/health")
+    resp = await client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_count{method="GET",path="/health",status="200"}' in resp.text
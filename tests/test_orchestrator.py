@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import pytest
+
+from services.orchestrator import ETLOrchestrator, SourceJob
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        pass
+
+
+def slow_job(name: str, seconds: float) -> SourceJob:
+    async def ingest(session):
+        await asyncio.sleep(seconds)
+
+    return SourceJob(name, ingest)
+
+
+@pytest.mark.asyncio
+async def test_run_once_runs_sources_concurrently():
+    jobs = [slow_job("a", 0.2), slow_job("b", 0.2), slow_job("c", 0.2)]
+    orchestrator = ETLOrchestrator(jobs, max_concurrency=3, session_factory=FakeSession)
+
+    start = time.monotonic()
+    await orchestrator.run_once()
+
+    assert time.monotonic() - start < 0.5
+    assert all(s["state"] == "ok" for s in orchestrator.snapshot().values())
+
+
+@pytest.mark.asyncio
+async def test_failing_source_does_not_stop_others():
+    async def broken(session):
+        raise RuntimeError("upstream down")
+
+    jobs = [SourceJob("broken", broken), slow_job("ok", 0)]
+    orchestrator = ETLOrchestrator(jobs, session_factory=FakeSession)
+
+    await orchestrator.run_once()
+
+    snapshot = orchestrator.snapshot()
+    assert snapshot["broken"]["state"] == "error"
+    assert snapshot["broken"]["last_error"] == "upstream down"
+    assert snapshot["ok"]["state"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_maintenance_runs_before_every_job():
+    events = []
+
+    async def maintenance(session):
+        events.append("maintenance")
+
+    def job(name):
+        async def ingest(session):
+            events.append(name)
+
+        return SourceJob(name, ingest)
+
+    orchestrator = ETLOrchestrator(
+        [job("a"), job("b")],
+        max_concurrency=1,
+        session_factory=FakeSession,
+        maintenance=maintenance,
+    )
+    await orchestrator.run_once()
+    await orchestrator.run_job(orchestrator.jobs[0])
+
+    assert events == ["maintenance", "a", "maintenance", "b", "maintenance", "a"]
+
+
+@pytest.mark.asyncio
+async def test_failed_maintenance_does_not_block_ingestion():
+    async def maintenance(session):
+        raise RuntimeError("cannot create partition")
+
+    orchestrator = ETLOrchestrator(
+        [slow_job("a", 0)], session_factory=FakeSession, maintenance=maintenance
+    )
+    await orchestrator.run_once()
+
+    assert orchestrator.snapshot()["a"]["state"] == "ok"
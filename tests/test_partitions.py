@@ -0,0 +1,46 @@
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from core.partitions import (
+    PARTITION_SCHEMES,
+    add_months,
+    month_partition,
+    partition_name,
+    partitioned_table_ddl,
+)
+from schemas.models import UnifiedRecord
+
+
+def test_unified_records_ddl_is_list_partitioned_by_source():
+    table, partition_by, key = PARTITION_SCHEMES["source"]
+    ddl = partitioned_table_ddl(table, partition_by, key, postgresql.dialect())
+
+    assert "PARTITION BY LIST (source)" in ddl
+    assert "PRIMARY KEY (id, source)" in ddl
+    assert "id SERIAL NOT NULL" in ddl
+    assert "UNIQUE (source, external_id)" in ddl
+    # The model itself is untouched
+    assert list(UnifiedRecord.__table__.primary_key.columns.keys()) == ["id"]
+
+
+def test_raw_refs_ddl_is_range_partitioned_by_month():
+    table, partition_by, key = PARTITION_SCHEMES["ingested_at"]
+    ddl = partitioned_table_ddl(table, partition_by, key, postgresql.dialect())
+
+    assert "PARTITION BY RANGE (ingested_at)" in ddl
+    assert "PRIMARY KEY (id, ingested_at)" in ddl
+
+
+def test_month_partition_bounds_roll_over_the_year():
+    assert month_partition("raw_payload_refs", date(2026, 12, 17)) == (
+        "raw_payload_refs_y2026m12",
+        "2026-12-01 00:00:00+00",
+        "2027-01-01 00:00:00+00",
+    )
+    assert add_months(date(2026, 11, 30), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 5), -1) == date(2025, 12, 1)
+
+
+def test_partition_name_is_a_safe_identifier():
+    assert partition_name("unified_records", "Vendors-CSV v2") == "unified_records_vendors_csv_v2"
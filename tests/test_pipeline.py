@@ -0,0 +1,118 @@
+import asyncio
+import random
+
+import pytest
+
+from ingestion.csv_source.source import (
+    csv_file_source,
+    product_records,
+    transform_stage,
+    validate_stage,
+)
+from ingestion.pipeline import Pipeline, SourceBatch, Stage
+from schemas.csv_schema import CSVProduct
+
+
+async def numbers(count, produced=None):
+    for i in range(count):
+        if produced is not None:
+            produced.append(i)
+        yield SourceBatch([i], position=i + 1)
+
+
+async def test_pipeline_delivers_in_source_order_with_concurrent_stages():
+    rng = random.Random(7)
+
+    async def slow_double(records):
+        await asyncio.sleep(rng.random() / 200)
+        return [r * 2 for r in records]
+
+    delivered = []
+
+    async def sink(batch):
+        delivered.append((batch.seq, batch.data, batch.position))
+
+    pipeline = Pipeline(
+        numbers(40),
+        [Stage("validate", slow_double, concurrency=4), Stage("transform", lambda r: r + [0], 2)],
+        sink,
+    )
+
+    assert await pipeline.run() == 40
+    assert delivered == [(i, [i * 2, 0], i + 1) for i in range(40)]
+
+
+async def test_pipeline_applies_backpressure_to_the_source():
+    produced = []
+    release = asyncio.Event()
+
+    async def blocked_sink(batch):
+        await release.wait()
+
+    pipeline = Pipeline(
+        numbers(100, produced),
+        [Stage("transform", lambda r: r)],
+        blocked_sink,
+        queue_size=2,
+        max_in_flight=5,
+    )
+    task = asyncio.create_task(pipeline.run())
+    await asyncio.sleep(0.05)
+
+    assert len(produced) == 5
+
+    release.set()
+    assert await task == 100
+
+
+async def test_pipeline_stage_error_stops_the_source():
+    closed = asyncio.Event()
+
+    async def endless():
+        try:
+            i = 0
+            while True:
+                yield SourceBatch([i])
+                i += 1
+        finally:
+            closed.set()
+
+    def fail_on_three(records):
+        if records == [3]:
+            raise ValueError("bad batch")
+        return records
+
+    async def sink(batch):
+        pass
+
+    with pytest.raises(ValueError, match="bad batch"):
+        await Pipeline(endless(), [Stage("validate", fail_on_three)], sink).run()
+
+    assert closed.is_set()
+
+
+async def test_csv_source_through_stages(tmp_path):
+    path = tmp_path / "products.csv"
+    lines = ["product_id,name,category,price"]
+    lines += [f"{i},Item {i},MISC,{i}.5" if i % 4 else f"{i},Item {i},Misc,oops" for i in range(1, 11)]
+    path.write_text("\n".join(lines) + "\n")
+
+    batches = []
+
+    async def sink(batch):
+        batches.append(batch)
+
+    pipeline = Pipeline(
+        csv_file_source(CSVProduct, path, chunk_size=3),
+        [validate_stage(CSVProduct), transform_stage(product_records("products_csv"), "CSV")],
+        sink,
+    )
+    await pipeline.run()
+
+    unified = [row for b in batches for row in b.data.unified]
+    assert [r["external_id"] for r in unified] == ["1", "2", "3", "5", "6", "7", "9", "10"]
+    assert {r["category"] for r in unified} == {"misc"}
+    assert sum(b.data.read for b in batches) == 10
+    assert sum(b.data.rejected for b in batches) == 2
+    assert batches[-1].position == (path.stat().st_size, 10)
+    assert "[].price" in batches[0].data.schema()["fields"]
@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from services.rate_limit import (
+    BucketBackend,
+    InMemoryBucketBackend,
+    RateLimiter,
+    RateLimiterRegistry,
+    parse_retry_after,
+)
+
+
+@pytest.mark.asyncio
+async def test_burst_up_to_capacity_then_throttles():
+    limiter = RateLimiter(rate_per_sec=10, capacity=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        await limiter.wait()
+    assert time.monotonic() - start < 0.05
+
+    await limiter.wait()
+    assert time.monotonic() - start >= 0.08
+
+
+@pytest.mark.asyncio
+async def test_named_buckets_are_independent():
+    registry = RateLimiterRegistry()
+    a = registry.get("a", rate_per_sec=1, capacity=1)
+    b = registry.get("b", rate_per_sec=1, capacity=1)
+
+    assert registry.get("a", rate_per_sec=1) is a
+
+    start = time.monotonic()
+    await a.wait()
+    await b.wait()
+    assert time.monotonic() - start < 0.05
+
+
+@pytest.mark.asyncio
+async def test_penalize_pauses_bucket_and_slows_rate():
+    limiter = RateLimiter(rate_per_sec=100, capacity=5)
+
+    await limiter.penalize(retry_after=0.1)
+    assert limiter.rate == 50
+
+    start = time.monotonic()
+    await limiter.wait()
+    assert time.monotonic() - start >= 0.09
+
+    for _ in range(20):
+        await limiter.reward()
+    assert limiter.rate == 100
+    assert await limiter.backend.penalty(limiter.name) is None
+
+
+def test_bucket_backend_is_abstract():
+    with pytest.raises(TypeError):
+        BucketBackend()
+
+
+@pytest.mark.asyncio
+async def test_penalty_is_shared_by_limiters_on_one_backend():
+    backend = InMemoryBucketBackend()
+    worker_a = RateLimiter(rate_per_sec=100, name="api", backend=backend)
+    worker_b = RateLimiter(rate_per_sec=100, name="api", backend=backend)
+
+    await worker_a.penalize(retry_after=0)
+    await worker_b.wait()  # takes the only token
+
+    # worker_b never saw the 429 but refills at the halved rate
+    delay = await backend.acquire("api", worker_b.base_rate, worker_b.capacity, 1)
+    assert delay == pytest.approx(1 / 50, rel=0.2)
+
+    await worker_b.penalize(retry_after=0)
+    assert worker_b.rate == 25  # halved again from the shared rate
+
+
+@pytest.mark.asyncio
+async def test_penalty_expires():
+    limiter = RateLimiter(rate_per_sec=100, penalty_seconds=0.05)
+
+    await limiter.penalize(retry_after=0)
+    assert await limiter.backend.penalty(limiter.name) is not None
+
+    time.sleep(0.06)
+    assert await limiter.backend.penalty(limiter.name) is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
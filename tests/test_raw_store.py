@@ -0,0 +1,86 @@
+import csv
+import hashlib
+import json
+
+import pytest
+
+from benchmarks.generate_data import write_products_csv
+from schemas.models import RawPayload
+from services.raw_store import (
+    canonical_json,
+    compress,
+    decompress,
+    encode_payloads,
+    load_payload,
+    zstandard,
+)
+
+
+def test_canonical_json_ignores_key_order():
+    a = canonical_json({"vendor_id": "A1", "amount": "250.50"})
+    b = canonical_json({"amount": "250.50", "vendor_id": "A1"})
+
+    assert hashlib.sha256(a).hexdigest() == hashlib.sha256(b).hexdigest()
+
+
+def test_compress_round_trip_for_both_codecs():
+    data = canonical_json({"coins": [{"id": f"coin-{i}"} for i in range(200)]})
+
+    codecs = ["gzip"] + (["zstd"] if zstandard is not None else [])
+
+    for codec in codecs:
+        body = compress(data, codec)
+        assert len(body) < len(data)
+        assert json.loads(decompress(body, codec)) == json.loads(data)
+
+
+def csv_rows(tmp_path, count=5000):
+    path = write_products_csv(tmp_path / "products.csv", count, 0.0, 0.0)
+    with path.open(newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_batch_blob_is_smaller_than_per_row_storage(tmp_path):
+    rows = csv_rows(tmp_path)
+    key_size = 64  # sha256 hex, stored in raw_payloads and in each ref
+
+    raw = sum(len(canonical_json(row)) for row in rows)
+    per_row = sum(len(compress(canonical_json(row))) + 2 * key_size for row in rows)
+    encoded = encode_payloads(rows)
+
+    assert encoded.row_count == len(rows)
+    assert encoded.raw_size == raw + len(rows) - 1  # newline separated
+    assert len(encoded.body) + 2 * key_size < raw / 3
+    assert len(encoded.body) < per_row / 10
+
+
+def test_incompressible_batch_is_stored_as_identity():
+    encoded = encode_payloads([{"id": 1}])
+
+    assert encoded.codec == "identity"
+    assert encoded.body == b'{"id":1}'
+
+
+class PayloadSession:
+    def __init__(self, row):
+        self.row = row
+
+    async def get(self, model, key):
+        return self.row
+
+
+@pytest.mark.asyncio
+async def test_load_payload_decodes_batches_and_single_payloads(tmp_path):
+    rows = csv_rows(tmp_path, 50)
+    encoded = encode_payloads(rows)
+    batch = RawPayload(
+        content_hash=encoded.content_hash,
+        codec=encoded.codec,
+        body=encoded.body,
+        raw_size=encoded.raw_size,
+        row_count=encoded.row_count,
+    )
+    single = RawPayload(codec="gzip", body=compress(canonical_json(rows[0]), "gzip"))
+
+    assert await load_payload(PayloadSession(batch), encoded.content_hash) == rows
+    assert await load_payload(PayloadSession(single), "legacy") == rows[0]
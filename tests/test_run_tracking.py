@@ -0,0 +1,173 @@
+import asyncio
+import os
+import socket
+import uuid
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.schema import ensure_schema
+from schemas.models import IngestionCheckpoint, UnifiedRecord
+from schemas.run_models import ETLRun
+from schemas.stats_models import RunStatusCount
+from services import csv_ingestion, vendor_ingestion
+from services.run_tracking import finish_run, start_run
+
+
+def db_reachable() -> bool:
+    try:
+        socket.gethostbyname("db")
+        return True
+    except socket.error:
+        return False
+
+
+pytestmark = pytest.mark.skipif(not db_reachable(), reason="Database not reachable outside Docker")
+
+
+@pytest.fixture
+async def session_factory():
+    # A fresh engine per test: pooled asyncpg connections are tied to the
+    # event loop that opened them.
+    engine = create_async_engine(os.environ["DATABASE_URL"])
+    await ensure_schema(engine)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def running_count(factory) -> int:
+    async with factory() as session:
+        count = await session.scalar(
+            select(RunStatusCount.count).where(RunStatusCount.status == "running")
+        )
+    return count or 0
+
+
+@pytest.mark.asyncio
+async def test_open_run_does_not_block_other_sources(session_factory):
+    before = await running_count(session_factory)
+
+    async with session_factory() as first, session_factory() as second:
+        run_a = await start_run(first, f"test_a_{uuid.uuid4().hex}")
+        # `first` still has its ingest transaction open here.
+        run_b = await asyncio.wait_for(
+            start_run(second, f"test_b_{uuid.uuid4().hex}"), timeout=5
+        )
+
+        assert await running_count(session_factory) == before + 2
+
+        await finish_run(second, run_b, "success")
+        await second.commit()
+        await finish_run(first, run_a, "success")
+        await first.commit()
+
+    assert await running_count(session_factory) == before
+
+
+CSV_INGESTORS = [
+    (csv_ingestion, "ingest_csv_data", "product_records", "product_id,name,category,price"),
+    (vendor_ingestion, "ingest_vendor_data", "vendor_records", "vendor_id,product_name,group,amount"),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("module, ingest, records, header", CSV_INGESTORS)
+async def test_failure_after_intermediate_commit_is_recorded(
+    session_factory, tmp_path, monkeypatch, module, ingest, records, header
+):
+    source = f"test_csv_{uuid.uuid4().hex}"
+    path = tmp_path / "input.csv"
+    rows = [f"{i},Item {i},misc,{i}.5" for i in range(1, 7)]
+    path.write_text(header + "\n" + "\n".join(rows) + "\n")
+
+    to_unified = getattr(module, records)(source)
+    chunks = []
+
+    def failing_second_chunk(columns, now):
+        unified = to_unified(columns, now)
+        chunks.append(unified)
+        if len(chunks) == 2:
+            unified[0]["name"] = None  # NOT NULL violation breaks the transaction
+        return unified
+
+    monkeypatch.setattr(module, "SOURCE_NAME", source)
+    monkeypatch.setattr(module, "CSV_PATH", path)
+    monkeypatch.setattr(module, records, lambda _: failing_second_chunk)
+
+    before = await running_count(session_factory)
+
+    async with session_factory() as session:
+        with pytest.raises(IntegrityError):
+            await getattr(module, ingest)(session, chunk_size=2, commit_every=1)
+
+    try:
+        async with session_factory() as session:
+            run = await session.scalar(select(ETLRun).where(ETLRun.source == source))
+            committed = await session.scalar(
+                select(UnifiedRecord.id).where(UnifiedRecord.source == source).limit(1)
+            )
+
+        assert run.status == "failed"
+        assert run.finished_at is not None
+        assert "name" in run.error_message
+        assert committed is not None  # the first chunk was committed
+        assert await running_count(session_factory) == before
+    finally:
+        async with session_factory() as session:
+            await session.execute(delete(UnifiedRecord).where(UnifiedRecord.source == source))
+            await session.execute(
+                delete(IngestionCheckpoint).where(IngestionCheckpoint.source == source)
+            )
+            await session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("module, ingest, records, header", CSV_INGESTORS)
+async def test_invalid_rows_are_skipped_and_counted(
+    session_factory, tmp_path, monkeypatch, module, ingest, records, header
+):
+    source = f"test_csv_{uuid.uuid4().hex}"
+    path = tmp_path / "input.csv"
+    rows = ["1,Item 1,misc,1.5", "2,Item 2,misc,-1", "3,Item 3,misc,3.5"]
+    path.write_text(header + "\n" + "\n".join(rows) + "\n")
+
+    monkeypatch.setattr(module, "SOURCE_NAME", source)
+    monkeypatch.setattr(module, "CSV_PATH", path)
+
+    async def ingest_runs():
+        async with session_factory() as session:
+            await getattr(module, ingest)(session)
+            await session.commit()
+        async with session_factory() as session:
+            return (
+                await session.scalars(
+                    select(ETLRun).where(ETLRun.source == source).order_by(ETLRun.id)
+                )
+            ).all()
+
+    try:
+        [run] = await ingest_runs()
+        assert run.status == "success"
+        assert (run.rows_read, run.rows_valid, run.rows_invalid) == (3, 2, 1)
+        assert run.rows_inserted == 2
+
+        # Replaying the file from scratch leaves the valid rows unchanged.
+        async with session_factory() as session:
+            await session.execute(
+                delete(IngestionCheckpoint).where(IngestionCheckpoint.source == source)
+            )
+            await session.commit()
+        _, rerun = await ingest_runs()
+        assert rerun.status == "success_with_duplicates"
+        assert (rerun.rows_invalid, rerun.rows_skipped) == (1, 2)
+    finally:
+        async with session_factory() as session:
+            await session.execute(delete(ETLRun).where(ETLRun.source == source))
+            await session.execute(delete(UnifiedRecord).where(UnifiedRecord.source == source))
+            await session.execute(
+                delete(IngestionCheckpoint).where(IngestionCheckpoint.source == source)
+            )
+            await session.commit()
@@ -0,0 +1,108 @@
+import os
+import socket
+import uuid
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.schema import ensure_schema
+from schemas.schema_models import SchemaSnapshot
+from services.schema_drift import (
+    _known_hashes,
+    check_schema_drift,
+    diff_schemas,
+    extract_schema_signature,
+    signature_hash,
+)
+
+
+def db_reachable() -> bool:
+    try:
+        socket.gethostbyname("db")
+        return True
+    except socket.error:
+        return False
+
+
+def coins_payload(coins):
+    return {"coins": coins, "total": len(coins), "skip": 0, "limit": 200}
+
+
+def test_signature_covers_nested_records():
+    signature = extract_schema_signature(
+        coins_payload([{"id": "btc", "symbol": "btc", "name": "Bitcoin"}])
+    )
+
+    assert signature["fields"]["coins"] == "list"
+    assert signature["fields"]["coins[].id"] == "str"
+    assert signature["optional"] == {}
+
+
+def test_optional_field_frequency_is_tracked():
+    coins = [{"id": f"c{i}", "name": "x"} for i in range(4)]
+    coins[0]["platforms"] = {"ethereum": "0xabc"}
+
+    signature = extract_schema_signature(coins_payload(coins))
+
+    assert signature["optional"]["coins[].platforms"] == 0.25
+    assert signature["fields"]["coins[].platforms.ethereum"] == "str"
+
+
+def test_nested_drift_is_detected_and_hash_changes():
+    old = extract_schema_signature(coins_payload([{"id": "btc", "name": "Bitcoin"}]))
+    new = extract_schema_signature(coins_payload([{"id": 1, "name": "Bitcoin", "rank": 1}]))
+
+    diff = diff_schemas(old, new)
+
+    assert diff["added_fields"] == ["coins[].rank"]
+    assert diff["type_changes"]["coins[].id"] == {"old": "str", "new": "int"}
+    assert signature_hash(old) != signature_hash(new)
+
+
+def test_hash_is_stable_for_unchanged_shape():
+    a = extract_schema_signature(coins_payload([{"id": "a"}, {"id": "b", "x": 1}]))
+    b = extract_schema_signature(
+        coins_payload([{"id": "a"}, {"id": "b", "x": 1}, {"id": "c"}])
+    )
+
+    assert signature_hash(a) == signature_hash(b)
+
+
+def test_csv_header_drift():
+    old = extract_schema_signature([{"product_id": "1", "name": "Phone", "price": "699"}])
+    new = extract_schema_signature([{"product_id": "1", "title": "Phone", "price": "699"}])
+
+    diff = diff_schemas(old, new)
+
+    assert diff["added_fields"] == ["[].title"]
+    assert diff["removed_fields"] == ["[].name"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not db_reachable(), reason="Database not reachable outside Docker")
+async def test_hash_is_known_only_after_the_snapshot_commits():
+    engine = create_async_engine(os.environ["DATABASE_URL"])
+    await ensure_schema(engine)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    source = f"test_drift_{uuid.uuid4().hex}"
+    signature = extract_schema_signature(coins_payload([{"id": "btc"}]))
+
+    try:
+        async with factory() as session:
+            await check_schema_drift(session, source, signature)
+            assert source not in _known_hashes
+            await session.rollback()
+        assert source not in _known_hashes
+
+        async with factory() as session:
+            await check_schema_drift(session, source, signature)
+            await session.commit()
+        assert _known_hashes[source] == signature_hash(signature)
+    finally:
+        _known_hashes.pop(source, None)
+        async with factory() as session:
+            await session.execute(delete(SchemaSnapshot).where(SchemaSnapshot.source == source))
+            await session.commit()
+        await engine.dispose()
@@ -0,0 +1,141 @@
+from collections import namedtuple
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from services import search_service
+from services.cache import data_cache
+from services.search_service import (
+    normalize_category,
+    normalize_query,
+    rank_matches,
+    search_cache,
+    search_query,
+    trigram_available,
+)
+
+Row = namedtuple("Row", "id source external_id name category value event_timestamp match score")
+
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+def row(record_id, name, match, score=1.0):
+    return Row(record_id, "products_csv", str(record_id), name, "misc", 1.0, None, match, score)
+
+
+def test_search_query_uses_indexed_branches():
+    sql = compile_sql(search_query("bit", "coingecko_api", None, 10, trigram=True))
+
+    assert sql.count("UNION ALL") == 3
+    assert 'lower(unified_records.name) COLLATE "C"' in sql
+    assert "<%" in sql and "word_similarity" in sql
+    assert "ILIKE" not in sql
+    assert sql.count("unified_records.source = ") == 4
+
+
+def test_search_query_without_trigram_falls_back_to_ilike():
+    sql = compile_sql(search_query("bit", None, "misc", 10, trigram=False))
+
+    assert "<%" not in sql
+    assert "ILIKE" in sql
+
+
+def test_short_query_skips_fuzzy_branch():
+    sql = compile_sql(search_query("b", None, None, 10, trigram=True))
+
+    assert sql.count("UNION ALL") == 2
+    assert "word_similarity" not in sql
+
+
+def test_rank_matches_orders_and_dedupes():
+    rows = [
+        row(3, "Bitcoin Cash", "prefix"),
+        row(1, "Bitcoin", "prefix"),
+        row(1, "Bitcoin", "exact"),
+        row(7, "Wrapped Bitcoin", "fuzzy", 0.5),
+        row(8, "Bitgert", "fuzzy", 0.8),
+        row(3, "Bitcoin Cash", "fuzzy", 0.9),
+    ]
+
+    ranked = rank_matches(rows, limit=4)
+
+    assert [(r["id"], r["match"]) for r in ranked] == [
+        (1, "exact"),
+        (3, "prefix"),
+        (8, "fuzzy"),
+        (7, "fuzzy"),
+    ]
+
+
+def test_normalize_query():
+    assert normalize_query("  BitC ", 10) == "bitc"
+    with pytest.raises(ValueError):
+        normalize_query("   ", 10)
+    with pytest.raises(ValueError):
+        normalize_query("bit", 500)
+
+
+def test_normalize_category():
+    assert normalize_category(" Electronics ") == "electronics"
+    assert normalize_category("  ") is None
+    assert normalize_category(None) is None
+
+
+class Result:
+    def all(self):
+        return [row(1, "Bitcoin", "prefix")]
+
+
+class SearchSession:
+    """Answers the generation and pg_trgm lookups; records executed queries."""
+
+    def __init__(self, trigram=True):
+        self.trigram = trigram
+        self.scalars = 0
+        self.queries = []
+
+    async def scalar(self, statement):
+        self.scalars += 1
+        return self.trigram if "pg_extension" in str(statement) else 0
+
+    async def execute(self, statement):
+        self.queries.append(statement)
+        return Result()
+
+
+@pytest.mark.asyncio
+async def test_missing_trigram_extension_is_checked_again(monkeypatch):
+    monkeypatch.setattr(search_service, "_trigram_available", False)
+    session = SearchSession(trigram=False)
+
+    assert await trigram_available(session) is False
+    session.trigram = True  # extension installed while running
+    assert await trigram_available(session) is True
+    assert await trigram_available(session) is True
+
+    assert session.scalars == 2
+
+
+@pytest.mark.asyncio
+async def test_search_uses_its_own_cache_and_lowercases_category(monkeypatch):
+    monkeypatch.setattr(search_service, "_trigram_available", True)
+    search_cache.backend.bump_generation()
+    data_hits, data_misses = data_cache.hits, data_cache.misses
+    session = SearchSession()
+
+    first = await search_service.search_data(session, "bit", category="Misc")
+    second = await search_service.search_data(session, "BIT", category=" misc")
+
+    assert len(session.queries) == 1
+    assert "misc" in session.queries[0].compile().params.values()
+    assert first.split(b'"query"')[1] == second.split(b'"query"')[1]
+    assert search_cache.backend.get(search_cache.key("search", "bit", None, "misc", 10))
+    assert (data_cache.hits, data_cache.misses) == (data_hits, data_misses)
+
+
+@pytest.mark.asyncio
+async def test_search_endpoint_rejects_blank_query(client):
+    resp = await client.get("/data/search?q=%20")
+    assert resp.status_code == 400